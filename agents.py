@@ -1,6 +1,7 @@
 # agents.py
 
 import os
+import sys
 from typing import TypedDict, List
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langgraph.graph import StateGraph, END
@@ -9,6 +10,11 @@ from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.pydantic_v1 import BaseModel as V1BaseModel
 from dotenv import load_dotenv
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "python codes"))
+
+from helpers.artifacts import document_cache, document_from_text
+from helpers.summary_tree import LEAF_PROMPT, MAX_LEAF_CHARS, MERGE_PROMPT, SummaryTree
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -40,14 +46,32 @@ structured_llm = llm.with_structured_output(Risks)
 
 # --- Define the nodes of the graph ---
 
+def _summarize_section(text: str) -> str:
+    return llm.invoke(LEAF_PROMPT.format(text=text[:MAX_LEAF_CHARS])).content
+
+def _merge_summaries(summaries: List[str]) -> str:
+    numbered = "\n\n".join(f"[{k + 1}]\n{s}" for k, s in enumerate(summaries))
+    return llm.invoke(MERGE_PROMPT.format(text=numbered)).content
+
 def summarize_node(state: GraphState) -> GraphState:
-    """Summarizes the document text."""
+    """Summarizes the document text.
+
+    A document longer than one chunk is summarized through its SummaryTree (chunk summaries
+    merged level by level, cached by content) and the final summary is written from the tree
+    outline, so no single call carries the whole document.
+    """
     print("---NODE: Summarizing document---")
+    chunks = document_from_text(state["document_text"], cache=document_cache).chunks
+    if len(chunks) > 1:
+        tree = SummaryTree(chunks, summarize=_summarize_section, merge=_merge_summaries)
+        document = tree.outline()
+    else:
+        document = state["document_text"]
     prompt = ChatPromptTemplate.from_template(
         "Provide a concise, easy-to-understand summary of the following document:\n\n{document}"
     )
     chain = prompt | llm
-    summary = chain.invoke({"document": state["document_text"]}).content
+    summary = chain.invoke({"document": document}).content
     return {"summary": summary}
 
 def identify_risks_node(state: GraphState) -> GraphState:
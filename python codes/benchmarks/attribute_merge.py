@@ -0,0 +1,110 @@
+"""
+LLM merge pass vs local deterministic merge, per category.
+
+For each category the same clause-level input is merged once with the existing
+merge_*_with_llm prompt and once with helpers.merge; reports LLM calls, estimated
+tokens, wall time and the conflicts left for the optional LLM resolution pass.
+Personal clauses already carry attribute JSON; corporate and government clauses are
+plain sentences, so their local mode first extracts attributes once per distinct clause.
+Defaults to the offline fake backend with a simulated per-call latency; set
+LLM_BACKEND=gemini to measure against the API.
+
+    python benchmarks/attribute_merge.py
+"""
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("FAKE_LLM_LATENCY", "0.4")
+os.environ.setdefault("FAKE_LLM_TOKEN_LATENCY", "0.002")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from classes.corp import corp
+from classes.govt import govt
+from classes.pers import pers
+from helpers.executor import bounded_map
+from helpers.merge import UNION, merge_records
+from utils import llm_usage, set_fake_responder
+
+PERSONAL_ATTRIBUTES = [
+    {"Name": "Suresh Patil", "DateOfBirth": "03-04-1985", "DocumentType": "Driving License",
+     "DocumentNumber": "MH12 20110012345", "IssuedBy": "Not available", "IssueDate": "Not available",
+     "ExpiryDate": "Not available", "Address": "Not available", "VehicleType": "LMV"},
+    {"Name": "Suresh Patil", "Address": "Flat 4, Shivaji Nagar, Pune 411005", "IssuedBy": "RTO Pune",
+     "Validity": "Valid from 10/06/2011 to 09/06/2031", "BloodGroup": "B+", "VehicleType": "LMV, MCWG"},
+    {"Father's Name": "Ramesh Patil", "Restrictions": ["Must wear spectacles"], "Name": "Suresh R. Patil"},
+] * 10
+
+CORPORATE_CLAUSES = [
+    "The meeting of the Board of Directors of Acme Widgets Private Limited (CIN U74999MH2015PTC123456) was held on 12 March 2025 at 11:00 a.m. at the registered office.",
+    "Mr. Anil Mehta, Chairman, and Ms. Priya Rao, Director (DIN 01234567), were present and formed the quorum.",
+    "RESOLVED THAT the audited financial statements for FY 2024-25 be and are hereby approved.",
+    "RESOLVED FURTHER THAT Ms. Priya Rao, Director, be authorised to file Form MGT-14 with the Registrar of Companies.",
+    "The Board approved an interim dividend of Rs. 2 per equity share.",
+    "Mr. Rohit Sen was appointed as Additional Director with effect from 12 March 2025 under Section 161 of the Companies Act, 2013.",
+] * 8
+
+GOVERNMENT_CLAUSES = [
+    "Notification No. G.S.R. 123(E) dated 01 April 2025 is issued by the Ministry of Finance.",
+    "All registered dealers shall file quarterly returns within 30 days of the end of each quarter.",
+    "Eligible small farmers shall receive a subsidy of 50% under the PM-KISAN scheme.",
+    "Failure to comply shall attract a penalty of Rs. 10,000 and cancellation of registration.",
+    "The District Collector is the nodal authority for verification of beneficiaries.",
+    "Applications must be submitted on or before 30 June 2025 through the online portal.",
+] * 8
+
+
+def fake_responder(prompt):
+    """Clause-level attributes for extraction prompts, a merged JSON of realistic size otherwise."""
+    if "extractor" in prompt:
+        clause = prompt.rsplit('"""', 2)[-2].strip()
+        return json.dumps({"DocumentType": "Board Resolution", "DocumentNumber": "BR/2025/03", "OtherNotes": clause[:80]})
+    return json.dumps({"DocumentType": "Merged", "Items": ["A consolidated provision of the document."] * 25}, indent=2)
+
+
+def run_llm(category):
+    llm_usage.reset()
+    start = time.perf_counter()
+    _run_llm_merge(category)
+    stats = llm_usage.snapshot()
+    stats["wall_s"] = time.perf_counter() - start
+    stats["conflicts"] = "-"
+    return stats
+
+
+def _run_llm_merge(category):
+    if category == "personal":
+        "".join(pers([]).merge_personal_attributes_lm(
+            [{"clause": {"clause": f"clause {i}", "attributes": json.dumps(a)}, "analysis": "Proof of identity."}
+             for i, a in enumerate(PERSONAL_ATTRIBUTES)]))
+    elif category == "corporate":
+        "".join(corp([]).merge_corporate_clauses_with_llm(CORPORATE_CLAUSES))
+    else:
+        "".join(govt([]).merge_government_clauses_with_llm(GOVERNMENT_CLAUSES))
+
+
+def run_local(category):
+    llm_usage.reset()
+    start = time.perf_counter()
+    if category == "personal":
+        _, conflicts = merge_records([json.dumps(a) for a in PERSONAL_ATTRIBUTES])
+    else:
+        extract = corp([]).extract_corporate_attributes if category == "corporate" else govt([]).extract_government_attributes
+        clauses = CORPORATE_CLAUSES if category == "corporate" else GOVERNMENT_CLAUSES
+        records = bounded_map(lambda c: "".join(extract(c)), list(dict.fromkeys(clauses)))
+        _, conflicts = merge_records(records, strategies={"OtherNotes": UNION}, date_range=None)
+    stats = llm_usage.snapshot()
+    stats["wall_s"] = time.perf_counter() - start
+    stats["conflicts"] = len(conflicts)
+    return stats
+
+if __name__ == "__main__":
+    set_fake_responder(fake_responder)
+    print(f"{'category':<11}{'mode':<7}{'calls':>7}{'prompt_tok':>12}{'output_tok':>12}{'wall_ms':>10}{'conflicts':>11}")
+    for category in ("personal", "corporate", "government"):
+        for mode, run in (("llm", run_llm), ("local", run_local)):
+            s = run(category)
+            print(f"{category:<11}{mode:<7}{s['calls']:>7}{s['prompt_tokens']:>12}{s['output_tokens']:>12}"
+                  f"{s['wall_s'] * 1000:>10.1f}{s['conflicts']:>11}")
@@ -0,0 +1,67 @@
+"""
+One master template compared against many counterparty versions.
+
+Each version is the master with a few clauses reworded. hybrid_difference_workflow runs
+for every version with use_cache=False (the master's summary, term counts and metadata
+rebuilt each time) and with the per-document / pairwise caches of helpers.artifacts,
+then every pair is compared a second time. Reports LLM calls and wall time on the fake
+backend with a per-call latency, and the cache stats.
+
+    python benchmarks/baseline_cache.py [versions] [clauses]
+"""
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("FAKE_LLM_LATENCY", "0.05")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contextlib import redirect_stdout
+from io import StringIO
+
+from classes.documentComparison import hybrid_difference_workflow
+from helpers.artifacts import comparison_cache, document_cache
+from utils import llm_usage, set_fake_responder
+
+SUBJECTS = ["rent", "security deposit", "maintenance", "repairs", "sub-letting", "notice period", "renewal",
+            "use of premises", "parking", "insurance", "inspection", "alterations", "water charges", "property tax"]
+
+
+def master(clauses):
+    return [f"{i + 1}. The Counterparty shall comply with the terms on {SUBJECTS[i % len(SUBJECTS)]} in Schedule "
+            f"{i % 7 + 1}, and any breach of clause {i + 1} entitles the Company to written notice of 15 days."
+            for i in range(clauses)]
+
+
+def version(chunks, seed):
+    rng = random.Random(seed)
+    revised = list(chunks)
+    for i in rng.sample(range(len(chunks)), 3):
+        revised[i] = revised[i].replace("15 days", f"{rng.choice([7, 21, 30, 45])} days")
+    return revised
+
+
+def run(baseline, versions, use_cache):
+    llm_usage.reset()
+    start = time.perf_counter()
+    with redirect_stdout(StringIO()):
+        for chunks in versions:
+            hybrid_difference_workflow(baseline, chunks, "Contract", "Contract", max_concurrency=8, use_cache=use_cache)
+    return llm_usage.snapshot()["calls"], time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    n_versions = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    clauses = int(sys.argv[2]) if len(sys.argv) > 2 else 400
+    set_fake_responder(lambda prompt: "The revision shortens the notice periods.", text_only=True)
+    baseline = master(clauses)
+    versions = [version(baseline, seed) for seed in range(n_versions)]
+    print(f"1 master x {n_versions} versions, {clauses} clauses, {os.environ['FAKE_LLM_LATENCY']} s per LLM call\n")
+    print(f"{'run':<22}{'llm_calls':>10}{'wall_s':>8}")
+    for label, use_cache in (("uncached", False), ("cached, first pass", True), ("cached, repeat", True)):
+        calls, elapsed = run(baseline, versions, use_cache)
+        print(f"{label:<22}{calls:>10}{elapsed:>8.2f}")
+    print(f"\ndocument_cache: {document_cache.stats()}")
+    print(f"comparison_cache: {comparison_cache.stats()}")
@@ -0,0 +1,98 @@
+"""
+Local chunk alignment for document comparison on synthetic revisions.
+
+Document 2 is document 1 with chunks deleted, inserted and lightly edited. For each size
+helpers.alignment.align_chunks runs in "dense" mode (every chunk pair scored) and "lsh"
+mode (SimHash candidates + anchor-gap blocking); the table reports the time, the chunk
+pairs scored, and whether every surviving chunk was aligned with its revision. Then the
+chunk-level analysis of a 1,000-chunk pair runs on the fake backend with a simulated
+per-call latency, sequentially, concurrently and under an LLM call budget, and prints its
+coverage stats.
+
+    python benchmarks/chunk_alignment.py [chunks ...]
+"""
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("FAKE_LLM_LATENCY", "0.05")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contextlib import redirect_stdout
+from io import StringIO
+
+from classes.documentComparison import HybridDocumentDifferenceIdentifier
+from helpers.alignment import align_chunks
+from utils import llm_usage
+
+_VOCABULARY = random.Random(0)
+WORDS = ["".join(_VOCABULARY.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(_VOCABULARY.randint(2, 10))) for _ in range(3000)]
+ZIPF = [1 / rank for rank in range(1, len(WORDS) + 1)]  # word frequencies of natural text
+
+
+def chunk(seed, words=150):
+    rng = random.Random(seed)
+    return f"{seed}. " + " ".join(rng.choices(WORDS, ZIPF, k=words))
+
+
+def revise(chunks, seed=0):
+    """Delete ~2%, edit ~5% and insert ~2% new chunks; returns (revision, origin index of each revised chunk)."""
+    rng = random.Random(seed)
+    revised, origin = [], []
+    for i, text in enumerate(chunks):
+        roll = rng.random()
+        if roll < 0.02:
+            continue
+        if roll < 0.07:
+            words = text.split()
+            for k in rng.sample(range(1, len(words)), 10):
+                words[k] = rng.choice(WORDS)
+            text = " ".join(words)
+        revised.append(text)
+        origin.append(i)
+        if rng.random() < 0.02:
+            revised.append(chunk(10 ** 6 + i))
+            origin.append(None)
+    return revised, origin
+
+
+def analyse(doc1, doc2, **options):
+    comparison = HybridDocumentDifferenceIdentifier(doc1, doc2)
+    llm_usage.reset()
+    start = time.perf_counter()
+    with redirect_stdout(StringIO()):
+        result = comparison.chunk_level_analysis(**options)
+    return result, time.perf_counter() - start, llm_usage.snapshot()["calls"]
+
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or [100, 300, 1000]
+    print(f"{'chunks':>8}{'mode':>7}{'align_ms':>10}{'pairs_scored':>14}{'all_pairs':>11}{'matched':>9}{'correct':>11}{'added':>7}{'deleted':>9}")
+    for n in sizes:
+        doc1 = [chunk(i) for i in range(n)]
+        doc2, origin = revise(doc1, seed=n)
+        survivors = sum(o is not None for o in origin)
+        for mode in ("dense", "lsh"):
+            start = time.perf_counter()
+            alignment = align_chunks(doc1, doc2, mode=mode)
+            elapsed = time.perf_counter() - start
+            correct = sum(origin[m["doc2_chunk"]] == m["doc1_chunk"] for m in alignment["matches"])
+            stats = alignment["stats"]
+            print(f"{n:>8}{mode:>7}{elapsed * 1000:>10.1f}{stats['pairs_scored']:>14}{stats['all_pairs']:>11}"
+                  f"{len(alignment['matches']):>9}{f'{correct}/{survivors}':>11}"
+                  f"{len(alignment['unmatched_doc2']):>7}{len(alignment['unmatched_doc1']):>9}")
+
+    n = max(sizes)
+    doc1 = [chunk(i) for i in range(n)]
+    doc2, _ = revise(doc1, seed=n)
+    print(f"\nchunk_level_analysis, {n} chunks, {os.environ['FAKE_LLM_LATENCY']} s per LLM call")
+    print(f"{'run':<24}{'llm_calls':>10}{'wall_s':>8}")
+    for label, options in (("sequential", {"max_concurrency": 1, "max_detailed": None}),
+                           ("concurrent (8)", {"max_concurrency": 8, "max_detailed": None}),
+                           ("default budget", {"max_concurrency": 8}),
+                           ("budget 20, concurrent", {"max_concurrency": 8, "max_detailed": 20})):
+        result, elapsed, calls = analyse(doc1, doc2, **options)
+        print(f"{label:<24}{calls:>10}{elapsed:>8.2f}")
+    print(f"coverage: {result['coverage']}")
@@ -0,0 +1,73 @@
+"""
+Precision/recall and throughput of the regex statute-citation extractor.
+
+    python benchmarks/citation_extractor.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from helpers.citations import canonical_citations, coverage_doubtful
+from sample_docs import SAMPLE_FIR
+
+# (text, expected canonical citations)
+LABELLED = [
+    (SAMPLE_FIR, {"Section 420 IPC", "Section 468 IPC", "Section 34 IPC"}),
+    ("FIR registered u/s 420/468/471 r/w 120-B IPC at PS Dadar.",
+     {"Section 420 IPC", "Section 468 IPC", "Section 471 IPC", "Section 120B IPC"}),
+    ("Sections 302 and 34 of the Indian Penal Code, 1860 are invoked.", {"Section 302 IPC", "Section 34 IPC"}),
+    ("The statement was recorded under Section 161 Cr.P.C. and later u/s 164 CrPC before the Magistrate.",
+     {"Section 161 CrPC", "Section 164 CrPC"}),
+    ("Anticipatory bail is sought under Section 438 of the Code of Criminal Procedure.", {"Section 438 CrPC"}),
+    ("The petition under Section 482 Cr. P. C. seeks quashing of the FIR.", {"Section 482 CrPC"}),
+    ("Case registered under Section 318(4) BNS read with Section 3(5) BNS.", {"Section 318(4) BNS", "Section 3(5) BNS"}),
+    ("Notice under Section 35(3) of the Bharatiya Nagarik Suraksha Sanhita, 2023 was served.", {"Section 35(3) BNSS"}),
+    ("Bail application under Section 480 BNSS.", {"Section 480 BNSS"}),
+    ("A certificate under Section 65B of the Indian Evidence Act accompanies the CCTV footage.", {"Section 65B Evidence Act"}),
+    ("Electronic record certified under Section 63 of the Bharatiya Sakshya Adhiniyam.", {"Section 63 BSA"}),
+    ("Complaint under Section 138 of the Negotiable Instruments Act, 1881 for dishonour of cheque.", {"Section 138 NI Act"}),
+    ("Proceedings u/s 138 N.I. Act are pending.", {"Section 138 NI Act"}),
+    ("Charges framed under IPC Section 498-A and Section 406 IPC.", {"Section 498A IPC", "Section 406 IPC"}),
+    ("Offences punishable under 323/506 IPC were found made out.", {"Section 323 IPC", "Section 506 IPC"}),
+    ("S. 41A CrPC notice was issued to the accused.", {"Section 41A CrPC"}),
+    ("Section 304-B IPC (dowry death) is attracted.", {"Section 304B IPC"}),
+    ("Secs. 379, 411 IPC.", {"Section 379 IPC", "Section 411 IPC"}),
+    # Negatives and non-covered statutes
+    ("Case No. 2056/2025 was listed on 20/09/2025 at 11:15 AM.", set()),
+    ("The accused, aged 35, resides at 78 Shivaji Nagar.", set()),
+    ("Section 3 of the Dowry Prohibition Act, 1961 is also invoked.", set()),
+    ("Clause 4.2 of the agreement provides a 30 day notice period.", set()),
+]
+
+
+def precision_recall():
+    tp = fp = fn = 0
+    doubtful = 0
+    for text, expected in LABELLED:
+        got = set(canonical_citations(text))
+        tp += len(got & expected)
+        fp += len(got - expected)
+        fn += len(expected - got)
+        doubtful += coverage_doubtful(text)
+    precision = tp / (tp + fp) if tp + fp else 1.0
+    recall = tp / (tp + fn) if tp + fn else 1.0
+    return precision, recall, doubtful
+
+
+def throughput(target_mb=5):
+    corpus = "\n".join(text for text, _ in LABELLED)
+    document = corpus * max(1, int(target_mb * 1024 * 1024 / len(corpus)))
+    start = time.perf_counter()
+    count = len(canonical_citations(document))
+    elapsed = time.perf_counter() - start
+    return len(document) / (1024 * 1024) / elapsed, count, elapsed
+
+
+if __name__ == "__main__":
+    precision, recall, doubtful = precision_recall()
+    print(f"samples: {len(LABELLED)}  precision: {precision:.3f}  recall: {recall:.3f}  "
+          f"LLM fallbacks (doubtful coverage): {doubtful}")
+    mb_per_s, count, elapsed = throughput()
+    print(f"throughput: {mb_per_s:.1f} MB/s ({count} unique citations, {elapsed:.2f}s)")
@@ -0,0 +1,93 @@
+"""
+Accuracy and throughput of the rule-based date extractor against the LLM path.
+
+Labelled sentences (FIR, court notice, lease and regulatory wording) are run through
+calendar_.calender.extract_future_dates_with_context with mode="local" and mode="llm",
+against a fixed "today". Reports precision/recall of the future dates found, the ambiguous
+mentions that llm_fallback would send, throughput on a multi-megabyte document, and the
+LLM calls/prompt tokens the previous whole-document path needs. Accuracy of the LLM path
+is only meaningful with LLM_BACKEND=gemini; the fake backend answers with empty lists.
+
+    python benchmarks/date_extractor.py [megabytes]
+"""
+import os
+import sys
+import time
+from datetime import date
+
+os.environ.setdefault("LLM_BACKEND", "fake")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calendar_.calender import extract_future_dates_with_context
+from helpers.dates import dates_with_context
+from sample_docs import SAMPLE_FIR
+from utils import LLM_BACKEND, estimate_tokens, llm_usage
+
+TODAY = date(2025, 9, 15)
+
+# (text, expected future ISO dates)
+LABELLED = [
+    ("The accused has been summoned to appear before the Court on 20/09/2025.", {"2025-09-20"}),
+    ("Further statements of witnesses are scheduled to be recorded on 25/09/2025.", {"2025-09-25"}),
+    ("The next date of hearing is 14th September 2025.", set()),
+    ("The matter is adjourned to 14th October 2025 for arguments.", {"2025-10-14"}),
+    ("Reply to be filed on or before 20.09.2025, failing which costs of Rs. 5,000 apply.", {"2025-09-20"}),
+    ("Compliance report due by 2025-10-01 as per the consent order.", {"2025-10-01"}),
+    ("This lease commences on the 1st day of April, 2025 and expires on the 31st day of March, 2028.", {"2028-03-31"}),
+    ("Possession shall be handed over by 30-Jun-2026.", {"2026-06-30"}),
+    ("The licence is valid till 31 Dec, 2027 unless suspended earlier.", {"2027-12-31"}),
+    ("Payment of Rs. 85,00,000 is due by Sept. 30, 2025 in two instalments.", {"2025-09-30"}),
+    ("The Board meeting will be held on November 12th, 2025 at Mumbai.", {"2025-11-12"}),
+    ("Notice dt. 05/11/25 directs the occupier to vacate.", {"2025-11-05"}),
+    ("The annual return for FY 2024-25 must be filed by 30/11/2025.", {"2025-11-30"}),
+    ("The FIR was registered on 10/09/2025 at 18:30 hrs at Dadar Police Station.", set()),
+    ("Case No. 2056/2025 was listed at 11:15 AM in Court Room 4.", set()),
+    ("Section 420 IPC is punishable with imprisonment up to 7 years.", set()),
+    ("The agreement dated 12.03.2024 stands renewed until 11.03.2027.", {"2027-03-11"}),
+    ("The Lessee may 15 days after notice remove fixtures.", set()),
+    ("The first instalment is due on 15th September 2025 and the second on 15th October.", {"2025-10-15"}),
+    ("Per the US counterparty's draft, closing occurs on 09/25/2025.", {"2025-09-25"}),
+    ("Rent for the month shall be paid by the 5th of each month.", set()),
+    (SAMPLE_FIR, {"2025-09-20", "2025-09-25"}),
+]
+
+
+def score(extract):
+    tp = fp = fn = 0
+    for text, expected in LABELLED:
+        got = {m["date"] for m in extract(text)}
+        tp += len(got & expected)
+        fp += len(got - expected)
+        fn += len(expected - got)
+    precision = tp / (tp + fp) if tp + fp else 1.0
+    recall = tp / (tp + fn) if tp + fn else 1.0
+    return precision, recall
+
+
+def throughput(target_mb):
+    corpus = "\n\n".join(text for text, _ in LABELLED)
+    document = corpus * max(1, int(target_mb * 1024 * 1024 / len(corpus)))
+    start = time.perf_counter()
+    mentions, ambiguous = dates_with_context(document, today=TODAY)
+    elapsed = time.perf_counter() - start
+    return document, len(document) / (1024 * 1024) / elapsed, len(mentions), elapsed
+
+
+if __name__ == "__main__":
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    local = lambda text: extract_future_dates_with_context(text, mode="local", today=TODAY)
+    llm = lambda text: extract_future_dates_with_context(text, mode="llm", today=TODAY)
+    ambiguous = sum(len(dates_with_context(text, today=TODAY)[1]) for text, _ in LABELLED)
+
+    print(f"{'path':<8}{'precision':>11}{'recall':>8}{'llm_calls':>11}")
+    for label, extract in (("local", local), ("llm", llm)):
+        llm_usage.reset()
+        precision, recall = score(extract)
+        note = "" if label == "local" or LLM_BACKEND != "fake" else "   (fake backend: set LLM_BACKEND=gemini)"
+        print(f"{label:<8}{precision:>11.3f}{recall:>8.3f}{llm_usage.snapshot()['calls']:>11}{note}")
+    print(f"ambiguous mentions llm_fallback would send: {ambiguous}")
+
+    document, mb_per_s, found, elapsed = throughput(megabytes)
+    print(f"\nlocal throughput: {mb_per_s:.1f} MB/s on {len(document) / (1024 * 1024):.1f} MB "
+          f"({found} unique future dates with context, {elapsed:.2f}s)")
+    print(f"llm path for the same document: 1 call, ~{estimate_tokens(document):,} prompt tokens")
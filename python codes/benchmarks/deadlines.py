@@ -0,0 +1,103 @@
+"""
+Accuracy and throughput of the relative-deadline resolver.
+
+Labelled notices, orders and agreements state deadlines relative to other dates in the same
+text ("within 30 days of receipt of this notice", "seven days before the hearing", "on or
+before the end of the financial year"). Each is run through
+calendar_.calender.extract_future_dates_with_context with relative=False (explicit dates
+only, as before) and relative=True, against a fixed "today", and scored on the deadline
+dates. Also reports how the anchors were found, the closed-day adjustments and throughput
+on a multi-megabyte document. Neither path makes an LLM call.
+
+    python benchmarks/deadlines.py [megabytes]
+"""
+import os
+import sys
+import time
+from collections import Counter
+from datetime import date
+
+os.environ.setdefault("LLM_BACKEND", "fake")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calendar_.calender import extract_future_dates_with_context
+from helpers.deadlines import resolve_deadlines
+from utils import llm_usage
+
+TODAY = date(2025, 9, 15)
+
+# (text, expected future ISO dates: explicit and resolved)
+LABELLED = [
+    ("LEGAL NOTICE dated 14/09/2025. You are called upon to pay Rs. 5,00,000 within 30 days of receipt of this "
+     "notice, failing which proceedings shall be initiated.", {"2025-10-14"}),
+    ("Notice dt. 16/09/2025. The notice was received by the addressee on 18/09/2025. Reply within fifteen (15) "
+     "days of receipt of this notice.", {"2025-09-16", "2025-09-18", "2025-10-03"}),
+    ("The hearing in the matter is fixed on 20.10.2025 before the Civil Judge. The respondent shall file the "
+     "reply at least seven (7) days before the hearing.", {"2025-10-20", "2025-10-13"}),
+    ("Written submissions shall be filed three clear days before the date of hearing. Next date of hearing: "
+     "24/11/2025.", {"2025-11-24", "2025-11-20"}),
+    ("The Effective Date of this Agreement is 1st April 2025. The licence fee shall be revised eleven months "
+     "after the Effective Date.", {"2026-03-02"}),
+    ("The Lessee shall pay the arrears on or before the end of the financial year. Dated 01/08/2025.",
+     {"2026-03-31"}),
+    ("The return for the previous year shall be filed not later than the end of FY 2026-27.", {"2027-03-31"}),
+    ("The audited accounts shall be filed within 60 days from the end of each quarter. Date: 15/09/2025.",
+     {"2025-12-01"}),
+    ("ORDER dated 10/10/2025. The appellant shall deposit the amount within two working days from the date of "
+     "this order.", {"2025-10-10", "2025-10-14"}),
+    ("The interim order dated 03.10.2025 shall be complied with within 2 weeks from 03.10.2025.",
+     {"2025-10-03", "2025-10-17"}),
+    ("The Buyer shall make the final payment one month before the end of the calendar year 2025.",
+     {"2025-11-28"}),
+    ("The tenant has a notice period of 15 days and may vacate at any time.", set()),
+    ("The Lessee may 15 days after notice remove fixtures.", set()),
+    ("Possession within 15 days of the order of the Tribunal.", set()),
+]
+
+
+def score(extract):
+    tp = fp = fn = 0
+    for text, expected in LABELLED:
+        got = {m["date"] for m in extract(text)}
+        tp += len(got & expected)
+        fp += len(got - expected)
+        fn += len(expected - got)
+    precision = tp / (tp + fp) if tp + fp else 1.0
+    recall = tp / (tp + fn) if tp + fn else 1.0
+    return precision, recall
+
+
+def throughput(target_mb):
+    corpus = "\n\n".join(text for text, _ in LABELLED)
+    document = corpus * max(1, int(target_mb * 1024 * 1024 / len(corpus)))
+    start = time.perf_counter()
+    resolved, unresolved = resolve_deadlines(document, reference=TODAY)
+    elapsed = time.perf_counter() - start
+    return document, len(document) / (1024 * 1024) / elapsed, len(resolved), len(unresolved), elapsed
+
+
+if __name__ == "__main__":
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 2
+    explicit = lambda text: extract_future_dates_with_context(text, today=TODAY, relative=False)
+    relative = lambda text: extract_future_dates_with_context(text, today=TODAY)
+
+    print(f"{'path':<16}{'precision':>11}{'recall':>8}{'llm_calls':>11}")
+    for label, extract in (("explicit only", explicit), ("with relative", relative)):
+        llm_usage.reset()
+        precision, recall = score(extract)
+        print(f"{label:<16}{precision:>11.3f}{recall:>8.3f}{llm_usage.snapshot()['calls']:>11}")
+
+    methods, adjusted, assumed, unresolved = Counter(), 0, 0, 0
+    for text, _ in LABELLED:
+        resolved, missing = resolve_deadlines(text, reference=TODAY)
+        unresolved += len(missing)
+        for deadline in resolved:
+            methods[deadline["provenance"]["anchor"]["method"]] += 1
+            adjusted += deadline["provenance"]["adjusted"] is not None
+            assumed += deadline["provenance"]["assumed"]
+    print(f"\nanchors: {dict(methods)}; moved off a closed day: {adjusted}; assumed anchor: {assumed}; "
+          f"unresolved: {unresolved}")
+
+    document, mb_per_s, found, missing, elapsed = throughput(megabytes)
+    print(f"\nthroughput: {mb_per_s:.1f} MB/s on {len(document) / (1024 * 1024):.1f} MB "
+          f"({found:,} resolved, {missing:,} unresolved, {elapsed:.2f}s)")
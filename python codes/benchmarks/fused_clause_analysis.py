@@ -0,0 +1,99 @@
+"""
+Three-stage vs fused clause analysis on the sample FIR.
+
+Runs litigation_workflow with fused=False / fused=True for several output plans and
+reports LLM calls, estimated tokens and wall time. Both modes run only the stages the
+plan needs and take explanations of known sections from the statute knowledge base, so
+fused mode only pays off where more than one per-clause stage still needs the LLM
+(here: the clause sub-categories asked for alongside attributes). Defaults to the offline
+fake backend with a simulated per-call and per-token latency; set LLM_BACKEND=gemini to
+measure against the API.
+
+    python benchmarks/fused_clause_analysis.py
+"""
+import json
+import os
+import re
+import sys
+import time
+
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("FAKE_LLM_LATENCY", "0.4")
+os.environ.setdefault("FAKE_LLM_TOKEN_LATENCY", "0.002")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contextlib import redirect_stdout
+from io import StringIO
+
+from sample_docs import SAMPLE_FIR
+from utils import llm_usage, set_fake_responder
+from workflow_fun.lit import litigation_workflow
+
+ATTRIBUTES = {"OffenseType": "Cheating", "ProcedureStep": None, "Punishment": "Up to 7 years and fine",
+              "RightsProtections": None, "Authority": "Dadar Police Station", "OtherNotes": None}
+
+
+def fake_responder(prompt):
+    """Plausible, realistically sized answers for each litigation prompt."""
+    if "For EACH numbered clause" in prompt:
+        # Only the parts the prompt asks for, as a schema-constrained answer would be
+        asked, numbered = prompt.split("Clauses:")
+        parts = {
+            "SubCategory": "Offenses & Crimes",
+            "Attributes": ATTRIBUTES,
+            "Explanation": "The accused is charged with deceiving the complainant to obtain property. " * 3,
+            "PunishmentDetails": "Imprisonment up to seven years and fine.",
+        }
+        parts = {key: value for key, value in parts.items() if f"- {key}:" in asked}
+        clauses = re.findall(r"^\s*(\d+)\. ", numbered, re.MULTILINE)
+        return json.dumps([{"Index": int(i), **parts} for i in clauses])
+    if "extract **all legal clauses" in prompt:
+        return "1. Section 420 IPC\n2. Section 468 IPC\n3. Section 34 IPC\n"
+    if "Return only the sub-category name." in prompt:
+        return "Offenses & Crimes"
+    if "OffenseType" in prompt:
+        return json.dumps(ATTRIBUTES, indent=2)
+    if "PunishmentDetails" in prompt:
+        return json.dumps({"Explanation": "The accused is charged with deceiving the complainant. " * 3,
+                           "PunishmentDetails": "Imprisonment up to seven years and fine."}, indent=2)
+    if "Complainant" in prompt and "Investigator" in prompt:
+        return json.dumps({"Complainant": "Sunita Joshi", "Investigator": "Inspector Ramesh Desai",
+                           "Court": "CJM Mumbai", "Section": "420, 468, 34 IPC"}, indent=2)
+    return "Summary of the case in simple language. " * 20
+
+
+def split_chunks(text, size=1500):
+    chunks, current = [], ""
+    for para in text.split("\n\n"):
+        if current and len(current) + len(para) > size:
+            chunks.append(current)
+            current = ""
+        current += para + "\n\n"
+    return chunks + [current] if current.strip() else chunks
+
+
+PLANS = {
+    "summary": None,
+    "clauses": ["clauses"],
+    "clauses+attributes": ["clauses", "attributes"],
+    "all clause outputs": ["clauses", "attributes", "explanations"],
+}
+
+
+def run(fused, outputs):
+    llm_usage.reset()
+    start = time.perf_counter()
+    with redirect_stdout(StringIO()):
+        litigation_workflow(split_chunks(SAMPLE_FIR), fused=fused, outputs=outputs)
+    stats = llm_usage.snapshot()
+    stats["wall_s"] = round(time.perf_counter() - start, 3)
+    return stats
+
+
+if __name__ == "__main__":
+    set_fake_responder(fake_responder)
+    print(f"{'outputs':<20}{'mode':<13}{'calls':>6}{'prompt_tok':>12}{'output_tok':>12}{'wall_s':>8}")
+    for plan, outputs in PLANS.items():
+        for name, fused in (("three-stage", False), ("fused", True)):
+            s = run(fused, outputs)
+            print(f"{plan:<20}{name:<13}{s['calls']:>6}{s['prompt_tokens']:>12}{s['output_tokens']:>12}{s['wall_s']:>8.2f}")
@@ -0,0 +1,61 @@
+"""
+End-to-end latency of the hybrid document comparison.
+
+A lease of 40 clauses is compared with a revision that changes a handful of them. The
+whole hybrid_difference_workflow runs on the fake backend with a fixed per-call latency,
+once with max_concurrency=1 (every LLM call one after another, as before) and once
+concurrently: both summaries side by side, the holistic and chunk-level stages overlapped
+and the section comparisons in parallel. Wall time is also reported in LLM round trips.
+
+    python benchmarks/hybrid_comparison.py [max_concurrency]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("FAKE_LLM_LATENCY", "0.2")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contextlib import redirect_stdout
+from io import StringIO
+
+from classes.documentComparison import hybrid_difference_workflow
+from utils import FAKE_LLM_LATENCY, llm_usage
+
+SUBJECTS = ["rent", "security deposit", "maintenance charges", "electricity bills", "repairs", "sub-letting",
+            "notice period", "lock-in period", "renewal", "use of premises", "parking", "society rules",
+            "insurance", "inspection", "alterations", "pets", "visitors", "water charges", "property tax", "keys"]
+
+
+def lease(revised=False):
+    clauses = []
+    for i in range(40):
+        subject = SUBJECTS[i % len(SUBJECTS)]
+        text = (f"{i + 1}. The Lessee shall comply with the terms on {subject} set out in Schedule {i % 5 + 1}. "
+                f"Any breach of this clause on {subject} entitles the Lessor to written notice of 15 days.")
+        if revised and i % 8 == 3:
+            text = text.replace("15 days", "30 days").replace("shall comply", "shall strictly comply")
+        clauses.append(text)
+    if revised:
+        clauses.insert(20, "20A. The Lessee shall install a fire extinguisher in the kitchen within 60 days.")
+        del clauses[30]
+    return clauses
+
+
+def run(max_concurrency):
+    llm_usage.reset()
+    start = time.perf_counter()
+    with redirect_stdout(StringIO()):
+        hybrid_difference_workflow(lease(), lease(revised=True), "Lease", "Lease", max_concurrency=max_concurrency,
+                                   use_cache=False)
+    return llm_usage.snapshot()["calls"], time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    print(f"{FAKE_LLM_LATENCY} s per LLM call\n")
+    print(f"{'run':<16}{'llm_calls':>10}{'wall_s':>8}{'round_trips':>13}")
+    for label, limit in (("sequential", 1), (f"concurrent ({concurrency})", concurrency)):
+        calls, elapsed = run(limit)
+        print(f"{label:<16}{calls:>10}{elapsed:>8.2f}{elapsed / FAKE_LLM_LATENCY:>13.1f}")
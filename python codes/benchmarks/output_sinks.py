@@ -0,0 +1,129 @@
+"""
+Per-token print/flush vs the output sinks, at high concurrency.
+
+Many documents stream their answers at once (one thread each), the way a server runs
+workflows. Every token is reported through: the old `print(part, end="", flush=True)`,
+TerminalSink (batched writes), NDJSONSink, QueueSink drained by an asyncio consumer, and
+NullSink. Console output goes to os.devnull through a wrapper that counts write/flush
+calls, i.e. syscalls on a real stdout.
+
+    python benchmarks/output_sinks.py [documents] [tokens_per_document]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from helpers.sinks import NDJSONSink, NullSink, QueueSink, TerminalSink
+
+TOKEN = "the accused "
+
+
+class CountingFile:
+    """os.devnull with a count of write and flush calls."""
+
+    def __init__(self):
+        self._file = open(os.devnull, "w")
+        self.writes = 0
+        self.flushes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return self._file.write(text)
+
+    def flush(self):
+        self.flushes += 1
+        self._file.flush()
+
+
+def stream(tokens):
+    for _ in range(tokens):
+        yield TOKEN
+
+
+def run_print(documents, tokens):
+    out = CountingFile()
+
+    def document(_):
+        text = []
+        for part in stream(tokens):
+            print(part, end="", flush=True)
+            text.append(part)
+        return "".join(text)
+
+    start = time.perf_counter()
+    with redirect_stdout(out):
+        with ThreadPoolExecutor(documents) as pool:
+            list(pool.map(document, range(documents)))
+    return time.perf_counter() - start, out.flushes
+
+
+def run_sink(documents, tokens, make_sink):
+    sinks = [make_sink(i) for i in range(documents)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(documents) as pool:
+        list(pool.map(lambda sink: sink.stream("summary", stream(tokens)), sinks))
+    for sink in sinks:
+        sink.close()
+    return time.perf_counter() - start
+
+
+def run_queue(documents, tokens):
+    """Workflow threads feed QueueSinks; one event loop drains them like SSE handlers would."""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    sinks = [QueueSink(loop, maxsize=256, doc_id=i) for i in range(documents)]
+    received = []
+
+    async def drain(sink):
+        count = 0
+        async for _ in sink:
+            count += 1
+        received.append(count)
+
+    consumers = [asyncio.run_coroutine_threadsafe(drain(sink), loop) for sink in sinks]
+    start = time.perf_counter()
+
+    def document(sink):
+        sink.stream("summary", stream(tokens))
+        sink.close()
+
+    with ThreadPoolExecutor(documents) as pool:
+        list(pool.map(document, sinks))
+    for consumer in consumers:
+        consumer.result()
+    elapsed = time.perf_counter() - start
+    loop.call_soon_threadsafe(loop.stop)
+    return elapsed, sum(received)
+
+
+if __name__ == "__main__":
+    documents = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    tokens = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    total = documents * tokens
+    print(f"{documents} concurrent documents x {tokens} tokens = {total} tokens\n")
+    print(f"{'mode':<22}{'wall_ms':>10}{'us/token':>10}{'flushes':>10}")
+
+    elapsed, flushes = run_print(documents, tokens)
+    print(f"{'print(flush=True)':<22}{elapsed * 1000:>10.1f}{elapsed / total * 1e6:>10.2f}{flushes:>10}")
+
+    out = CountingFile()
+    elapsed = run_sink(documents, tokens, lambda i: TerminalSink(out=out, doc_id=i))
+    print(f"{'TerminalSink':<22}{elapsed * 1000:>10.1f}{elapsed / total * 1e6:>10.2f}{out.flushes:>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "events.ndjson")
+        elapsed = run_sink(documents, tokens, lambda i: NDJSONSink(path, doc_id=i))
+        print(f"{'NDJSONSink':<22}{elapsed * 1000:>10.1f}{elapsed / total * 1e6:>10.2f}{'-':>10}")
+
+    elapsed, events = run_queue(documents, tokens)
+    print(f"{'QueueSink (asyncio)':<22}{elapsed * 1000:>10.1f}{elapsed / total * 1e6:>10.2f}{'-':>10}   {events} events delivered")
+
+    elapsed = run_sink(documents, tokens, lambda i: NullSink())
+    print(f"{'NullSink':<22}{elapsed * 1000:>10.1f}{elapsed / total * 1e6:>10.2f}{0:>10}")
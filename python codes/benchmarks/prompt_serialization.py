@@ -0,0 +1,122 @@
+"""
+Per-prompt token report: indent=2 JSON / repr payloads vs helpers.prompt_data.
+
+Every prompt that embeds structured data is built once with representative
+clause-level results (JSON-in-a-string attributes, "Not available" and null fields,
+repeated keys) and the saving recorded by prompt_data_report is printed per prompt.
+Runs offline on the fake backend.
+
+    python benchmarks/prompt_serialization.py [clauses]
+"""
+import json
+import os
+import sys
+
+os.environ.setdefault("LLM_BACKEND", "fake")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from classes.contracts import contracts
+from classes.corp import corp
+from classes.documentComparison import HybridDocumentDifferenceIdentifier
+from classes.litigation import litigation
+from classes.pers import pers
+from classes.property_real import property
+from classes.regulation_comp import regulatory
+from helpers.prompt_data import prompt_data_report
+from utils import llm_usage
+
+CRIMINAL_ATTRIBUTES = {"OffenseType": "Cheating", "ProcedureStep": None, "Punishment": "Imprisonment up to 7 years and fine",
+                       "RightsProtections": None, "Authority": "Dadar Police Station", "OtherNotes": "Not available"}
+CONTRACT_ATTRIBUTES = {"Parties": "Supplier and Buyer", "Scope": None, "FinancialTerms": "Rs. 5,00,000 within 30 days",
+                       "Obligations": "Deliver goods by 1 May 2025", "Confidentiality": None, "IP_Rights": None,
+                       "TerminationConditions": None, "RiskRestrictions": None, "DisputeResolution": "Arbitration in Mumbai",
+                       "Boilerplate": None, "OtherNotes": "Not available"}
+PERSONAL_ATTRIBUTES = {"Name": "Suresh Patil", "DateOfBirth": "03-04-1985", "DocumentType": "Driving License",
+                       "DocumentNumber": "MH12 20110012345", "IssuedBy": "Not available", "IssueDate": "Not available",
+                       "ExpiryDate": "Not available", "Address": "Flat 4, Shivaji Nagar, Pune 411005", "EducationalDetails": None}
+PROPERTY_ATTRIBUTES = {"BuyerSellerInfo": "Seller: R. Sharma; Buyer: A. Mehta", "PropertyDetails": "Flat 12, Andheri East",
+                       "FinancialTerms": "Rs. 85,00,000 in two instalments", "Deadlines": "Possession by 30 June 2025",
+                       "OtherNotes": "Not available"}
+REGULATORY_ATTRIBUTES = {"PeopleInvolved": None, "AssociationsInvolved": "Maharashtra Pollution Control Board",
+                         "IssuedTo": "Acme Widgets Pvt Ltd", "DocumentNumber": "MPCB/2025/118", "IssueDate": "01/04/2025",
+                         "Location": "Pune", "IssuingAuthority": "Regional Officer", "Purpose": "Consent to operate",
+                         "ActionsRequired": "File annual environmental statement", "Deadlines": "30 September 2025",
+                         "CategoryOfConditions": "Environmental", "OtherNotes": "Not available"}
+COMPARISON = {"differences": ["Rent raised from Rs. 40,000 to Rs. 45,000"], "similarities": ["Same parties"],
+              "impact": "Higher monthly outgo for the lessee", "change_type": "modification", "chunk1_idx": 2, "chunk2_idx": 2}
+
+
+def wrapped(clause, attributes):
+    """Clause-level result as the workflows accumulate it: attributes are the streamed JSON answer."""
+    return {"clause": clause, "attributes": json.dumps(attributes, indent=2)}
+
+
+def build_prompts(n):
+    lit = litigation([])
+    criminal = [wrapped(f"Section 420 IPC - cheating, para {i}", CRIMINAL_ATTRIBUTES) for i in range(n)]
+    "".join(lit.explain_criminal_clause(criminal[0]))
+    details = [{"case_details": json.dumps({"Complainant": "Sunita Joshi", "Investigator": None, "Court": "CJM Mumbai",
+                                            "Section": "420 IPC", "DateTime": f"10/09/2025 (entry {i})", "Punishment": None,
+                                            "OtherNotes": "Not available"}, indent=2)} for i in range(min(n, 10))]
+    "".join(lit.deduplicate_details(details))
+    explained = [{"clause": c, "analysis": json.dumps({"Explanation": "Dishonest inducement to deliver property.",
+                                                        "PunishmentDetails": "Up to 7 years and fine"}, indent=2)} for c in criminal]
+    "".join(lit.summarize_with_advice([details] + explained))
+
+    con = contracts([])
+    clauses = [wrapped(f"The Supplier shall deliver goods, clause {i}", CONTRACT_ATTRIBUTES) for i in range(n)]
+    "".join(con.explain_contract_clause(clauses[0]))
+    "".join(con.makenice([{"clause": c, "analysis": json.dumps({"Explanation": "Delivery obligation", "PracticalEffect": None}, indent=2)}
+                          for c in clauses]))
+
+    per = pers([])
+    records = [wrapped(f"clause {i}", PERSONAL_ATTRIBUTES) for i in range(n)]
+    "".join(per.explain_personal_clause(records[0]))
+    "".join(per.merge_personal_attributes_lm(records))
+    conflicts = [{"key": "Address", "values": ["Flat 4, Shivaji Nagar, Pune", "Flat 4, Shivaji Nagar, Pune 411005, Maharashtra"]}]
+    "".join(per.resolve_merge_conflicts(conflicts))
+    "".join(per.fill_missing_personal_fields("...", ["IssuedBy", "IssueDate", "ExpiryDate"]))
+    "".join(per.generate_summary_from_json([json.dumps(PERSONAL_ATTRIBUTES, indent=2)]))
+
+    cor = corp([])
+    "".join(cor.merge_corporate_clauses_with_llm([f"RESOLVED THAT item {i} be approved." for i in range(n)]))
+    "".join(cor.summarize_corporate_from_json([json.dumps({"DocumentType": "Board Resolution", "Date": "12 March 2025",
+                                                           "Venue": None, "Resolutions": [f"Resolution {i}" for i in range(n)]}, indent=2)]))
+
+    prop = property([])
+    attributes = [wrapped(f"clause {i}", PROPERTY_ATTRIBUTES) for i in range(n)]
+    "".join(prop.explain_property_document(attributes))
+    explanation = {"PartiesExplanation": "R. Sharma sells the flat to A. Mehta.", "PropertyExplanation": "Flat 12, Andheri East.",
+                   "FinancialExplanation": "Rs. 85,00,000 paid in two instalments.", "DeadlinesExplanation": "Possession by 30 June 2025.",
+                   "ResponsibilitiesAndPenalties": None, "OverallExplanation": "A standard sale agreement."}
+    "".join(prop.generate_summary_and_comments(json.dumps(explanation, indent=2)))
+
+    reg = regulatory([])
+    regulatory_attributes = [wrapped(f"clause {i}", REGULATORY_ATTRIBUTES) for i in range(n)]
+    "".join(reg.explain_regulatory_document(regulatory_attributes))
+    "".join(reg.explain_regulatory_document_plain_language(regulatory_attributes))
+
+    comparison = HybridDocumentDifferenceIdentifier(["Lease of premises."], ["Lease of premises, amended."])
+    summary = {"DocumentType": "Lease", "MainPurpose": "Rent of premises", "KeySections": ["Rent", "Term"], "Tone": None}
+    for document in (comparison.doc1, comparison.doc2):
+        document.get("summary", lambda: summary)  # seeded, so the summary prompts are not part of the report
+    comparison.holistic_document_comparison()
+    comparison.synthesize_hybrid_results({"OverallRelationship": "Amendment", "Notes": None},
+                                         {"chunks_processed": {}, "detailed_comparisons": [COMPARISON] * 3, "chunk_matches": []})
+    comparison.generate_comprehensive_summary({"ExecutiveInsights": {"MajorChanges": ["Rent"], "BusinessImpact": None}})
+
+
+if __name__ == "__main__":
+    clauses = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    prompt_data_report.reset()
+    llm_usage.reset()
+    build_prompts(clauses)
+    print(f"{clauses} clause-level results per prompt\n")
+    print(f"{'prompt':<44}{'calls':>6}{'before':>9}{'after':>8}{'saved':>8}{'saved%':>8}")
+    before = after = 0
+    for label, row in prompt_data_report.snapshot().items():
+        before += row["before_tokens"]
+        after += row["after_tokens"]
+        print(f"{label:<44}{row['calls']:>6}{row['before_tokens']:>9}{row['after_tokens']:>8}{row['saved_tokens']:>8}{row['saved_pct']:>8}")
+    print(f"{'total':<44}{'':>6}{before:>9}{after:>8}{before - after:>8}{round(100 * (before - after) / before, 1):>8}")
+    print(f"\nLLM calls: {llm_usage.snapshot()}")
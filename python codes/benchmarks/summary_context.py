@@ -0,0 +1,76 @@
+"""
+Final summary prompt size and latency as the clause count grows.
+
+The litigation summary stage is fed the accumulated [case details] + explained clauses
+for documents of increasing size, once with the whole list interpolated as before and
+once through helpers.context.build_context. Reports estimated prompt tokens and wall time
+of the summarize_with_advice call; the fake backend charges a per-token latency for the
+prompt so a longer prompt costs time the way it does against the API.
+
+    python benchmarks/summary_context.py [max_clauses]
+"""
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("FAKE_LLM_LATENCY", "0.05")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from classes.litigation import litigation
+from helpers.context import build_context
+from utils import estimate_tokens, set_fake_responder
+
+PROMPT_SECONDS_PER_TOKEN = 0.00002  # prefill cost the fake backend does not model
+
+CASE_DETAILS = [{"CaseNumber": "FIR 112/2024", "PoliceStation": "Shivaji Nagar, Pune", "Complainant": "R. Sharma",
+                 "Accused": "S. Patil", "DateOfIncident": "12/03/2024"}]
+CLAUSES = [
+    ("Section 420 IPC", "Cheating and dishonestly inducing delivery of property of Rs. 4,50,000.",
+     "Punishable with imprisonment up to 7 years and fine."),
+    ("Section 406 IPC", "Criminal breach of trust in respect of the deposit handed over on 02/01/2024.",
+     "Imprisonment up to 3 years, or fine, or both."),
+    ("Section 34 IPC", "Acts done by several persons in furtherance of common intention.",
+     "Same liability as if the act were done by the accused alone."),
+    ("Section 154 CrPC", "Information recorded at the police station.", "Not available"),
+    ("Witness statement", "The neighbour saw the accused at the premises in the evening.", "Not available"),
+]
+
+
+def explained_clauses(count):
+    items = []
+    for i in range(count):
+        section, facts, punishment = CLAUSES[i % len(CLAUSES)]
+        attributes = {"clause": f"{section} - {facts} (para {i})",
+                      "attributes": json.dumps({"Section": section, "Facts": facts, "Victim": "Not available"}, indent=2)}
+        analysis = json.dumps({"Explanation": f"{facts} The prosecution relies on paragraph {i}.",
+                               "PunishmentDetails": punishment}, indent=2)
+        items.append({"clause": attributes, "analysis": analysis})
+    return items
+
+
+def run(final_jason, bounded):
+    """Context assembly + the summary call + modeled prompt prefill; returns (prompt tokens, seconds)."""
+    litigation_ = litigation([])
+    # Without a budget the whole list went into the prompt as its Python repr
+    tokens = estimate_tokens(build_context(final_jason, pinned=1) if bounded else str(final_jason))
+    start = time.perf_counter()
+    if bounded:
+        "".join(litigation_.summarize_with_advice(final_jason))
+    else:
+        "".join(litigation_.summarize_with_advice(final_jason, context_tokens=10 ** 9))
+    time.sleep(tokens * PROMPT_SECONDS_PER_TOKEN)
+    return tokens, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    max_clauses = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    set_fake_responder(lambda prompt: "1. **What this document means for you** ...")
+    print(f"{'clauses':>8}{'full_tokens':>14}{'full_ms':>10}{'bounded_tokens':>16}{'bounded_ms':>12}")
+    sizes = [n for n in (50, 200, 1000, 5000, 20000) if n <= max_clauses]
+    for n in sizes:
+        final_jason = [CASE_DETAILS] + explained_clauses(n)
+        full_tokens, full_time = run(final_jason, bounded=False)
+        bounded_tokens, bounded_time = run(final_jason, bounded=True)
+        print(f"{n:>8}{full_tokens:>14}{full_time * 1000:>10.1f}{bounded_tokens:>16}{bounded_time * 1000:>12.1f}")
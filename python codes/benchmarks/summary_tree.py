@@ -0,0 +1,71 @@
+"""
+Hierarchical document summaries: coverage, incremental rebuilds and reuse.
+
+A long contract is summarized through helpers.summary_tree.SummaryTree (every chunk
+summarized in parallel, then merged level by level). Reports the LLM calls and wall time
+of the first build against the previous first/middle/last sampling (10 chunks read), the
+summaries recomputed after editing one section and after inserting one, and the calls a
+category workflow's "overview" output and a comparison make when the tree is already built.
+Runs on the fake backend with a per-call latency.
+
+    python benchmarks/summary_tree.py [chunks]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("FAKE_LLM_LATENCY", "0.05")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contextlib import redirect_stdout
+from io import StringIO
+
+from classes.documentComparison import hybrid_difference_workflow
+from helpers.summary_tree import SummaryTree
+from utils import llm_usage, set_fake_responder
+from workflow_fun.contra import contract_workflow
+
+
+def contract(clauses):
+    return [f"{c}. Clause {c}\n{c}.1 The Supplier shall deliver lot {c} by {c % 28 + 1} March 2026. "
+            f"{c}.2 The Buyer shall pay Rs. {c * 1000} within 30 days of delivery of lot {c}." for c in range(1, clauses + 1)]
+
+
+def timed(fn):
+    llm_usage.reset()
+    start = time.perf_counter()
+    with redirect_stdout(StringIO()):
+        result = fn()
+    return result, llm_usage.snapshot()["calls"], time.perf_counter() - start
+
+
+def row(label, calls, elapsed, read):
+    print(f"{label:<42}{calls:>10}{elapsed:>8.2f}{read:>14}")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    set_fake_responder(lambda prompt: "- The Supplier delivers the lot; the Buyer pays within 30 days.", text_only=True)
+    chunks = contract(n)
+    print(f"{n}-chunk contract, {os.environ['FAKE_LLM_LATENCY']} s per LLM call, concurrency 8\n")
+    print(f"{'run':<42}{'llm_calls':>10}{'wall_s':>8}{'chunks_read':>14}")
+    row("first/middle/last sampling (before)", 1, float(os.environ["FAKE_LLM_LATENCY"]), f"10/{n}")
+
+    tree, calls, elapsed = timed(lambda: SummaryTree(chunks, max_concurrency=8))
+    row(f"summary tree, first build ({tree.stats()['levels']} levels)", calls, elapsed, f"{n}/{n}")
+
+    edited = list(chunks)
+    edited[n // 2] = edited[n // 2].replace("within 30 days", "within 45 days")
+    tree, calls, elapsed = timed(lambda: SummaryTree(edited, max_concurrency=8))
+    row("one section edited", calls, elapsed, f"{n}/{n}")
+
+    inserted = edited[:n // 3] + ["Clause 0A. The Buyer may inspect any lot before payment."] + edited[n // 3:]
+    tree, calls, elapsed = timed(lambda: SummaryTree(inserted, max_concurrency=8))
+    row("one section inserted", calls, elapsed, f"{n + 1}/{n + 1}")
+
+    _, calls, elapsed = timed(lambda: contract_workflow(chunks, max_concurrency=8, outputs=["overview"]))
+    row("contract_workflow(outputs=['overview'])", calls, elapsed, f"{n}/{n}")
+
+    results, calls, elapsed = timed(lambda: hybrid_difference_workflow(chunks, edited, "Contract", "Contract", max_concurrency=8))
+    row("comparison with the edited version", calls, elapsed, f"{2 * n}/{2 * n}")
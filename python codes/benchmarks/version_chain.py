@@ -0,0 +1,76 @@
+"""
+Version-chain comparison of a negotiated contract, v1 ... v12.
+
+Each revision rewords a few sub-clauses of the previous one, inserts or drops a clause now
+and then. The chain is ingested once with compare_versions_workflow (each revision aligned
+and compared with the previous one only), then clause-history queries run against the
+index. The same answers from isolated pairwise runs need hybrid_difference_workflow for
+every consecutive pair. Reports LLM calls and wall time on the fake backend.
+
+    python benchmarks/version_chain.py [revisions] [clauses]
+"""
+import os
+import random
+import re
+import sys
+import time
+
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("FAKE_LLM_LATENCY", "0.05")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contextlib import redirect_stdout
+from io import StringIO
+
+from classes.documentComparison import hybrid_difference_workflow
+from utils import llm_usage
+from workflow_fun.doc_comp import compare_versions_workflow
+
+
+def contract(clauses):
+    return [f"{c}. Clause heading {c}\n{c}.1 The Supplier shall deliver the goods under clause {c} within 15 days. "
+            f"{c}.2 The Buyer shall pay Rs. {c * 1000} within 30 days of delivery under clause {c}."
+            for c in range(1, clauses + 1)]
+
+
+def negotiate(chunks, revisions, seed=0):
+    rng = random.Random(seed)
+    chain = [list(chunks)]
+    for k in range(2, revisions + 1):
+        revised = list(chain[-1])
+        for i in rng.sample(range(min(len(revised), 12)), 3):  # negotiation centres on a few clauses
+            revised[i] = re.sub(r"within \d+ days of delivery", f"within {rng.choice([20, 45, 60, 90])} days of delivery", revised[i])
+        if k % 4 == 0:
+            revised.insert(rng.randrange(len(revised)), f"{k}A. New clause {k}A\n{k}A.1 Liquidated damages apply from v{k}.")
+        chain.append(revised)
+    return chain
+
+
+def timed(fn):
+    llm_usage.reset()
+    start = time.perf_counter()
+    with redirect_stdout(StringIO()):
+        result = fn()
+    return result, llm_usage.snapshot()["calls"], time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    n_revisions = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    clauses = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    revisions = negotiate(contract(clauses), n_revisions)
+    print(f"{n_revisions} revisions of a {clauses}-clause contract, {os.environ['FAKE_LLM_LATENCY']} s per LLM call\n")
+    print(f"{'run':<34}{'llm_calls':>10}{'wall_s':>8}")
+
+    (chain, report), calls, elapsed = timed(lambda: compare_versions_workflow(revisions, "Contract", max_concurrency=8, use_cache=False))
+    print(f"{'version chain (ingest)':<34}{calls:>10}{elapsed:>8.2f}")
+    clause = next(c for c, n in chain.changed_clauses().items() if n > 1)
+    _, calls, elapsed = timed(lambda: [chain.clause_history(c) for c in chain.changed_clauses()] + [chain.changes_in(-1)])
+    print(f"{'clause-history queries':<34}{calls:>10}{elapsed:>8.4f}")
+    _, calls, elapsed = timed(lambda: [hybrid_difference_workflow(a, b, "Contract", "Contract", max_concurrency=8, use_cache=False)
+                                       for a, b in zip(revisions, revisions[1:])])
+    print(f"{'isolated pairwise runs':<34}{calls:>10}{elapsed:>8.2f}")
+
+    print(f"\nclauses changed across the chain: {len(chain.changed_clauses())}")
+    print(f"history of clause {clause}:")
+    for event in chain.clause_history(clause):
+        print(f"  {event['version_label']:>4} {event['type']:<9} {[(e['old'], e['new']) for e in event['redline']]}")
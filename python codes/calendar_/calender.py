@@ -1,9 +1,9 @@
 import json
 from datetime import datetime, timedelta, date
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from utils import call_gemini
-import re
+from utils import call_gemini, call_gemini_structured
+from helpers.dates import dates_with_context
+from helpers.deadlines import resolve_deadlines
+from helpers.schemas import DateMention, to_jsonable
 
 SCOPES = ['https://www.googleapis.com/auth/calendar']
 
@@ -28,10 +28,41 @@ def generate_event_summary(context_sentence):
     return summary if summary else "Legal Deadline"
 
 
-def extract_future_dates_with_context(doc_text):
-    """Extract future dates and context using Gemini instead of dateparser."""
+def extract_future_dates_with_context(doc_text, mode="local", llm_fallback=False, today=None, relative=True):
+    """
+    Future dates with their sentence context: [{"date": "YYYY-MM-DD", "context": sentence}].
+
+    mode="local" finds them with the rule-based extractor (helpers.dates), no LLM call. With
+    llm_fallback, only the sentences holding ambiguous mentions (no year, day/month order
+    guessed) are sent to Gemini, instead of the local guesses. mode="llm" sends the whole
+    document to Gemini as before.
+
+    With `relative`, deadlines stated relative to other dates ("within 30 days of receipt of this
+    notice", "on or before the end of the financial year") are resolved locally as well
+    (helpers.deadlines) and carry "expression" and "provenance" keys.
+    """
+    today = today or datetime.now().date()
+    if mode == "llm":
+        return extract_future_dates_llm(doc_text, today)
+
+    mentions, ambiguous = dates_with_context(doc_text, today=today, keep_ambiguous=not llm_fallback)
+    if llm_fallback and ambiguous:
+        sentences = list(dict.fromkeys(context for _, context in ambiguous))
+        seen = {(m["date"], m["context"]) for m in mentions}
+        for mention in extract_future_dates_llm("\n".join(sentences), today):
+            if (mention["date"], mention["context"]) not in seen:
+                seen.add((mention["date"], mention["context"]))
+                mentions.append(mention)
+    if relative:
+        resolved, _ = resolve_deadlines(doc_text, reference=today)
+        mentions.extend(deadline for deadline in resolved if date.fromisoformat(deadline["date"]) > today)
+    return mentions
 
-    today = datetime.now().date()
+
+def extract_future_dates_llm(doc_text, today=None):
+    """Extract future dates and context using Gemini."""
+
+    today = today or datetime.now().date()
 
     prompt = f"""
     Extract all dates mentioned in the text below.
@@ -44,29 +75,12 @@ def extract_future_dates_with_context(doc_text):
     {doc_text}
     """
 
-    response_text = call_gemini(prompt).strip()
-
-    if not response_text:
-        print("Gemini returned an empty response.")
-        return []
-    try:
-        results = json.loads(response_text)
-    except json.JSONDecodeError:
-        match = re.search(r"\[.*\]", response_text, re.DOTALL)
-        if match:
-            try:
-                results = json.loads(match.group())
-            except json.JSONDecodeError:
-                print("Still invalid after extraction.")
-                return []
-        else:
-            return []
-
-    if not isinstance(results, list):
-        print("Gemini returned something unexpected, forcing empty list.")
+    results = call_gemini_structured(prompt, list[DateMention])
+    if results is None:
+        print("Gemini returned no usable date list.")
         return []
 
-    return results
+    return to_jsonable(results)
 
 
 def save_dates_to_json(results, filename="dates.json"):
@@ -79,6 +93,9 @@ def save_dates_to_json(results, filename="dates.json"):
 
 def get_calendar_service():
     """Authenticate and return Google Calendar API service."""
+    from google_auth_oauthlib.flow import InstalledAppFlow
+    from googleapiclient.discovery import build
+
     flow = InstalledAppFlow.from_client_secrets_file("credentials.json", SCOPES)
     creds = flow.run_local_server(port=0)
     service = build("calendar", "v3", credentials=creds)
@@ -1,6 +1,6 @@
 from utils import *
-import json
-import re
+from helpers.prompt_data import to_prompt
+from helpers.schemas import ContractAttributes, ContractExplanation, FusedContractClause
 
 class contracts:
 
@@ -79,7 +79,7 @@ class contracts:
         Clause:
         \"\"\"{clause_text}\"\"\"
         """
-        return call_gemini1(prompt)
+        return call_gemini1(prompt, response_schema=ContractAttributes)
 
 
 
@@ -102,22 +102,76 @@ class contracts:
         - If the clause only identifies a party or role, state that directly without judging completeness.
 
         Clause:
-        \"\"\"{clause_text}\"\"\"
+        \"\"\"{to_prompt(clause_text, "explain_contract_clause")}\"\"\"
 
         Return the output in JSON format with every key in diffrent line:
         - Explanation
         - PracticalEffect
         """
-        return call_gemini1(prompt)
+        return call_gemini1(prompt, response_schema=ContractExplanation)
     
 
+    # One schema-constrained call per clause batch: sub-category, attributes and explanation together
+    fused_schema = list[FusedContractClause]
+
+    # What the fused prompt asks for, per part (helpers.fused.FUSED_STAGES)
+    fused_instructions = {
+        "SubCategory": """- SubCategory: one of these sub-categories (or a new but precise one if none fits):
+            Core Relationship, Financial Terms, Performance & Obligations, Confidentiality & IP,
+            Termination & Exit, Risk & Restrictions, Dispute Handling, Boilerplate""",
+        "Attributes": """- Attributes: an object with keys Parties, Scope, FinancialTerms, Obligations, Confidentiality, IP_Rights,
+          TerminationConditions, RiskRestrictions, DisputeResolution, Boilerplate, OtherNotes (null when not relevant)""",
+        "Explanation": """- Explanation: what the clause states, in plain English
+        - PracticalEffect: the practical effect on the parties (rights, obligations, benefits, restrictions)""",
+    }
+
+
+    def analyze_contract_clauses_fused(self, clauses, parts=("SubCategory", "Attributes", "Explanation")):
+        """Classify, extract attributes and explain a batch of Contract clauses in a single call; only `parts` are asked for"""
+
+        numbered = "\n".join(f"{i}. {c}" for i, c in enumerate(clauses, 1))
+        asked = "\n        ".join(self.fused_instructions[part] for part in parts)
+        prompt = f"""
+        You are a legal assistant specializing in Contract Law.
+
+        For EACH numbered clause below, return one JSON object with:
+        - Index: the clause number
+        {asked}
+
+        Rules:
+        - Focus only on the given clause, do not assume or speculate about missing terms.
+        - If the clause only identifies a party or role, state that directly without judging completeness.
+
+        Return a JSON array with one object per clause, in the same order.
+
+        Clauses:
+        {numbered}
+        """
+        return call_gemini1(prompt, response_schema=self.fused_schema)
+
+
     def makenice(self, clause_text):
         """Generate explanation + practical effect for a Contract clause"""
 
         prompt = f"""
         We would give you a json file and make it display nice and which cell are duplicated make it as one and remove all null columns and the key name which are repeated merge them in a list display it nicely 
-        {clause_text}
+        {to_prompt(clause_text, "makenice", abbreviate=True)}
         """
         return call_gemini1(prompt)
 
-    
\ No newline at end of file
+
+    def polish_contract_overview(self, overview_markdown):
+        """Optional prose pass over the locally normalized contract overview"""
+
+        prompt = f"""
+        You are a legal assistant. Below is a structured overview of a contract.
+        Rewrite the explanations so they read smoothly for a non-lawyer.
+
+        Rules:
+        - Keep the same headings, order and facts; do not add, drop or merge clauses.
+        - Do not invent terms that are not in the overview.
+        - Return Markdown only.
+
+        {overview_markdown}
+        """
+        return call_gemini1(prompt)
@@ -1,6 +1,8 @@
 from utils import *
-import json
-import re
+from helpers.context import DEFAULT_CONTEXT_TOKENS, build_context
+from helpers.json_utils import as_json
+from helpers.prompt_data import to_prompt
+from helpers.schemas import ClauseExplanation, CorporateAttributes, DocumentTypePrediction
 
 class corp:
 
@@ -59,7 +61,7 @@ class corp:
         Document:
         \"\"\"{doc_text}\"\"\"
         """
-        return call_gemini1(prompt)
+        return call_gemini1(prompt, response_schema=DocumentTypePrediction)
 
 
     def extract_corporate_attributes(self,clause_text, predicted_doc_type=None):
@@ -99,7 +101,7 @@ class corp:
         Clause:
         \"\"\"{clause_text}\"\"\"
         """
-        return call_gemini1(prompt)
+        return call_gemini1(prompt, response_schema=CorporateAttributes)
     
 
     def merge_corporate_clauses_with_llm(self,corporate_clauses, predicted_doc_type=None):
@@ -134,17 +136,35 @@ class corp:
         PredictedDocumentType: {predicted_doc_type or "Not provided"}
 
         Clauses:
-        {json.dumps(normalized_clauses, indent=2)}
+        {to_prompt(normalized_clauses, "merge_corporate_clauses_with_llm")}
 
         Return ONLY the final merged JSON.
         """
-        merged = call_gemini1(prompt)
-        try:
-            return json.loads(merged)
-        except Exception:
-            return merged  # fallback: return raw text if JSON parsing fails
+        return call_gemini1(prompt)
     
 
+    def resolve_merge_conflicts(self,conflicts, doc_text=None):
+        """
+        Ask the LLM to pick a value only for the keys the local merge could not reconcile.
+        Much smaller than re-sending every clause-level JSON.
+        """
+        prompt = f"""
+        You are a corporate governance normalizer.
+
+        While merging the details extracted from ONE document, these fields received
+        different values from different parts of the document:
+        {to_prompt(conflicts, "resolve_merge_conflicts")}
+
+        For each field choose the correct, most complete value (you may combine them if they
+        describe the same thing). {"Use the document text below to decide." if doc_text else ""}
+
+        Return ONLY a JSON object mapping each "key" to the chosen value.
+        {"Document Text:" if doc_text else ""}
+        {doc_text or ""}
+        """
+        return call_gemini1(prompt)
+
+
     def explain_corporate_clause(self,clause_text):
         """
         Explain a corporate clause in simple English + why it matters (governance significance).
@@ -164,46 +184,15 @@ class corp:
         \"\"\"{clause_text}\"\"\"
         Return ONLY the JSON.
         """
-        result = call_gemini1(prompt)
-
-        # Ensure it always returns JSON (avoids plain text leakage from LLM)
-        try:
-            return json.loads(result)
-        except Exception:
-            return {"Explanation": result, "Significance": "Could not parse as JSON"}
-
-
-    def safe_json_loads(self,raw):
-        """
-        Try to safely load JSON even if it's wrapped in markdown or contains junk.
-        """
-        if not isinstance(raw, str):
-            return raw  # already dict or list
-
-        # Remove markdown fences like ```json ... ```
-        cleaned = re.sub(r"^```[a-zA-Z]*\n?", "", raw.strip())
-        cleaned = re.sub(r"```$", "", cleaned.strip())
-
-        try:
-            return json.loads(cleaned)
-        except Exception:
-            # Last resort: try to extract the first JSON object/array substring
-            match = re.search(r"(\{.*\}|\[.*\])", cleaned, re.DOTALL)
-            if match:
-                try:
-                    return json.loads(match.group(1))
-                except Exception:
-                    return {"raw_text": cleaned}
-            return {"raw_text": cleaned}
-        
+        return call_gemini1(prompt, response_schema=ClauseExplanation)
 
 
-    def summarize_corporate_from_json(self,extracted_json):
+    def summarize_corporate_from_json(self, extracted_json, context_tokens=DEFAULT_CONTEXT_TOKENS):
         """
         Ask LLM to generate a short professional summary of the corporate document
         using the merged JSON as context.
         """
-        extracted_json = self.safe_json_loads(extracted_json)
+        context = build_context(as_json(extracted_json), context_tokens, label="summarize_corporate_from_json")
 
         prompt = f"""
         You are a corporate governance summarizer.
@@ -220,6 +209,6 @@ class corp:
 
         JSON:
         ```json
-        {json.dumps(extracted_json, indent=2)}
+        {context}
         """
         return call_gemini1(prompt)
\ No newline at end of file
@@ -1,42 +1,89 @@
-from utils import call_gemini, client
-import json
-import re
-from typing import Dict, List, Tuple, Any, Optional
+from utils import call_gemini, call_gemini_structured
+from helpers.alignment import align_chunks, chunk_terms
+from helpers.artifacts import ArtifactCache, DocumentArtifacts, comparison_cache, document_artifacts, document_cache
+from helpers.clause_history import ClauseHistory
+from helpers.executor import DEFAULT_MAX_CONCURRENCY, bounded_map
+from helpers.prompt_data import to_prompt
+from helpers.redline import UNCHANGED, classify_alignment, redline
+from helpers.schemas import ChunkComparison, DocumentSummary, HolisticComparison, HybridSynthesis, to_jsonable
+from helpers.summary_tree import SummaryTree
+import threading
+from typing import Dict, List, Any, Optional, Union
 from collections import defaultdict
 
+SUMMARY_MAX_CHUNKS = 10  # longer documents are summarized through their SummaryTree, not their full text
+DEFAULT_MAX_DETAILED = 50  # detailed LLM comparisons per document pair, most changed sections first; None: no cap
+
+
 class HybridDocumentDifferenceIdentifier:
     
-    def __init__(self, doc1_chunks: List[str], doc2_chunks: List[str], doc1_category: str = None, doc2_category: str = None):
-        self.doc1_chunks = doc1_chunks
-        self.doc2_chunks = doc2_chunks
+    def __init__(self, doc1_chunks: Union[List[str], DocumentArtifacts], doc2_chunks: Union[List[str], DocumentArtifacts],
+                 doc1_category: str = None, doc2_category: str = None, cache: Optional[ArtifactCache] = None):
+        """
+        Documents are chunk lists or DocumentArtifacts. With a `cache` (helpers.artifacts.document_cache),
+        chunk lists seen before reuse their term counts, metadata and summary from earlier comparisons.
+        """
+        self.doc1 = doc1_chunks if isinstance(doc1_chunks, DocumentArtifacts) else document_artifacts(doc1_chunks, cache)
+        self.doc2 = doc2_chunks if isinstance(doc2_chunks, DocumentArtifacts) else document_artifacts(doc2_chunks, cache)
+        self.doc1_chunks = self.doc1.chunks
+        self.doc2_chunks = self.doc2.chunks
         self.doc1_category = doc1_category
         self.doc2_category = doc2_category
-        
-        # Create document summaries for holistic analysis
-        self.doc1_summary = self.create_document_summary(doc1_chunks, "Document 1")
-        self.doc2_summary = self.create_document_summary(doc2_chunks, "Document 2")
-        
-    def create_document_summary(self, chunks: List[str], doc_label: str, max_chunks: int = 10) -> Dict[str, str]:
+        self.summary_concurrency = DEFAULT_MAX_CONCURRENCY
+        # Per-instance memo with one lock per summary: both summaries can be created side by side,
+        # and comparisons running in other threads never wait on each other
+        self._summaries = {}
+        self._summary_locks = {"doc1": threading.Lock(), "doc2": threading.Lock()}
+        self.summaries_created = set()
+
+    # Document summaries for holistic analysis are created on first use, not in __init__, and
+    # shared with other comparisons of the same document (failed summaries are not kept)
+    def _summary(self, slot: str, document: DocumentArtifacts, doc_label: str) -> Dict[str, str]:
+        with self._summary_locks[slot]:
+            if slot not in self._summaries:
+                def create():
+                    self.summaries_created.add(slot)
+                    return self.summarize_document(document, doc_label)
+                self._summaries[slot] = document.get("summary", create, keep=lambda s: "error" not in s)
+            return self._summaries[slot]
+
+    @property
+    def doc1_summary(self) -> Dict[str, str]:
+        return self._summary("doc1", self.doc1, "Document 1")
+
+    @property
+    def doc2_summary(self) -> Dict[str, str]:
+        return self._summary("doc2", self.doc2, "Document 2")
+
+    def prepare_summaries(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> None:
+        """Create both document summaries side by side; summaries already created are reused."""
+        self.summary_concurrency = max_concurrency
+        bounded_map(lambda name: getattr(self, name), ["doc1_summary", "doc2_summary"], max_concurrency)
+
+    def summary_tree(self, document: DocumentArtifacts) -> SummaryTree:
+        """The document's hierarchical summary, shared through its artifacts and the node cache."""
+        return document.get("summary_tree", lambda: SummaryTree(document.chunks, max_concurrency=self.summary_concurrency))
+
+    def summarize_document(self, document: DocumentArtifacts, doc_label: str) -> Dict[str, str]:
+        tree = self.summary_tree(document) if len(document.chunks) > SUMMARY_MAX_CHUNKS else None
+        return self.create_document_summary(document.chunks, doc_label, tree=tree)
+
+    def create_document_summary(self, chunks: List[str], doc_label: str, max_chunks: int = SUMMARY_MAX_CHUNKS,
+                                tree: Optional[SummaryTree] = None) -> Dict[str, str]:
         """
         Create a comprehensive but concise summary of the entire document.
+        Short documents are read in full; longer ones through the summary tree of every chunk.
         """
-        # Take first, middle, and last chunks to capture overall structure
-        selected_chunks = []
         if len(chunks) <= max_chunks:
-            selected_chunks = chunks
+            source, combined_text = "full text", "\n\n".join(chunks)
         else:
-            # Take first 3, middle 4, and last 3 chunks
-            selected_chunks.extend(chunks[:3])
-            mid_start = len(chunks) // 2 - 2
-            selected_chunks.extend(chunks[mid_start:mid_start + 4])
-            selected_chunks.extend(chunks[-3:])
-        
-        combined_text = "\n\n".join(selected_chunks)
+            tree = tree or SummaryTree(chunks, max_concurrency=self.summary_concurrency)
+            source, combined_text = "hierarchical summary of every section", tree.outline()
         
         prompt = f"""
         Create a comprehensive summary of this {doc_label} for comparison purposes.
         
-        Document Content (selected sections):
+        Document Content ({source}):
         \"\"\"{combined_text}\"\"\"
         
         Return JSON with:
@@ -50,29 +97,24 @@ class HybridDocumentDifferenceIdentifier:
         - Scope: Who/what this document affects
         """
         
-        response = call_gemini(prompt)
-        try:
-            return json.loads(response)
-        except:
-            return {
-                "DocumentType": "Unknown",
-                "MainPurpose": "Could not determine",
-                "error": "Summary generation failed",
-                "raw_response": response
-            }
+        summary = call_gemini_structured(prompt, DocumentSummary)
+        if summary is None:
+            return {"DocumentType": "Unknown", "MainPurpose": "Could not determine", "error": "Summary generation failed"}
+        return to_jsonable(summary)
 
-    def holistic_document_comparison(self) -> Dict[str, Any]:
+    def holistic_document_comparison(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> Dict[str, Any]:
         """
         Compare documents holistically using document summaries.
         """
+        self.prepare_summaries(max_concurrency)
         prompt = f"""
         You are a legal document comparison expert. Compare these two documents holistically.
         
         Document 1 Summary:
-        {json.dumps(self.doc1_summary, indent=2)}
+        {to_prompt(self.doc1_summary, "holistic_document_comparison")}
         
         Document 2 Summary: 
-        {json.dumps(self.doc2_summary, indent=2)}
+        {to_prompt(self.doc2_summary, "holistic_document_comparison")}
         
         Provide holistic comparison in JSON:
         {{
@@ -100,136 +142,100 @@ class HybridDocumentDifferenceIdentifier:
         }}
         """
         
-        response = call_gemini(prompt)
-        try:
-            return json.loads(response)
-        except:
-            return {"error": "Holistic comparison failed", "raw_response": response}
+        comparison = call_gemini_structured(prompt, HolisticComparison)
+        if comparison is None:
+            return {"error": "Holistic comparison failed"}
+        return to_jsonable(comparison)
 
-    def chunk_level_analysis(self) -> Dict[str, Any]:
+    def chunk_level_analysis(self, max_detailed: Optional[int] = DEFAULT_MAX_DETAILED, max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> Dict[str, Any]:
         """
-        Perform detailed chunk-level analysis (using efficient approach from before).
+        Detailed chunk-level analysis. Chunks are aligned locally (hashed n-gram TF-IDF cosine,
+        order-preserving assignment) and diffed sentence by sentence, without LLM calls. Only
+        modified, inserted and deleted sections are sent for a detailed comparison, so the LLM
+        calls scale with the amount of change. Every chunk is covered: long documents are aligned
+        through LSH candidates instead of all pairs. Comparisons run `max_concurrency` at a time;
+        `max_detailed` is a call budget spent on the most changed sections first (None: every
+        changed section); sections over it are counted in coverage["over_budget_sections"].
         """
         print("🔍 Performing detailed chunk-level analysis...")
-        
-        # Extract metadata from key chunks (limit for efficiency)
-        doc1_metadata = []
-        doc2_metadata = []
-        
-        # Process up to 12 chunks from each document
-        max_chunks_to_process = min(12, len(self.doc1_chunks), len(self.doc2_chunks))
-        
-        for i in range(max_chunks_to_process):
-            if i < len(self.doc1_chunks):
-                meta1 = self.extract_chunk_metadata(self.doc1_chunks[i], i, "Doc1")
-                doc1_metadata.append(meta1)
-            
-            if i < len(self.doc2_chunks):
-                meta2 = self.extract_chunk_metadata(self.doc2_chunks[i], i, "Doc2")
-                doc2_metadata.append(meta2)
-        
-        # Find and compare similar chunks
-        similar_chunks = self.find_similar_chunks_efficient(doc1_metadata, doc2_metadata)
-        
-        # Detailed comparisons for top matches
-        detailed_comparisons = []
-        for match in similar_chunks[:6]:  # Top 6 matches
+
+        terms = (self.doc1.get("terms", lambda: chunk_terms(self.doc1_chunks)),
+                 self.doc2.get("terms", lambda: chunk_terms(self.doc2_chunks)))
+        alignment = align_chunks(self.doc1_chunks, self.doc2_chunks, terms=terms)
+        sections = classify_alignment(self.doc1_chunks, self.doc2_chunks, alignment)
+        doc1_metadata = self.doc1.get("metadata:Doc1", lambda: [self.local_chunk_metadata(c, i, "Doc1") for i, c in enumerate(self.doc1_chunks)])
+        doc2_metadata = self.doc2.get("metadata:Doc2", lambda: [self.local_chunk_metadata(c, i, "Doc2") for i, c in enumerate(self.doc2_chunks)])
+
+        changed = [section for section in sections if section["status"] != UNCHANGED]
+        selected = changed
+        if max_detailed is not None:
+            most_changed = {id(section) for section in sorted(changed, key=lambda section: section.get("similarity_score", 0))[:max_detailed]}
+            selected = [section for section in changed if id(section) in most_changed]
+
+        def compare(section):
             try:
-                idx1, idx2 = match['doc1_chunk'], match['doc2_chunk']
-                if idx1 < len(self.doc1_chunks) and idx2 < len(self.doc2_chunks):
-                    comparison = self.compare_chunk_pair_detailed(
-                        self.doc1_chunks[idx1], self.doc2_chunks[idx2], 
-                        doc1_metadata[idx1], doc2_metadata[idx2]
-                    )
-                    detailed_comparisons.append(comparison)
+                return self.compare_changed_section(section)
             except Exception as e:
                 print(f"Error in chunk comparison: {e}")
-        
+                return None
+
+        # Detailed comparisons for the changed sections only, side by side
+        detailed_comparisons = [c for c in bounded_map(compare, selected, max_concurrency) if c is not None]
+
+        status_counts = defaultdict(int)
+        for section in sections:
+            status_counts[section["status"]] += 1
         return {
             "doc1_metadata": doc1_metadata,
-            "doc2_metadata": doc2_metadata, 
-            "chunk_matches": similar_chunks,
+            "doc2_metadata": doc2_metadata,
+            "chunk_matches": alignment["matches"],
+            "sections": [{k: section.get(k) for k in ("doc1_chunk", "doc2_chunk", "status", "similarity_score")} for section in sections],
+            "redline": redline(sections),
             "detailed_comparisons": detailed_comparisons,
             "chunks_processed": {
                 "doc1": len(doc1_metadata),
                 "doc2": len(doc2_metadata),
+                **status_counts,
                 "comparisons": len(detailed_comparisons)
+            },
+            "coverage": {
+                "alignment_mode": alignment["stats"]["mode"],
+                "pairs_scored": alignment["stats"]["pairs_scored"],
+                "all_pairs": alignment["stats"]["all_pairs"],
+                "chunks_diffed": len(self.doc1_chunks) + len(self.doc2_chunks),
+                "changed_sections": len(changed),
+                "compared_sections": len(detailed_comparisons),
+                "over_budget_sections": len(changed) - len(selected),
+                "summary_chunks": {"doc1": len(self.doc1_chunks), "doc2": len(self.doc2_chunks)}
             }
         }
 
-    def extract_chunk_metadata(self, chunk: str, index: int, doc_label: str) -> Dict[str, Any]:
-        """Efficient metadata extraction for chunks."""
+    def local_chunk_metadata(self, chunk: str, index: int, doc_label: str) -> Dict[str, Any]:
+        """Chunk metadata without an LLM call: position, size and the opening line."""
+        first_line = next((line.strip() for line in chunk.splitlines() if line.strip()), "")
+        return {"chunk_index": index, "doc_label": doc_label, "chars": len(chunk), "Summary": first_line[:120]}
+
+    def compare_changed_section(self, section: Dict[str, Any], max_chars: int = 1500) -> Dict[str, Any]:
+        """Detailed comparison of one changed section, from its changed sentences only."""
+        changes = [{"type": c["type"], "old": c["old"][:max_chars], "new": c["new"][:max_chars]} for c in section["changes"]]
         prompt = f"""
-        Extract key metadata from this chunk:
-        
-        {chunk[:800]}{"..." if len(chunk) > 800 else ""}
-        
-        Return JSON:
-        {{"ChunkType": "header/facts/evidence/legal_refs/charges/conclusion", 
-          "KeyTerms": ["important terms"], "Summary": "one line summary"}}
-        """
-        
-        try:
-            response = call_gemini(prompt)
-            metadata = json.loads(response)
-            metadata.update({"chunk_index": index, "doc_label": doc_label})
-            return metadata
-        except:
-            return {
-                "chunk_index": index, "doc_label": doc_label,
-                "ChunkType": "unknown", "Summary": "Processing failed"
-            }
+        Compare two versions of a section of a legal document. Only the sentences that changed
+        are shown ("old" from Document 1, "new" from Document 2); the rest of the section is identical.
 
-    def find_similar_chunks_efficient(self, meta1: List[Dict], meta2: List[Dict]) -> List[Dict]:
-        """Efficient chunk matching based on metadata."""
-        matches = []
-        
-        # Simple but effective matching
-        for i, m1 in enumerate(meta1):
-            for j, m2 in enumerate(meta2):
-                score = 0
-                
-                # Same chunk type = high score
-                if m1.get('ChunkType') == m2.get('ChunkType'):
-                    score += 3
-                
-                # Similar summaries = medium score  
-                summary1 = set(m1.get('Summary', '').lower().split())
-                summary2 = set(m2.get('Summary', '').lower().split())
-                overlap = len(summary1 & summary2)
-                if overlap > 1:
-                    score += overlap
-                
-                if score >= 3:  # Threshold for similarity
-                    matches.append({
-                        "doc1_chunk": i, "doc2_chunk": j,
-                        "similarity_score": score,
-                        "match_reason": f"ChunkType: {m1.get('ChunkType')}, Summary overlap: {overlap}"
-                    })
-        
-        # Sort by score and return top matches
-        return sorted(matches, key=lambda x: x['similarity_score'], reverse=True)
+        Section status: {section["status"]}
+        Changes:
+        {to_prompt(changes, "compare_changed_section")}
 
-    def compare_chunk_pair_detailed(self, chunk1: str, chunk2: str, meta1: Dict, meta2: Dict) -> Dict[str, Any]:
-        """Detailed comparison of chunk pair."""
-        prompt = f"""
-        Compare these chunks:
-        
-        Chunk 1: {chunk1[:500]}...
-        Chunk 2: {chunk2[:500]}...
-        
         Return JSON:
-        {{"differences": ["key differences"], "similarities": ["similarities"], 
+        {{"differences": ["key differences"], "similarities": ["similarities"],
           "impact": "significance of differences", "change_type": "addition/modification/deletion"}}
         """
-        
-        try:
-            response = call_gemini(prompt)
-            result = json.loads(response)
-            result.update({"chunk1_idx": meta1['chunk_index'], "chunk2_idx": meta2['chunk_index']})
-            return result
-        except:
-            return {"error": "Comparison failed", "chunk1_idx": meta1['chunk_index'], "chunk2_idx": meta2['chunk_index']}
+
+        result = call_gemini_structured(prompt, ChunkComparison)
+        indices = {"chunk1_idx": section["doc1_chunk"], "chunk2_idx": section["doc2_chunk"], "status": section["status"]}
+        if result is None:
+            return {"error": "Comparison failed", **indices}
+        return {**to_jsonable(result), **indices}
 
     def synthesize_hybrid_results(self, holistic: Dict, chunk_level: Dict) -> Dict[str, Any]:
         """
@@ -239,7 +245,7 @@ class HybridDocumentDifferenceIdentifier:
         You are synthesizing a hybrid document comparison combining holistic and detailed analysis.
         
         HOLISTIC ANALYSIS:
-        {json.dumps(holistic, indent=2)}
+        {to_prompt(holistic, "synthesize_hybrid_results")}
         
         CHUNK-LEVEL ANALYSIS:
         - Chunks processed: {chunk_level['chunks_processed']}
@@ -247,7 +253,7 @@ class HybridDocumentDifferenceIdentifier:
         - Chunk matches found: {len(chunk_level['chunk_matches'])}
         
         Sample chunk comparisons:
-        {json.dumps(chunk_level['detailed_comparisons'][:3], indent=2)}
+        {to_prompt(chunk_level['detailed_comparisons'][:3], 'synthesize_hybrid_results', abbreviate=True)}
         
         Synthesize into comprehensive comparison:
         {{
@@ -276,23 +282,21 @@ class HybridDocumentDifferenceIdentifier:
         }}
         """
         
-        response = call_gemini(prompt)
-        try:
-            return json.loads(response)
-        except:
+        synthesis = call_gemini_structured(prompt, HybridSynthesis)
+        if synthesis is None:
             return {
                 "error": "Synthesis failed",
                 "holistic_available": bool(holistic),
-                "chunk_analysis_available": bool(chunk_level),
-                "raw_response": response
+                "chunk_analysis_available": bool(chunk_level)
             }
+        return to_jsonable(synthesis)
 
     def generate_comprehensive_summary(self, synthesis: Dict) -> str:
         """Generate executive summary from hybrid analysis."""
         prompt = f"""
         Write a comprehensive executive summary based on this hybrid document analysis:
         
-        {json.dumps(synthesis, indent=2)}
+        {to_prompt(synthesis, "generate_comprehensive_summary")}
         
         Structure the summary in 5-6 paragraphs:
         1. Document Overview & Relationship
@@ -307,7 +311,7 @@ class HybridDocumentDifferenceIdentifier:
         
         return call_gemini(prompt)
 
-    def run_hybrid_comparison(self) -> Dict[str, Any]:
+    def run_hybrid_comparison(self, max_detailed: Optional[int] = DEFAULT_MAX_DETAILED, max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> Dict[str, Any]:
         """
         Run the complete hybrid comparison combining both approaches.
         """
@@ -315,13 +319,16 @@ class HybridDocumentDifferenceIdentifier:
         print(f"📊 Documents: {len(self.doc1_chunks)} vs {len(self.doc2_chunks)} chunks")
         print(f"📂 Categories: {self.doc1_category} vs {self.doc2_category}")
         
-        # Step 1: Holistic comparison
-        print("🌐 Performing holistic document analysis...")
-        holistic_results = self.holistic_document_comparison()
-        
-        # Step 2: Chunk-level analysis  
-        print("🔬 Performing detailed chunk-level analysis...")
-        chunk_results = self.chunk_level_analysis()
+        # Steps 1 and 2 are independent until the synthesis, so they run side by side
+        def holistic():
+            print("🌐 Performing holistic document analysis...")
+            return self.holistic_document_comparison(max_concurrency=max_concurrency)
+
+        def chunk_level():
+            print("🔬 Performing detailed chunk-level analysis...")
+            return self.chunk_level_analysis(max_detailed=max_detailed, max_concurrency=max_concurrency)
+
+        holistic_results, chunk_results = bounded_map(lambda stage: stage(), [holistic, chunk_level], min(2, max_concurrency))
         
         # Step 3: Synthesize results
         print("🧠 Synthesizing hybrid insights...")
@@ -347,7 +354,8 @@ class HybridDocumentDifferenceIdentifier:
                 "analysis_method": "hybrid_holistic_and_granular"
             },
             "ProcessingStats": {
-                "holistic_summaries_created": 2,
+                "holistic_summaries_created": len(self.summaries_created),
+                "holistic_summaries_reused": len(self._summaries) - len(self.summaries_created),
                 "chunks_analyzed": chunk_results['chunks_processed'],
                 "total_comparisons": len(chunk_results['detailed_comparisons']),
                 "analysis_depth": "comprehensive"
@@ -355,24 +363,118 @@ class HybridDocumentDifferenceIdentifier:
         }
 
 
+def comparison_succeeded(results: Dict[str, Any]) -> bool:
+    """Whether every LLM stage of a hybrid comparison produced a result (only those are cached)."""
+    analysis = results["HybridAnalysis"]
+    return bool(results.get("ExecutiveSummary")) and not any(
+        "error" in analysis[stage] for stage in ("HolisticAnalysis", "SynthesizedInsights"))
+
+
 # Updated workflow function using hybrid approach
-def hybrid_difference_workflow(doc1_chunks: List[str], doc2_chunks: List[str], 
-                              doc1_category: str = None, doc2_category: str = None):
+def hybrid_difference_workflow(doc1_chunks: Union[List[str], DocumentArtifacts], doc2_chunks: Union[List[str], DocumentArtifacts],
+                              doc1_category: str = None, doc2_category: str = None,
+                              max_detailed: Optional[int] = DEFAULT_MAX_DETAILED, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                              use_cache: bool = True):
     """
     Hybrid difference workflow that combines holistic and granular analysis.
-    
+
+    With use_cache, per-document artifacts come from helpers.artifacts.document_cache and the
+    results of a pair already compared (same content hashes and options) from comparison_cache,
+    so comparing one baseline against many versions does the baseline work once.
+
     Returns:
         Tuple containing (executive_summary, comprehensive_results)
     """
     print("🔄 Starting Hybrid Document Difference Analysis...")
     
-    comparator = HybridDocumentDifferenceIdentifier(doc1_chunks, doc2_chunks, doc1_category, doc2_category)
-    results = comparator.run_hybrid_comparison()
+    comparator = HybridDocumentDifferenceIdentifier(doc1_chunks, doc2_chunks, doc1_category, doc2_category,
+                                                    cache=document_cache if use_cache else None)
+
+    def run():
+        return comparator.run_hybrid_comparison(max_detailed=max_detailed, max_concurrency=max_concurrency)
+
+    if use_cache:
+        key = (comparator.doc1.key, comparator.doc2.key, doc1_category, doc2_category, max_detailed)
+        results = comparison_cache.get_or_create(key, run, keep=comparison_succeeded)
+    else:
+        results = run()
     
     executive_summary = results.get("ExecutiveSummary", "Summary generation failed")
     return executive_summary, results
 
 
+class VersionChain:
+    """
+    Revisions of one document (v1, v2, ...) ingested in order. Each revision is aligned and
+    compared only with the previous one (its cached artifacts are reused), and every change is
+    recorded in a cumulative clause-history index (helpers.clause_history.ClauseHistory), so
+    questions across the chain -- when did clause 7.2 change, and how -- need no LLM calls.
+    """
+
+    def __init__(self, category: str = None, max_detailed: Optional[int] = DEFAULT_MAX_DETAILED,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY, use_cache: bool = True):
+        self.category = category
+        self.max_detailed = max_detailed
+        self.max_concurrency = max_concurrency
+        self.use_cache = use_cache
+        self.revisions: List[DocumentArtifacts] = []
+        self.steps: List[Dict[str, Any]] = []  # chunk-level analysis of each revision against the previous one
+        self.history = ClauseHistory()
+
+    def add_revision(self, chunks: Union[List[str], DocumentArtifacts], label: str = None) -> List[Dict[str, Any]]:
+        """Ingest the next revision; returns the clause-level changes it made."""
+        cache = document_cache if self.use_cache else None
+        revision = chunks if isinstance(chunks, DocumentArtifacts) else document_artifacts(chunks, cache)
+        if not self.revisions:
+            self.revisions.append(revision)
+            return self.history.add_version(revision.chunks, label=label)
+
+        previous = self.revisions[-1]
+        print(f"🔗 Comparing revision {len(self.revisions) + 1} with revision {len(self.revisions)}...")
+        comparator = HybridDocumentDifferenceIdentifier(previous, revision, self.category, self.category)
+
+        def analyse():
+            return comparator.chunk_level_analysis(max_detailed=self.max_detailed, max_concurrency=self.max_concurrency)
+
+        if self.use_cache:
+            key = ("chunk_level", previous.key, revision.key, self.max_detailed)
+            step = comparison_cache.get_or_create(key, analyse, keep=lambda r: not any("error" in c for c in r["detailed_comparisons"]))
+        else:
+            step = analyse()
+        analyses = {(c["chunk1_idx"], c["chunk2_idx"]): c for c in step["detailed_comparisons"]}
+        self.revisions.append(revision)
+        self.steps.append(step)
+        return self.history.add_version(revision.chunks, step["sections"], step["redline"], label, analyses)
+
+    def clause_history(self, clause: str) -> List[Dict[str, Any]]:
+        return self.history.history(clause)
+
+    def changes_in(self, version) -> List[Dict[str, Any]]:
+        return self.history.changes_in(version)
+
+    def changed_clauses(self, start=1, end=-1) -> Dict[str, int]:
+        return self.history.changed_clauses(start, end)
+
+    def clause_text(self, clause: str, version=-1) -> Optional[str]:
+        return self.history.clause_text(clause, version)
+
+
+def version_chain_workflow(revisions: List[Union[List[str], DocumentArtifacts]], category: str = None,
+                           labels: Optional[List[str]] = None, max_detailed: Optional[int] = DEFAULT_MAX_DETAILED,
+                           max_concurrency: int = DEFAULT_MAX_CONCURRENCY, use_cache: bool = True):
+    """
+    Compare a chain of revisions incrementally, each against the one before it.
+
+    Returns:
+        Tuple containing (version_chain, clause_history_report)
+    """
+    print(f"🔄 Starting Version-Chain Analysis of {len(revisions)} revisions...")
+    chain = VersionChain(category, max_detailed=max_detailed, max_concurrency=max_concurrency, use_cache=use_cache)
+    for k, revision in enumerate(revisions):
+        chain.add_revision(revision, labels[k] if labels else None)
+    return chain, chain.history.report()
+
+
 # Comparison of approaches
 def compare_approaches():
     """
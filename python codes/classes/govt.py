@@ -1,6 +1,8 @@
 from utils import *
-import json
-import re
+from helpers.context import DEFAULT_CONTEXT_TOKENS, build_context
+from helpers.json_utils import as_json
+from helpers.prompt_data import to_prompt
+from helpers.schemas import ClauseExplanation, DocumentTypePrediction, GovernmentAttributes
 
 class govt:
 
@@ -64,7 +66,7 @@ class govt:
         Document:
         \"\"\"{doc_text}\"\"\"
         """
-        return call_gemini1(prompt)
+        return call_gemini1(prompt, response_schema=DocumentTypePrediction)
 
 
     def extract_government_attributes(self, clause_text, predicted_doc_type=None):
@@ -104,7 +106,7 @@ class govt:
         Clause:
         \"\"\"{clause_text}\"\"\"
         """
-        return call_gemini1(prompt)
+        return call_gemini1(prompt, response_schema=GovernmentAttributes)
 
 
     def merge_government_clauses_with_llm(self, government_clauses, predicted_doc_type=None):
@@ -141,17 +143,35 @@ class govt:
         PredictedDocumentType: {predicted_doc_type or "Not provided"}
 
         Clauses:
-        {json.dumps(normalized_clauses, indent=2)}
+        {to_prompt(normalized_clauses, "merge_government_clauses_with_llm")}
 
         Return ONLY the final merged JSON.
         """
-        merged = call_gemini1(prompt)
-        try:
-            return json.loads(merged)
-        except Exception:
-            return merged 
+        return call_gemini1(prompt)
     
 
+    def resolve_merge_conflicts(self,conflicts, doc_text=None):
+        """
+        Ask the LLM to pick a value only for the keys the local merge could not reconcile.
+        Much smaller than re-sending every clause-level JSON.
+        """
+        prompt = f"""
+        You are a government/administrative document normalizer.
+
+        While merging the details extracted from ONE document, these fields received
+        different values from different parts of the document:
+        {to_prompt(conflicts, "resolve_merge_conflicts")}
+
+        For each field choose the correct, most complete value (you may combine them if they
+        describe the same thing). {"Use the document text below to decide." if doc_text else ""}
+
+        Return ONLY a JSON object mapping each "key" to the chosen value.
+        {"Document Text:" if doc_text else ""}
+        {doc_text or ""}
+        """
+        return call_gemini1(prompt)
+
+
     def explain_government_clause(self, clause_text):
         """
         Explain a government/administrative clause in simple English + why it matters.
@@ -172,44 +192,15 @@ class govt:
 
         Return ONLY the JSON.
         """
-        result = call_gemini1(prompt)
-        try:
-            return json.loads(result)
-        except Exception:
-            return {"Explanation": result, "Significance": "Could not parse as JSON"}
-
-
-    def safe_json_loads(self, raw):
-        """
-        Try to safely load JSON even if it's wrapped in markdown or contains junk.
-        """
-        if not isinstance(raw, str):
-            return raw  # already dict or list
-
-        # Remove markdown fences like ```json ... ```
-        cleaned = re.sub(r"^```[a-zA-Z]*\n?", "", raw.strip())
-        cleaned = re.sub(r"```$", "", cleaned.strip())
-
-        try:
-            return json.loads(cleaned)
-        except Exception:
-            # Last resort: try to extract the first JSON object/array substring
-            match = re.search(r"(\{.*\}|\[.*\])", cleaned, re.DOTALL)
-            if match:
-                try:
-                    return json.loads(match.group(1))
-                except Exception:
-                    return {"raw_text": cleaned}
-            return {"raw_text": cleaned}
-        
+        return call_gemini1(prompt, response_schema=ClauseExplanation)
 
 
-    def summarize_government_from_json(self, extracted_json, client):
+    def summarize_government_from_json(self, extracted_json, context_tokens=DEFAULT_CONTEXT_TOKENS):
         """
         Ask LLM to generate a short professional summary of a government/administrative document
         using the merged JSON as context.
         """
-        extracted_json = self.safe_json_loads(extracted_json)
+        context = build_context(as_json(extracted_json), context_tokens, label="summarize_government_from_json")
 
         prompt = f"""
         You are a government administrative summarizer.
@@ -229,7 +220,7 @@ class govt:
         - Avoid bureaucratic jargon where possible.
 
         JSON:
-        {json.dumps(extracted_json, indent=2)}
+        {context}
         """
         return call_gemini1(prompt)
         
@@ -1,6 +1,11 @@
 import pandas as pd
 from collections import defaultdict
 from utils import *
+from helpers.context import DEFAULT_CONTEXT_TOKENS, build_context
+from helpers.prompt_data import to_prompt
+from helpers.schemas import CaseDetails, CriminalAttributes, CriminalExplanation, FusedCriminalClause, parse_as
+from helpers.citations import canonical_citations, coverage_doubtful
+from helpers.statute_kb import get_statute_kb
 
 class litigation:
 
@@ -22,6 +27,11 @@ class litigation:
         Document Text:{chunk_text}
         """
         return call_gemini1(prompt)
+
+
+    def extract_citations_local(self,chunk_text):
+        """Regex extraction of statute citations; returns (canonical citations, whether coverage is doubtful)"""
+        return canonical_citations(chunk_text), coverage_doubtful(chunk_text)
     
 
 
@@ -69,7 +79,7 @@ class litigation:
         \"\"\"{clause_text}\"\"\"
         """
 
-        return call_gemini1(prompt)
+        return call_gemini1(prompt, response_schema=CriminalAttributes)
     
 
     def explain_criminal_clause(self,clause_text):
@@ -83,15 +93,100 @@ class litigation:
     2. Specific punishment details (imprisonment, fine, both, or none).  
 
     Clause:
-    \"\"\"{clause_text}\"\"\"
+    \"\"\"{to_prompt(clause_text, "explain_criminal_clause")}\"\"\"
 
     Return the output in JSON with keys:
     - Explanation
     - PunishmentDetails
     """
 
-        return call_gemini1(prompt)
+        return call_gemini1(prompt, response_schema=CriminalExplanation)
+
+
+    def explain_criminal_clause_kb(self,clause_entry):
+        """Explain a clause from the local statute knowledge base; unknown sections go to the LLM and are stored"""
+
+        clause_text = clause_entry["clause"] if isinstance(clause_entry, dict) else str(clause_entry)
+        citations = canonical_citations(clause_text)
+        if len(citations) != 1:
+            return self.explain_criminal_clause(clause_entry)
+
+        explanation = self.kb_explanation(clause_text)
+        if explanation is None:
+            return StructuredStream(self._explain_and_learn(clause_entry, citations[0]), CriminalExplanation)
+        return StructuredStream(iter([explanation.model_dump_json(indent=2, exclude_none=True)]), CriminalExplanation)
+
+
+    def kb_explanation(self,clause_text):
+        """CriminalExplanation from the statute knowledge base for a clause citing exactly one known section, else None"""
+
+        citations = canonical_citations(clause_text)
+        entry = get_statute_kb().lookup(citations[0]) if len(citations) == 1 else None
+        if entry is None:
+            return None
+        return CriminalExplanation(
+            Explanation=entry["explanation"], PunishmentDetails=entry["punishment"],
+            Cognizable=entry["cognizable"], Bailable=entry["bailable"]
+        )
+
+
+    def learn_explanation(self,clause_text,explanation):
+        """Store an LLM explanation of a single-section clause in the knowledge base (no-op otherwise)"""
+
+        citations = canonical_citations(clause_text)
+        if len(citations) == 1 and explanation is not None and explanation.Explanation:
+            get_statute_kb().put(citations[0], explanation.Explanation, explanation.PunishmentDetails,
+                                 explanation.Cognizable, explanation.Bailable)
+        return explanation
+
+
+    def _explain_and_learn(self,clause_entry,citation):
+        """Stream the LLM explanation and write it back into the knowledge base once complete"""
 
+        parts = []
+        for part in self.explain_criminal_clause(clause_entry):
+            parts.append(part)
+            yield part
+
+        learned = parse_as(CriminalExplanation, "".join(parts))
+        if learned is not None and learned.Explanation:
+            get_statute_kb().put(citation, learned.Explanation, learned.PunishmentDetails, learned.Cognizable, learned.Bailable)
+
+
+
+    # One schema-constrained call per clause batch: sub-category, attributes and explanation together
+    fused_schema = list[FusedCriminalClause]
+
+    # What the fused prompt asks for, per part (helpers.fused.FUSED_STAGES)
+    fused_instructions = {
+        "SubCategory": """- SubCategory: one of these sub-categories (or a new but precise one if none fits):
+            Offenses & Crimes, Procedures, Punishments & Sentences, Rights & Protections, Jurisdiction & Authority""",
+        "Attributes": """- Attributes: an object with keys OffenseType, ProcedureStep, Punishment, RightsProtections, Authority, OtherNotes
+          (null when not present)""",
+        "Explanation": """- Explanation: a clear explanation in simple English
+        - PunishmentDetails: specific punishment details (imprisonment, fine, both, or none)""",
+    }
+
+
+    def analyze_criminal_clauses_fused(self,clauses,parts=("SubCategory", "Attributes", "Explanation")):
+        """Classify, extract attributes and explain a batch of Criminal Law clauses in a single call; only `parts` are asked for"""
+
+        numbered = "\n".join(f"{i}. {c}" for i, c in enumerate(clauses, 1))
+        asked = "\n        ".join(self.fused_instructions[part] for part in parts)
+        prompt = f"""
+        You are a legal assistant specializing in Criminal Law.
+
+        For EACH numbered clause below, return one JSON object with:
+        - Index: the clause number
+        {asked}
+
+        Return a JSON array with one object per clause, in the same order.
+
+        Clauses:
+        {numbered}
+        """
+
+        return call_gemini1(prompt, response_schema=self.fused_schema)
 
 
     def extract_case_details(self,clause_text):
@@ -111,7 +206,7 @@ class litigation:
         Clause:
         \"\"\"{clause_text}\"\"\"
         """
-        return call_gemini1(prompt)
+        return call_gemini1(prompt, response_schema=CaseDetails)
 
 
 
@@ -127,7 +222,7 @@ class litigation:
         3. Return the result as a clean JSON list.
 
         Extracted details:
-        {raw_details}
+        {to_prompt(raw_details, "deduplicate_details")}
 
         Return format example:
         list
@@ -137,7 +232,9 @@ class litigation:
     
 
 
-    def summarize_with_advice(self, json):
+    def summarize_with_advice(self, json, context_tokens=DEFAULT_CONTEXT_TOKENS):
+        # Case details first, then the most salient clauses that fit the budget
+        context = build_context(json, context_tokens, pinned=1, label="summarize_with_advice")
         prompt = f"""
         You are a legal assistant AI.
 
@@ -147,7 +244,7 @@ class litigation:
         3. Their explanations
         4. Important background knowledge 
 
-        {json}
+        {context}
 
         Task:
         - Write in very **simple, everyday language**.
@@ -1,6 +1,10 @@
 import pandas as pd
 import json
 from utils import *
+from helpers.context import DEFAULT_CONTEXT_TOKENS, build_context
+from helpers.prompt_data import to_prompt
+from helpers.schemas import ClauseExplanation, DocumentTypePrediction, PersonalAttributes
+from helpers.identifiers import extract_identity_fields
 
 class pers:
 
@@ -67,7 +71,7 @@ class pers:
         - "Confidence" (High, Medium, Low)
         """
 
-        return call_gemini1(prompt)
+        return call_gemini1(prompt, response_schema=DocumentTypePrediction)
 
 
 
@@ -114,8 +118,8 @@ class pers:
     - IssueDate
     - ExpiryDate
     - Address
-    - Mother's Name
-    - Father's Name
+    - MothersName
+    - FathersName
     
 
     2. Based on the predicted DocumentType, add only the relevant extra fields:
@@ -137,7 +141,37 @@ class pers:
     """
 
 
-        return call_gemini1(prompt)
+        return call_gemini1(prompt, response_schema=PersonalAttributes)
+
+
+    def extract_identity_attributes_local(self,doc_text):
+        """
+        Fill the attribute schema with regexes and checksum validation (Verhoeff for Aadhaar,
+        format rules for PAN, passport and driving licence). Returns (fields, document_type).
+        """
+        return extract_identity_fields(doc_text)
+
+
+    def fill_missing_personal_fields(self,doc_text, missing_fields, predicted_doc_type=None):
+        """Ask the LLM only for the fields the local extractor could not resolve"""
+
+        prompt = f"""
+    You are a legal assistant extracting structured data from a Personal Legal Document
+    { "of type " + predicted_doc_type if predicted_doc_type else "" }.
+
+    Extract ONLY these fields from the document and return them as one JSON object:
+    {to_prompt(missing_fields)}
+
+    Rules:
+    - Use exactly the keys listed above.
+    - If information is missing, set it to "Not available". Do not invent values.
+    - Return only the JSON object.
+
+    Document Text:
+    \"\"\"{doc_text}\"\"\"
+    """
+
+        return call_gemini1(prompt, response_schema=PersonalAttributes)
 
 
     def explain_personal_clause(self,clause_text):
@@ -151,14 +185,14 @@ class pers:
         2. The legal or practical significance of this information (e.g., proof of identity, proof of age, proof of residence, proof of education).  
 
         Clause:
-        \"\"\"{clause_text}\"\"\"  
+        \"\"\"{to_prompt(clause_text, "explain_personal_clause")}\"\"\"  
 
         Return the output in JSON with keys:
         - Explanation
         - Significance
         """
 
-        return call_gemini1(prompt)
+        return call_gemini1(prompt, response_schema=ClauseExplanation)
 
 
     def merge_personal_attributes_lm(self,clause_attributes_list):
@@ -181,7 +215,7 @@ class pers:
 
 
     Clause-level JSONs:
-    {json.dumps(clause_attributes_list, indent=2)}
+    {to_prompt(clause_attributes_list, "merge_personal_attributes_lm")}
 
     Return only the final merged JSON with these keys:
     - Name
@@ -199,7 +233,29 @@ class pers:
 
         return call_gemini1(prompt)
     
-    def generate_summary_from_json(self,extracted_json):
+    def resolve_merge_conflicts(self,conflicts, doc_text=None):
+        """
+        Ask the LLM to pick a value only for the keys the local merge could not reconcile.
+        Much smaller than re-sending every clause-level JSON.
+        """
+        prompt = f"""
+        You are a legal assistant working on a Personal Legal Document.
+
+        While merging the details extracted from ONE document, these fields received
+        different values from different parts of the document:
+        {to_prompt(conflicts, "resolve_merge_conflicts")}
+
+        For each field choose the correct, most complete value (you may combine them if they
+        describe the same thing). {"Use the document text below to decide." if doc_text else ""}
+
+        Return ONLY a JSON object mapping each "key" to the chosen value.
+        {"Document Text:" if doc_text else ""}
+        {doc_text or ""}
+        """
+        return call_gemini1(prompt)
+
+
+    def generate_summary_from_json(self, extracted_json, context_tokens=DEFAULT_CONTEXT_TOKENS):
         """
         Ask the LLM to generate a natural summary of the document 
         using the extracted JSON as context.
@@ -216,7 +272,7 @@ class pers:
 
     Here is the extracted JSON:
     ```json
-    {json.dumps(extracted_json, indent=2)}
+    {build_context(extracted_json, context_tokens, label="generate_summary_from_json")}
     """
         return call_gemini1(prompt)
 
@@ -1,5 +1,10 @@
 
 from utils import *
+from helpers.executor import DEFAULT_MAX_CONCURRENCY
+from helpers.context import DEFAULT_CONTEXT_TOKENS, build_context
+from helpers.prompt_data import to_prompt
+from helpers.windows import DEFAULT_OVERLAP_TOKENS, DEFAULT_WINDOW_TOKENS, extract_clauses_windowed, fits_one_window
+from helpers.schemas import PropertyAttributes
 
 class property:
 
@@ -7,9 +12,21 @@ class property:
         self.chunks = chunks
 
 
-    def extract_clauses_batched(self):
-        joined_text = "\n\n---\n\n".join(self.chunks)
-
+    def extract_clauses_batched(self, windowed=None, window_tokens=DEFAULT_WINDOW_TOKENS,
+                                overlap_tokens=DEFAULT_OVERLAP_TOKENS, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        """
+        One clause per line, streamed. Documents larger than one window (or windowed=True) are
+        split into overlapping token-bounded windows extracted concurrently, so long documents
+        are no longer truncated; clauses at the window seams are reconciled.
+        """
+        if windowed is None:
+            windowed = not fits_one_window(self.chunks, window_tokens)
+        if windowed:
+            return extract_clauses_windowed(self.chunks, self._extract_clauses_window, window_tokens,
+                                            overlap_tokens, max_concurrency)
+        return self._extract_clauses_window("\n\n---\n\n".join(self.chunks))
+
+    def _extract_clauses_window(self, joined_text):
         prompt = f"""
     You are an expert in Indian property law and contract analysis. 
     You will receive parts of a property-related document (Sale Deed, Mortgage, Lease, Sale Agreement, etc.).
@@ -50,11 +67,11 @@ class property:
         \"\"\"{clause_text}\"\"\"
         """
 
-        return call_gemini1(prompt)
+        return call_gemini1(prompt, response_schema=PropertyAttributes)
     
 
 
-    def explain_property_document(self, property_attributes):
+    def explain_property_document(self, property_attributes, context_tokens=DEFAULT_CONTEXT_TOKENS):
         """
         Generate a layman explanation for the entire Property Document
         using extracted attributes from each clause.
@@ -75,16 +92,10 @@ class property:
     5. Explain any responsibilities, conditions, or penalties (from OtherNotes).  
     6. End with an overall explanation of what the contract means.  
 
-    Return the output in JSON with keys:
-    - PartiesExplanation
-    - PropertyExplanation
-    - FinancialExplanation
-    - DeadlinesExplanation
-    - ResponsibilitiesAndPenalties
-    - OverallExplanation
+    Return plain text (not JSON), one short paragraph per section in the order above.
 
     Here is the structured attribute data to use:
-    {property_attributes}
+    {build_context(property_attributes, context_tokens, label="explain_property_document")}
     """
 
         return call_gemini1(prompt)
@@ -94,19 +105,16 @@ class property:
         prompt = f"""
     You are a legal assistant specializing in Indian property law.
 
-    You will receive structured information about a property-related document in JSON format.  
+    You will receive a plain-English explanation of a property-related document.  
     Your tasks are:
     1. Generate a clear, easy-to-understand summary of the entire document for a layman.  
     2. Give your personal comments on whether the document terms seem fair to both parties or biased toward one party.  
     3. State whether the document appears legally valid under general Indian property and contract law principles.
 
-    JSON Input:
-    {json_data}
+    Input:
+    {to_prompt(json_data, "generate_summary_and_comments")}
 
-    Return your output in JSON format with these keys:
-    - Summary
-    - FairnessComment
-    - ValidityComment
+    Return plain text (not JSON) with three short sections headed Summary, Fairness and Validity.
     """
         return call_gemini1(prompt)
 
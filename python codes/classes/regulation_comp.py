@@ -1,5 +1,9 @@
 
 from utils import *
+from helpers.executor import DEFAULT_MAX_CONCURRENCY
+from helpers.context import DEFAULT_CONTEXT_TOKENS, build_context
+from helpers.windows import DEFAULT_OVERLAP_TOKENS, DEFAULT_WINDOW_TOKENS, extract_clauses_windowed, fits_one_window
+from helpers.schemas import RegulatoryAttributes
 
 class regulatory:
 
@@ -7,9 +11,21 @@ class regulatory:
         self.chunks = chunks
 
 
-    def extract_clauses_batched(self):
-        joined_text = "\n\n---\n\n".join(self.chunks)
-
+    def extract_clauses_batched(self, windowed=None, window_tokens=DEFAULT_WINDOW_TOKENS,
+                                overlap_tokens=DEFAULT_OVERLAP_TOKENS, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        """
+        One clause per line, streamed. Documents larger than one window (or windowed=True) are
+        split into overlapping token-bounded windows extracted concurrently, so long documents
+        are no longer truncated; clauses at the window seams are reconciled.
+        """
+        if windowed is None:
+            windowed = not fits_one_window(self.chunks, window_tokens)
+        if windowed:
+            return extract_clauses_windowed(self.chunks, self._extract_clauses_window, window_tokens,
+                                            overlap_tokens, max_concurrency)
+        return self._extract_clauses_window("\n\n---\n\n".join(self.chunks))
+
+    def _extract_clauses_window(self, joined_text):
         prompt = f"""
     You are an expert in Indian regulation and compilance law and analysis. 
     You will receive parts of a regulation and compilance related document (regulatory obligations, permissions, licenses, permits, environmental clearances, GDPR/data protection notices, tax compliance, labor law filings, or health & safety compliance, classify here **exclude corporate governance documents**).
@@ -43,12 +59,12 @@ class regulatory:
         - DocumentNumber
         - Purpose
         - ActionsRequired
-        - Operational Requirements / Facility Management
-        - Reporting / Audits / Documentation
-        - Deadlines / Validity
-        - Deviation / Non-Compliance / Penalties
-        - Health & Safety / Risk Management
-        - Environmental Compliance
+        - OperationalRequirements (operational requirements / facility management)
+        - ReportingAudits (reporting / audits / documentation)
+        - DeadlinesValidity (deadlines / validity)
+        - NonCompliancePenalties (deviation / non-compliance / penalties)
+        - HealthSafety (health & safety / risk management)
+        - EnvironmentalCompliance
         - OtherNotes
 
         **Requirements:**
@@ -60,11 +76,11 @@ class regulatory:
         \"\"\"{clause_text}\"\"\"
             """
 
-        return call_gemini1(prompt)
+        return call_gemini1(prompt, response_schema=RegulatoryAttributes)
     
 
 
-    def explain_regulatory_document(self,regulatory_attributes):
+    def explain_regulatory_document(self, regulatory_attributes, context_tokens=DEFAULT_CONTEXT_TOKENS):
         """
         Generate a detailed clause-by-clause explanation for a regulatory/compliance document
         using extracted structured attributes, preserving all metadata such as IssueDate, DocumentNumber, Location, and IssuingAuthority.
@@ -90,17 +106,16 @@ class regulatory:
         - Organize explanations **clause by clause**, each as a coherent paragraph.
         - Ensure that IssueDate, DocumentNumber, Location, and IssuingAuthority are explicitly mentioned in the text if available.
 
-        Return the output in JSON format with keys:
-        - ClauseExplanations: a list of explanations, one per clause, each including metadata and details.
+        Return plain text (not JSON): one paragraph per clause, each including metadata and details.
 
             Here is the structured attribute data to use:
-            {regulatory_attributes}
+            {build_context(regulatory_attributes, context_tokens, label="explain_regulatory_document")}
             """
 
         return call_gemini1(prompt)
         
 
-    def explain_regulatory_document_plain_language(self,regulatory_attributes):
+    def explain_regulatory_document_plain_language(self, regulatory_attributes, context_tokens=DEFAULT_CONTEXT_TOKENS):
         """
         Generate a layman-friendly explanation of a regulatory/compliance document
         using extracted structured attributes. All technical/legal terms are simplified.
@@ -122,11 +137,10 @@ class regulatory:
     - Combine information from all attributes into a single, coherent paragraph or two.
     - Cover the parties involved, purpose, actions required, deadlines, type of conditions, any important notes, and the document metadata.
 
-    Return the output in JSON format with keys:
-    - DocumentExplanation: a simple, clear description of what the document says in plain language, including issuing authority, date, location, and document number if available.
+    Return only the explanation as plain text (not JSON): a simple, clear description of what the document says in plain language, including issuing authority, date, location, and document number if available.
 
     Here is the structured attribute data:
-    {regulatory_attributes}
+    {build_context(regulatory_attributes, context_tokens, label="explain_regulatory_document_plain_language")}
     """
 
         return call_gemini1(prompt)
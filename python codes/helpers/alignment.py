@@ -0,0 +1,228 @@
+import re
+import zlib
+
+import numpy as np
+
+DEFAULT_DIMS = 1 << 13
+DEFAULT_MIN_SIMILARITY = 0.2
+DENSE_LIMIT = 250_000  # chunk pairs; above this align_chunks switches to LSH candidates
+IDENTICAL = 0.999  # aligned pairs at or above this similarity have no differences worth an LLM call
+
+_WORD = re.compile(r"\w+")
+_BIGRAM_MULTIPLIER = 1000003
+
+
+def _features(text, buckets, dims):
+    """Hashed unigram + bigram ids of one chunk; `buckets` caches crc32 per word across chunks."""
+    words = _WORD.findall(text.lower())
+    hashes = np.fromiter((buckets[w] if w in buckets else buckets.setdefault(w, zlib.crc32(w.encode("utf-8")))
+                          for w in words), dtype=np.uint64, count=len(words))
+    bigrams = hashes[:-1] * np.uint64(_BIGRAM_MULTIPLIER) + hashes[1:]
+    return (np.concatenate([hashes, bigrams]) % np.uint64(dims)).astype(np.intp)
+
+
+def chunk_terms(chunks, dims=DEFAULT_DIMS, buckets=None):
+    """
+    Hashed n-gram (ids, counts) of each chunk: the per-document half of chunk_vectors(), which
+    can be cached and reused for every comparison of the same document.
+    """
+    buckets = {} if buckets is None else buckets
+    return [np.unique(_features(chunk, buckets, dims), return_counts=True) for chunk in chunks]
+
+
+def tfidf_vectors(*terms, dims=DEFAULT_DIMS):
+    """
+    L2-normalised TF-IDF rows (float32) from each document's chunk_terms(). IDF is computed
+    over the chunks of all documents together, so shared boilerplate weighs little.
+    """
+    counts = [np.zeros((len(document), dims), dtype=np.float32) for document in terms]
+    for matrix, document in zip(counts, terms):
+        for i, (ids, n) in enumerate(document):
+            matrix[i, ids] = n
+    df = sum((matrix > 0).sum(axis=0) for matrix in counts)
+    total = sum(len(document) for document in terms)
+    idf = (np.log((1 + total) / (1 + df)) + 1).astype(np.float32)
+    vectors = []
+    for matrix in counts:
+        np.log1p(matrix, out=matrix)  # sublinear tf
+        matrix *= idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        vectors.append(matrix / np.where(norms == 0, 1, norms))
+    return vectors
+
+
+def chunk_vectors(*documents, dims=DEFAULT_DIMS):
+    """TF-IDF rows (dims hashed n-gram features) for each document's chunks; see tfidf_vectors()."""
+    buckets = {}
+    return tfidf_vectors(*(chunk_terms(chunks, dims, buckets) for chunks in documents), dims=dims)
+
+
+def similarity_matrix(chunks1, chunks2, dims=DEFAULT_DIMS):
+    """Cosine similarity of every chunk of document 1 (rows) with every chunk of document 2."""
+    a, b = chunk_vectors(chunks1, chunks2, dims=dims)
+    return a @ b.T
+
+
+def monotone_alignment(similarity, min_similarity=DEFAULT_MIN_SIMILARITY):
+    """
+    Order-preserving assignment: the set of pairs (i, j), increasing in both i and j, with the
+    largest total similarity, using only pairs at or above `min_similarity` (like a diff over
+    chunks). One vectorised DP row per chunk of document 1; returns [(i, j, similarity)].
+    """
+    n, m = similarity.shape
+    if not n or not m:
+        return []
+    gain = np.where(similarity >= min_similarity, similarity, -np.inf).astype(np.float64)
+    dp = np.zeros((n + 1, m + 1))
+    took = np.zeros((n, m), dtype=bool)
+    for i in range(n):
+        prev = dp[i]
+        diagonal = prev[:-1] + gain[i]
+        best = np.maximum(prev[1:], diagonal)
+        took[i] = diagonal > prev[1:]
+        dp[i + 1, 1:] = np.maximum.accumulate(best)
+    pairs = []
+    i, j = n, m
+    while i and j:
+        if dp[i, j] == dp[i, j - 1]:
+            j -= 1
+        elif took[i - 1, j - 1] and dp[i, j] == dp[i - 1, j - 1] + gain[i - 1, j - 1]:
+            pairs.append((i - 1, j - 1, float(similarity[i - 1, j - 1])))
+            i, j = i - 1, j - 1
+        else:
+            i -= 1
+    return pairs[::-1]
+
+
+def candidate_pairs(vectors1, vectors2, bits=128, bands=8, seed=0):
+    """
+    Chunk pairs that are likely near-duplicates, without comparing every pair: random-hyperplane
+    (SimHash) signatures banded into an LSH table; pairs sharing any band are candidates.
+    Returns an (k, 2) array of (i, j), unique and sorted.
+    """
+    if not len(vectors1) or not len(vectors2):
+        return np.zeros((0, 2), dtype=np.int64)
+    planes = np.random.default_rng(seed).standard_normal((vectors1.shape[1], bits)).astype(np.float32)
+    rows = bits // bands
+    weights = 1 << np.arange(rows, dtype=np.int64)
+    signs1, signs2 = vectors1 @ planes > 0, vectors2 @ planes > 0
+    found = []
+    for band in range(bands):
+        keys1 = signs1[:, band * rows:(band + 1) * rows] @ weights
+        keys2 = signs2[:, band * rows:(band + 1) * rows] @ weights
+        table = {}
+        for j, key in enumerate(keys2.tolist()):
+            table.setdefault(key, []).append(j)
+        for i, key in enumerate(keys1.tolist()):
+            found.extend((i, j) for j in table.get(key, ()))
+    return np.unique(np.asarray(found, dtype=np.int64).reshape(-1, 2), axis=0)
+
+
+def gap_pairs(anchors, n, m, max_gap_pairs=400, window=2):
+    """
+    Blocking between aligned anchors: chunks of document 1 between two consecutive anchors can
+    only align with chunks of document 2 between the same anchors. Small gaps are compared in
+    full; large ones along their diagonal (+-`window` after scaling).
+    """
+    pairs = []
+    bounds = [(-1, -1)] + [(i, j) for i, j, _ in anchors] + [(n, m)]
+    for (i0, j0), (i1, j1) in zip(bounds, bounds[1:]):
+        rows, columns = np.arange(i0 + 1, i1), np.arange(j0 + 1, j1)
+        if not rows.size or not columns.size:
+            continue
+        if rows.size * columns.size <= max_gap_pairs:
+            pairs.append(np.stack(np.meshgrid(rows, columns, indexing="ij"), axis=-1).reshape(-1, 2))
+            continue
+        centre = columns[0] + ((rows - rows[0]) * (columns.size / rows.size)).astype(np.int64)
+        offsets = np.arange(-window, window + 1)
+        diagonal = np.stack([np.repeat(rows, offsets.size), (centre[:, None] + offsets).ravel()], axis=1)
+        pairs.append(diagonal[(diagonal[:, 1] >= columns[0]) & (diagonal[:, 1] <= columns[-1])])
+    return np.concatenate(pairs) if pairs else np.zeros((0, 2), dtype=np.int64)
+
+
+def sparse_monotone_alignment(vectors1, vectors2, pairs, min_similarity=DEFAULT_MIN_SIMILARITY):
+    """
+    monotone_alignment() restricted to candidate pairs: cosine only for those pairs, then the
+    heaviest chain increasing in both i and j (Fenwick tree of prefix maxima, O(k log m)).
+    """
+    if not len(pairs):
+        return []
+    scores = np.empty(len(pairs), dtype=np.float32)
+    starts = np.flatnonzero(np.r_[True, pairs[1:, 0] != pairs[:-1, 0]])
+    for start, end in zip(starts, np.r_[starts[1:], len(pairs)]):
+        i = pairs[start, 0]
+        scores[start:end] = vectors2[pairs[start:end, 1]] @ vectors1[i]
+    keep = scores >= min_similarity
+    pairs, scores = pairs[keep], scores[keep]
+
+    m = len(vectors2)
+    tree_value = [0.0] * (m + 1)
+    tree_index = [-1] * (m + 1)
+    best, back = [0.0] * len(pairs), [-1] * len(pairs)
+    rows = pairs[:, 0].tolist()
+    columns = pairs[:, 1].tolist()
+    k = 0
+    while k < len(pairs):
+        end = k
+        while end < len(pairs) and rows[end] == rows[k]:
+            end += 1
+        # Scores of one row use only earlier rows, so the row is updated into the tree afterwards
+        for p in range(k, end):
+            position, value, index = columns[p], 0.0, -1
+            while position > 0:  # best chain ending in a column < columns[p]
+                if tree_value[position] > value:
+                    value, index = tree_value[position], tree_index[position]
+                position -= position & -position
+            best[p], back[p] = value + float(scores[p]), index
+        for p in range(k, end):
+            position = columns[p] + 1
+            while position <= m:
+                if best[p] > tree_value[position]:
+                    tree_value[position], tree_index[position] = best[p], p
+                position += position & -position
+        k = end
+    if not best:
+        return []
+    chain, p = [], max(range(len(best)), key=best.__getitem__)
+    while p != -1:
+        chain.append((rows[p], columns[p], float(scores[p])))
+        p = back[p]
+    return chain[::-1]
+
+
+def align_chunks(chunks1, chunks2, min_similarity=DEFAULT_MIN_SIMILARITY, dims=DEFAULT_DIMS, mode=None, terms=None):
+    """
+    Local chunk alignment for document comparison, no LLM calls.
+
+    mode "dense" scores every chunk pair; "lsh" only candidate_pairs() and the gap_pairs()
+    between the pairs they align, sub-quadratic for long documents; None picks "lsh" above
+    DENSE_LIMIT pairs. Returns {"matches": [{"doc1_chunk", "doc2_chunk", "similarity_score",
+    "identical"}] in document order, "unmatched_doc1": deleted/moved-out chunk indices,
+    "unmatched_doc2": added ones, "stats": {"mode", "pairs_scored", "all_pairs"}}.
+    `terms` takes precomputed (chunk_terms(chunks1), chunk_terms(chunks2)) for the same dims.
+    """
+    mode = mode or ("lsh" if len(chunks1) * len(chunks2) > DENSE_LIMIT else "dense")
+    if terms is None:
+        vectors1, vectors2 = chunk_vectors(chunks1, chunks2, dims=dims)
+    else:
+        vectors1, vectors2 = tfidf_vectors(*terms, dims=dims)
+    if mode == "lsh":
+        # Near-duplicates found by LSH anchor the alignment; the gaps between anchors are blocked
+        pairs = candidate_pairs(vectors1, vectors2)
+        anchors = sparse_monotone_alignment(vectors1, vectors2, pairs, min_similarity)
+        pairs = np.unique(np.concatenate([pairs, gap_pairs(anchors, len(chunks1), len(chunks2))]), axis=0)
+        aligned = sparse_monotone_alignment(vectors1, vectors2, pairs, min_similarity)
+        scored = len(pairs)
+    else:
+        aligned = monotone_alignment(vectors1 @ vectors2.T, min_similarity)
+        scored = len(chunks1) * len(chunks2)
+    matched1, matched2 = {i for i, _, _ in aligned}, {j for _, j, _ in aligned}
+    return {
+        "matches": [
+            {"doc1_chunk": i, "doc2_chunk": j, "similarity_score": round(score, 4), "identical": score >= IDENTICAL}
+            for i, j, score in aligned
+        ],
+        "unmatched_doc1": [i for i in range(len(chunks1)) if i not in matched1],
+        "unmatched_doc2": [j for j in range(len(chunks2)) if j not in matched2],
+        "stats": {"mode": mode, "pairs_scored": scored, "all_pairs": len(chunks1) * len(chunks2)},
+    }
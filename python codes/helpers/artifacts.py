@@ -0,0 +1,166 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_MAX_DOCUMENTS = int(os.getenv("COMPARISON_CACHE_DOCUMENTS", "64"))
+DEFAULT_MAX_COMPARISONS = int(os.getenv("COMPARISON_CACHE_COMPARISONS", "256"))
+DEFAULT_CACHE_TTL = float(os.getenv("COMPARISON_CACHE_TTL", "0")) or None  # seconds; unset/0 = no expiry
+DEFAULT_CHUNK_SIZE = 1500
+DEFAULT_CHUNK_OVERLAP = 150
+
+
+def content_hash(chunks, **config):
+    """sha256 of the chunk texts (with their boundaries) and of the config that produced them."""
+    digest = hashlib.sha256()
+    for key in sorted(config):
+        digest.update(f"{key}={config[key]!r}\x1f".encode("utf-8"))
+    for chunk in chunks:
+        data = chunk.encode("utf-8")
+        digest.update(len(data).to_bytes(8, "little"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class ArtifactCache:
+    """
+    Thread-safe LRU cache with an optional time-to-live.
+
+    Entries beyond `max_entries` are evicted least recently used first, and entries older than
+    `ttl` seconds are dropped when next seen; configure() changes both at run time
+    (max_entries=0 disables caching). get_or_create() builds a missing entry only once even when
+    several threads ask for it together.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_DOCUMENTS, ttl=DEFAULT_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._building = {}
+        self.clear()
+
+    def configure(self, max_entries=None, ttl=None):
+        """Change the limits (None keeps the current one, ttl=0 disables expiry) and evict what no longer fits."""
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if ttl is not None:
+                self.ttl = ttl or None
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries = OrderedDict()  # key -> (created, value), least recently used first
+            self.hits = self.misses = self.evictions = 0
+
+    def _expired(self, created):
+        return self.ttl is not None and time.monotonic() - created > self.ttl
+
+    def _evict(self):
+        for key in [k for k, (created, _) in self._entries.items() if self._expired(created)]:
+            del self._entries[key]
+            self.evictions += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is not None and self._expired(entry[0]):
+            del self._entries[key]
+            self.evictions += 1
+            entry = None
+        if entry is None:
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry[1]
+
+    def get(self, key, default=None):
+        with self._lock:
+            found, value = self._lookup(key)
+        return value if found else default
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def get_or_create(self, key, factory, keep=None):
+        """Cached value for `key`, else factory() -- stored unless keep(value) is false (e.g. a failed call)."""
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                return value
+            building = self._building.setdefault(key, threading.Lock())
+        with building:
+            with self._lock:
+                found, value = self._lookup(key)
+                if found:
+                    return value
+                self.misses += 1
+            try:
+                value = factory()
+                if keep is None or keep(value):
+                    self.put(key, value)
+            finally:
+                with self._lock:
+                    self._building.pop(key, None)
+        return value
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+class DocumentArtifacts:
+    """
+    What a comparison derives from one document: its chunks, plus named artifacts (hashed term
+    counts, chunk metadata, the LLM summary) built on first use and then shared by every
+    comparison the document takes part in. `key` is the document's content hash.
+    """
+
+    def __init__(self, key, chunks):
+        self.key = key
+        self.chunks = list(chunks)
+        self._artifacts = ArtifactCache(max_entries=float("inf"), ttl=None)
+
+    def get(self, name, factory, keep=None):
+        return self._artifacts.get_or_create(name, factory, keep)
+
+
+def document_artifacts(chunks, cache=None):
+    """DocumentArtifacts of a chunked document, shared through `cache` when one is given."""
+    key = content_hash(chunks)
+    if cache is None:
+        return DocumentArtifacts(key, chunks)
+    return cache.get_or_create(key, lambda: DocumentArtifacts(key, chunks))
+
+
+def document_from_text(text, chunk_size=DEFAULT_CHUNK_SIZE, chunk_overlap=DEFAULT_CHUNK_OVERLAP, cache=None):
+    """
+    DocumentArtifacts of a raw document, keyed by its content hash and chunking config, so the
+    text is split only once per config.
+    """
+    key = content_hash([text], chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+    def build():
+        from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+        splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        return DocumentArtifacts(key, splitter.split_text(text))
+
+    return build() if cache is None else cache.get_or_create(key, build)
+
+
+document_cache = ArtifactCache(DEFAULT_MAX_DOCUMENTS)
+comparison_cache = ArtifactCache(DEFAULT_MAX_COMPARISONS)
@@ -0,0 +1,107 @@
+import re
+from typing import List, NamedTuple
+
+# Canonical act name -> spellings seen in FIRs, charge sheets and orders
+ACTS = {
+    "IPC": [r"I\.?\s?P\.?\s?C\.?", r"Indian\s+Penal\s+Code"],
+    "CrPC": [r"Cr\.?\s?P\.?\s?C\.?", r"Code\s+of\s+Criminal\s+Procedure", r"Criminal\s+Procedure\s+Code"],
+    "BNSS": [r"B\.?\s?N\.?\s?S\.?\s?S\.?", r"Bharatiya\s+Nagarik\s+Suraksha\s+Sanhita"],
+    "BNS": [r"B\.?\s?N\.?\s?S\.?", r"Bharatiya\s+Nyaya\s+Sanhita"],
+    "BSA": [r"B\.?\s?S\.?\s?A\.?", r"Bharatiya\s+Sakshya\s+Adhiniyam"],
+    "Evidence Act": [r"(?:Indian\s+)?Evidence\s+Act", r"I\.?\s?E\.?\s?A\.?"],
+    "NI Act": [r"N\.?\s?I\.?\s+Act", r"Negotiable\s+Instruments?\s+Act"],
+}
+# Abbreviations may follow a bare section number ("420/34 IPC"); full names need a section word
+_ABBREVIATIONS = {"IPC", "CrPC", "BNSS", "BNS", "BSA"}
+
+_SECTION_WORD = r"(?:u/ss?\.?|under\s+sections?|sections?|secs?\.?|ss?\.)"
+_NUMBER = r"\d{1,3}(?:-?[A-Z]{1,2})?\b(?:\s*\(\s*[0-9a-z]{1,4}\s*\))*"
+_JOINER = r"\s*(?:,|/|&|\band\b|\bor\b|\br/w\b|\br\.\s?w\.|\bread\s+with\b|\bwith\b)\s*"
+_NUMBER_LIST = rf"{_NUMBER}(?:{_JOINER}{_NUMBER})*"
+_CONNECTOR = r"\s*,?\s*(?:of\s+)?(?:the\s+)?"
+_YEAR = r"(?:\s*,?\s*(?:18|19|20)\d{2})?"
+
+
+def _act_group(canonical):
+    return "(?:" + "|".join(ACTS[canonical]) + ")"
+
+
+_ACT_ANY = "|".join(f"(?P<act_{i}>{_act_group(act)})" for i, act in enumerate(ACTS))
+_ACT_NAMES = list(ACTS)
+
+# "Section 420 IPC", "Sec. 420 of the Indian Penal Code, 1860", "u/s 420/468/34 IPC", "Section 3(5) BNS"
+_SECTION_FIRST = re.compile(
+    rf"\b(?P<sw>{_SECTION_WORD}\s*)?(?P<nums>{_NUMBER_LIST}){_CONNECTOR}(?:{_ACT_ANY}){_YEAR}(?![A-Za-z])",
+    re.IGNORECASE,
+)
+# "IPC Section 420", "Section 138 NI Act" is covered above; this handles the act-first order
+_ACT_FIRST = re.compile(
+    rf"(?<![A-Za-z])(?:{_ACT_ANY}){_YEAR}\s*,?\s*{_SECTION_WORD}\s*(?P<nums>{_NUMBER_LIST})",
+    re.IGNORECASE,
+)
+_SINGLE_NUMBER = re.compile(_NUMBER, re.IGNORECASE)
+_SECTION_MENTION = re.compile(rf"\b{_SECTION_WORD}\s*\d{{1,3}}", re.IGNORECASE)
+
+
+class Citation(NamedTuple):
+    canonical: str   # "Section 420 IPC"
+    act: str         # "IPC"
+    section: str     # "420", "498A", "3(5)"
+    start: int       # character span of the whole reference in the source text
+    end: int
+    text: str
+
+
+def _normalize_section(raw):
+    return re.sub(r"[\s-]", "", raw).upper()
+
+
+def _matched_act(match):
+    for i, name in enumerate(_ACT_NAMES):
+        if match.group(f"act_{i}"):
+            return name
+    return None
+
+
+def extract_citations(text) -> List[Citation]:
+    """
+    Find statute citations (IPC, CrPC, BNS, BNSS, BSA, Evidence Act, NI Act) with their offsets.
+    Lists such as "u/s 420/468 r/w 34 IPC" yield one citation per section, in document order.
+    """
+    found = []
+    for pattern in (_SECTION_FIRST, _ACT_FIRST):
+        for match in pattern.finditer(text):
+            act = _matched_act(match)
+            if act is None:
+                continue
+            if pattern is _SECTION_FIRST and not match.group("sw") and act not in _ABBREVIATIONS:
+                continue
+            for number in _SINGLE_NUMBER.findall(match.group("nums")):
+                section = _normalize_section(number)
+                found.append(Citation(f"Section {section} {act}", act, section, match.start(), match.end(), match.group()))
+
+    found.sort(key=lambda c: (c.start, c.end))
+    seen, citations = set(), []
+    for c in found:
+        if (c.canonical, c.start) not in seen:
+            seen.add((c.canonical, c.start))
+            citations.append(c)
+    return citations
+
+
+def canonical_citations(text):
+    """Unique canonical citations in order of first appearance."""
+    return list(dict.fromkeys(c.canonical for c in extract_citations(text)))
+
+
+def coverage_doubtful(text, citations=None):
+    """
+    True when the text mentions sections the extractor could not attribute to a known act
+    (e.g. "Section 3 of the Dowry Prohibition Act"), so an LLM pass is worth its cost.
+    """
+    citations = extract_citations(text) if citations is None else citations
+    spans = [(c.start, c.end) for c in citations]
+    for mention in _SECTION_MENTION.finditer(text):
+        if not any(start <= mention.start() < end for start, end in spans):
+            return True
+    return False
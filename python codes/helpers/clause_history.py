@@ -0,0 +1,195 @@
+import re
+from bisect import bisect_right
+from collections import defaultdict
+
+from helpers.redline import DELETED, INSERTED
+
+# A clause number opening a line or a sentence: "7.2 The Lessee", "7. Rent", "(3) Notice", "Clause 7.2", "3A. Escalation"
+_NUMBER = r"\d{1,3}[A-Z]?"
+_SUBNUMBER = r"(?:\.\d{1,3}[A-Z]?)"
+_HEADING = re.compile(
+    rf"(?:^|\n|[.;:]\s+)[ \t]*(?P<heading>(?i:clause|article)\s+({_NUMBER}{_SUBNUMBER}*)\b"
+    rf"|\(?({_NUMBER}{_SUBNUMBER}+)[.)]?(?=\s+[A-Z(])|\(?({_NUMBER})[.)](?=\s+[A-Z(]))"
+)
+_PART = re.compile(r"(\d+)([A-Z]?)")
+
+
+def clause_headings(text):
+    """[(position, clause number)] of the numbered clauses starting in `text`, in order."""
+    headings = []
+    for match in _HEADING.finditer(text):
+        number = next(g for g in match.groups()[1:] if g)
+        headings.append((match.start("heading"), number))
+    return headings
+
+
+def clause_sort_key(clause):
+    """"7.2" < "7.2A" < "7.10"; unnumbered text (None) first."""
+    if not clause:
+        return ()
+    return tuple((int(number), suffix) for number, suffix in (_PART.match(part).groups() for part in clause.split(".")))
+
+
+class _Version:
+    """One ingested revision: its chunks, the clause headings of each and the clause each chunk opens in."""
+
+    def __init__(self, label, chunks, lineage):
+        self.label = label
+        self.chunks = chunks
+        self.lineage = lineage  # clause lineage id of each chunk, stable across revisions
+        self.headings = [clause_headings(chunk) for chunk in chunks]
+        self.carried, current = [], None
+        for headings in self.headings:
+            self.carried.append(current)  # a clause split across chunks continues into the next one
+            if headings:
+                current = headings[-1][1]
+
+    def clause_at(self, chunk, position):
+        headings = self.headings[chunk]
+        k = bisect_right([p for p, _ in headings], position)
+        return headings[k - 1][1] if k else self.carried[chunk]
+
+    def clauses_in(self, chunk, start, end):
+        """The clause `start` falls in, then every clause heading before `end`."""
+        clauses = [self.clause_at(chunk, start)]
+        clauses += [number for position, number in self.headings[chunk] if start < position < end and number not in clauses]
+        return clauses
+
+
+class ClauseHistory:
+    """
+    Cumulative clause-level change index over a chain of revisions, built locally from the
+    aligned sections and redline of each consecutive pair (helpers.redline).
+
+    Every change of a revision is attributed to the numbered clause it falls in ("7.2"; the
+    number as it reads in that revision, with the previous number when it was renumbered) and
+    to a lineage id that follows the chunk through the chain. Queries are answered from the
+    index, no LLM calls; the LLM comparison of the section is attached when one was made.
+    """
+
+    def __init__(self):
+        self.versions = []
+        self.events = []
+        self._by_clause = defaultdict(list)
+        self._by_version = defaultdict(list)
+        self._next_lineage = 0
+
+    def _new_lineage(self):
+        self._next_lineage += 1
+        return self._next_lineage - 1
+
+    def add_version(self, chunks, sections=None, changes=None, label=None, analyses=None):
+        """
+        Ingest the next revision. From the second revision on, `sections` aligns the previous
+        revision (doc1) with this one (doc2) and `changes` is their flat redline
+        (helpers.redline.redline); `analyses` maps (doc1_chunk, doc2_chunk) to the detailed
+        comparison of that section. Returns the changes as indexed events.
+        """
+        label = label or f"v{len(self.versions) + 1}"
+        if not self.versions:
+            self.versions.append(_Version(label, list(chunks), [self._new_lineage() for _ in chunks]))
+            return []
+        previous = self.versions[-1]
+        lineage = [None] * len(chunks)
+        for section in sections:
+            i, j = section["doc1_chunk"], section["doc2_chunk"]
+            if j is not None:
+                lineage[j] = previous.lineage[i] if i is not None else self._new_lineage()
+        version = _Version(label, list(chunks), [l if l is not None else self._new_lineage() for l in lineage])
+        self.versions.append(version)
+
+        number, analyses = len(self.versions), analyses or {}
+        events = []
+        for change in changes:
+            i, j = change["doc1_chunk"], change["doc2_chunk"]
+            for clause, previous_clause, edits in self._attribute(previous, version, change):
+                event = {
+                    "version": number,
+                    "version_label": label,
+                    "clause": clause,
+                    "previous_clause": previous_clause,
+                    "lineage": version.lineage[j] if j is not None else previous.lineage[i],
+                    "type": change["type"],
+                    "old": change["old"],
+                    "new": change["new"],
+                    "redline": edits,
+                    "doc1_chunk": i,
+                    "doc2_chunk": j,
+                    "analysis": analyses.get((i, j)),
+                }
+                events.append(event)
+                for key in {clause, previous_clause} - {None}:
+                    self._by_clause[key].append(event)
+        self.events.extend(events)
+        self._by_version[number] = events
+        return events
+
+    @staticmethod
+    def _attribute(previous, version, change):
+        """
+        (clause, previous clause, word edits) for each clause a change touches. Modified
+        sentences go by their word edits, which may fall in different clauses; inserted and
+        deleted text covers the clause it starts in and every clause heading inside it.
+        """
+        i, j = change["doc1_chunk"], change["doc2_chunk"]
+        if change["type"] == INSERTED:
+            return [(clause, None, []) for clause in version.clauses_in(j, *change["doc2"])]
+        if change["type"] == DELETED:
+            return [(clause, clause, []) for clause in previous.clauses_in(i, *change["doc1"])]
+        groups = {}
+        for edit in change.get("redline") or [{"doc1": change["doc1"], "doc2": change["doc2"]}]:
+            key = (version.clause_at(j, edit["doc2"][0]), previous.clause_at(i, edit["doc1"][0]))
+            groups.setdefault(key, []).append(edit)
+        return [(clause, previous_clause, edits if "op" in edits[0] else [])
+                for (clause, previous_clause), edits in groups.items()]
+
+    def _number(self, version):
+        """1-based index of a revision given as its number or its label."""
+        if isinstance(version, int):
+            return version if version > 0 else len(self.versions) + 1 + version
+        return next(k for k, v in enumerate(self.versions, 1) if v.label == version)
+
+    def history(self, clause):
+        """Every change to a clause, in revision order: when it changed and how."""
+        return list(self._by_clause.get(clause, []))
+
+    def last_change(self, clause):
+        events = self._by_clause.get(clause)
+        return events[-1] if events else None
+
+    def changes_in(self, version):
+        """Changes a revision made to the one before it."""
+        return list(self._by_version.get(self._number(version), []))
+
+    def changed_clauses(self, start=1, end=-1):
+        """{clause: number of changes} for the revisions after `start` up to `end`, in clause order."""
+        first, last = self._number(start), self._number(end)
+        counts = defaultdict(int)
+        for number in range(first + 1, last + 1):
+            for event in self._by_version.get(number, []):
+                counts[event["clause"]] += 1
+        return dict(sorted(counts.items(), key=lambda item: clause_sort_key(item[0])))
+
+    def clause_text(self, clause, version=-1):
+        """Text of a clause as it reads in a revision, up to the next clause heading; None if absent."""
+        revision = self.versions[self._number(version) - 1]
+        for chunk, headings in zip(revision.chunks, revision.headings):
+            for k, (position, number) in enumerate(headings):
+                if number == clause:
+                    end = headings[k + 1][0] if k + 1 < len(headings) else len(chunk)
+                    return chunk[position:end].strip()
+        return None
+
+    def report(self):
+        """JSON-able view of the chain: the revisions and each clause's change history."""
+        return {
+            "versions": [
+                {"version": k, "label": v.label, "chunks": len(v.chunks), "changes": len(self._by_version.get(k, []))}
+                for k, v in enumerate(self.versions, 1)
+            ],
+            "clauses": {
+                clause: [{key: event[key] for key in ("version_label", "type", "old", "new", "previous_clause")}
+                         for event in events]
+                for clause, events in sorted(self._by_clause.items(), key=lambda item: clause_sort_key(item[0]))
+            },
+        }
@@ -0,0 +1,147 @@
+import re
+
+from helpers.prompt_data import abbreviate_keys, prompt_data_report, prune, serialize
+from helpers.windows import CHARS_PER_TOKEN
+
+DEFAULT_CONTEXT_TOKENS = 6000
+MAX_FIELD_CHARS = 800
+
+# Severity wording by weight: (word prefixes, whole words)
+_SEVERITY = (
+    (3, ("imprison", "arrest", "forfeit", "penalt", "punish", "non-bailable"), {"death", "fine", "fined", "fines"}),
+    (2, ("terminat", "breach", "default", "liabilit", "indemn", "revok", "revoc", "cancel", "prohibit", "offence"),
+     {"liable", "damages"}),
+    (1, ("obligat", "approv", "resolv", "complian"), {"shall", "must", "mandatory", "deadline", "due", "resolution", "comply"}),
+)
+_MONTHS = ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec")
+_CURRENCY = ("₹", "rs", "inr", "usd", "$", "€", "£")
+_AMOUNT_WORDS = {"lakh", "lakhs", "crore", "crores", "million", "billion", "rupees"}
+_PERIOD_WORDS = {"day", "days", "week", "weeks", "month", "months", "year", "years"}
+_CITATION_WORDS = {"section", "sections", "sec", "s", "u/s", "article", "articles", "art", "rule", "rules",
+                   "regulation", "regulations", "clause", "clauses"}
+_SEVERITY_WORDS = {word: weight for weight, _, exact in _SEVERITY for word in exact}
+_SEVERITY_STEMS = tuple(stem for _, stems, _ in _SEVERITY for stem in stems)
+_SPACES = str.maketrans({c: " " for c in '{}[]",:;()'})
+# Section (key) names that carry the substance of a document
+_KEY_WEIGHT = re.compile(r"financ|payment|amount|deadline|date|penalt|punish|risk|obligation|resolution|approval|terminat|action", re.I)
+_OMITTED = "(+{} duplicate or lower-priority items omitted to fit the context budget)"
+
+
+def salience(text, key=None):
+    """
+    Local importance of one item: severity wording, dates and amounts, statute references,
+    and whether it belongs to a substantive section (e.g. FinancialTerms, Deadlines).
+    One pass over the words; no regex per pattern, since this runs for every accumulated item.
+    """
+    words = text.lower().translate(_SPACES).split()
+    severity = {weight: 0 for weight, _, _ in _SEVERITY}
+    dates = amounts = citations = 0
+    previous = ""
+    for word in words:
+        word = word.rstrip(".")
+        weight = _SEVERITY_WORDS.get(word)
+        if weight is None and word.startswith(_SEVERITY_STEMS):
+            weight = next(w for w, stems, _ in _SEVERITY if word.startswith(stems))
+        if weight:
+            severity[weight] += 1
+        if word[:1].isdigit():
+            if word.count("/") == 2 or word.count("-") == 2 or word.count(".") == 2 or previous.startswith(_MONTHS):
+                dates += 1
+            elif previous in _CITATION_WORDS:
+                citations += 1
+            elif previous.startswith(_CURRENCY) or word.endswith("%"):
+                amounts += 1
+        elif word.startswith(_MONTHS) and previous[:1].isdigit():
+            dates += 1
+        elif word in _PERIOD_WORDS and previous[:1].isdigit():
+            dates += 1
+        elif word in _AMOUNT_WORDS and previous[:1].isdigit():
+            amounts += 1
+        elif word[:1] in "₹$€£" and word[1:2].isdigit():
+            amounts += 1
+        previous = word
+    score = sum(weight * min(3, count) for weight, count in severity.items())
+    score += 3 * min(2, dates) + 3 * min(2, amounts) + 2 * min(2, citations)
+    if key and _KEY_WEIGHT.search(key):
+        score += 3
+    return score
+
+
+def _fit(candidates, budget_chars):
+    """
+    candidates: (order, text, key). Everything is kept when it fits; otherwise the highest
+    salience() first while they fit. Returns the kept orders.
+    """
+    if sum(len(text) + 1 for _, text, _ in candidates) <= budget_chars:
+        return {order for order, _, _ in candidates}
+    ranked = sorted(candidates, key=lambda c: -salience(c[1], c[2]))
+    kept, used = set(), 0
+    for order, text, _ in ranked:
+        if used + len(text) + 1 <= budget_chars:
+            kept.add(order)
+            used += len(text) + 1
+    return kept
+
+
+def build_context(data, budget_tokens=DEFAULT_CONTEXT_TOKENS, pinned=0, max_field_chars=MAX_FIELD_CHARS, label=None):
+    """
+    Bounded prompt context for the final summary stages.
+
+    `data` is the accumulated result: a list of per-clause items, a merged document dict, or
+    either of those as a (list of) JSON string(s). Items are compacted, deduplicated, ranked by
+    salience() and kept, in their original order, until `budget_tokens` is reached, so prompt
+    size stays flat however many clauses the document has. The first `pinned` list items (e.g.
+    case details) and the scalar fields of a dict (document metadata) are always kept; list
+    fields of a dict are ranked entry by entry. Returns canonical minified JSON (repeated long
+    keys abbreviated behind a legend), followed by a note when items had to be left out. With a
+    label, the saving is recorded in prompt_data_report like helpers.prompt_data.to_prompt.
+    """
+    original = data
+    if isinstance(data, list) and len(data) == 1 and isinstance(data[0], str):
+        data = data[0]  # a merged JSON answer wrapped in a list
+    data = prune(data, max_field_chars)
+    budget = max(1, budget_tokens) * CHARS_PER_TOKEN
+
+    if isinstance(data, dict):
+        fixed = {k: v for k, v in data.items() if not isinstance(v, list)}
+        seen, candidates = set(), []
+        for key, values in data.items():
+            if not isinstance(values, list):
+                continue
+            for i, value in enumerate(values):
+                text = serialize(value)
+                if (key, text.lower()) not in seen:
+                    seen.add((key, text.lower()))
+                    candidates.append(((key, i), text, key))
+        kept = _fit(candidates, budget - len(serialize(fixed)))
+        result = dict(fixed)
+        for key, values in data.items():
+            if isinstance(values, list):
+                result[key] = [v for i, v in enumerate(values) if (key, i) in kept]
+        omitted = sum(len(v) for v in data.values() if isinstance(v, list)) - len(kept)
+    elif isinstance(data, list):
+        head = data[:pinned]
+        seen, candidates = {serialize(v).lower() for v in head}, []
+        for i, value in enumerate(data[pinned:]):
+            text = serialize(value)
+            if text.lower() not in seen:
+                seen.add(text.lower())
+                candidates.append((i, text, None))
+        kept = _fit(candidates, budget - len(serialize(head)))
+        result = head + [v for i, v in enumerate(data[pinned:]) if i in kept]
+        omitted = len(data) - len(result)
+    else:
+        text = data if isinstance(data, str) else serialize(data)
+        result, omitted = None, 0
+        text = text if len(text) <= budget else text[:budget] + "…"
+
+    if result is not None:
+        text = serialize(result)
+        renamed, legend = abbreviate_keys(result)
+        if legend and len(legend) + 1 + len(serialize(renamed)) < len(text):
+            text = legend + "\n" + serialize(renamed)
+    if omitted:
+        text += "\n" + _OMITTED.format(omitted)
+    if label:
+        prompt_data_report.record(label, original, text)
+    return text
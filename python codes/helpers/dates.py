@@ -0,0 +1,151 @@
+import re
+from bisect import bisect_right
+from datetime import date
+from typing import List, NamedTuple, Optional
+
+MONTHS = {
+    "jan": 1, "january": 1, "feb": 2, "february": 2, "mar": 3, "march": 3, "apr": 4, "april": 4,
+    "may": 5, "jun": 6, "june": 6, "jul": 7, "july": 7, "aug": 8, "august": 8, "sep": 9, "sept": 9,
+    "september": 9, "oct": 10, "october": 10, "nov": 11, "november": 11, "dec": 12, "december": 12,
+}
+# Words after which "." does not end a sentence ("Rs. 500", "Sept. 2025", "Sec. 420", "Mr. Rao")
+ABBREVIATIONS = {
+    "mr", "mrs", "ms", "dr", "smt", "shri", "sh", "km", "no", "nos", "sec", "secs", "ss", "art", "cl", "para",
+    "rs", "inr", "ltd", "pvt", "co", "corp", "st", "sr", "jr", "vs", "v", "viz", "ie", "eg", "etc", "hon'ble",
+    "govt", "dept", "vol", "ch", "u/s", "i.e", "e.g", "approx", "dt", "dtd",
+    "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "sept", "oct", "nov", "dec",
+}
+
+# Month names are capitalised in legal text; this keeps "the Lessee may 15 ..." out
+_MONTH = r"(?-i:(?=[A-Z]))(?P<{}>" + "|".join(sorted(MONTHS, key=len, reverse=True)) + r")(?:\.(?=\s*\d))?"
+_DAY = r"(?P<{}>[0-3]?\d)(?:st|nd|rd|th)?"
+_YEAR = r"(?P<{}>(?:19|20)\d{{2}}|'\d{{2}})"
+
+# One alternation, one left-to-right pass over the text
+_DATE = re.compile(
+    r"(?<![\w/.-])(?:"
+    # 2025-09-14, 2025/09/14
+    r"(?P<iso_y>(?:19|20)\d{2})[-/.](?P<iso_m>[01]?\d)[-/.](?P<iso_d>[0-3]?\d)(?![\d/.-]\d)"
+    # 14/09/2025, 14-09-2025, 14.09.2025, 14/09/25
+    r"|(?P<num_a>[0-3]?\d)(?P<sep>[/.-])(?P<num_b>[0-3]?\d)(?P=sep)(?P<num_y>(?:19|20)\d{2}|\d{2})(?![\d/.-]\d)"
+    # 14th September 2025, 14 Sept, 2025, 14-Sep-2025, 14th day of September, 2025, 14th September
+    rf"|{_DAY.format('dm_d')}(?:\s+day)?(?:\s+of)?[\s,-]+{_MONTH.format('dm_m')}(?:[\s,-]+{_YEAR.format('dm_y')})?"
+    # September 14, 2025, Sep 14th 2025
+    rf"|{_MONTH.format('md_m')}\s+{_DAY.format('md_d')}(?:,?\s+{_YEAR.format('md_y')})?"
+    r")(?![\w])",
+    re.IGNORECASE,
+)
+_SENTENCE_END = re.compile(r"(?<![\w'/.])(?P<word>[\w'/.]*)[.?!][\"')\]]*\s+(?=[\"'(\[]?[A-Z0-9])|\n\s*\n")
+
+
+class DateHit(NamedTuple):
+    date: Optional[date]  # None when ambiguous and not resolvable locally
+    start: int            # character span of the mention in the source text
+    end: int
+    text: str
+    ambiguous: bool       # year inferred, or day/month order guessed
+
+
+def _year(raw):
+    if raw is None:
+        return None
+    digits = raw.lstrip("'")
+    if len(digits) == 2:
+        return 2000 + int(digits) if int(digits) < 70 else 1900 + int(digits)
+    return int(digits)
+
+
+def _valid(year, month, day):
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def _day_first(hits):
+    """Document convention for numeric dates: day-first (Indian) unless only month-first readings fit."""
+    day_first = month_first = 0
+    for match in hits:
+        a, b, y = int(match.group("num_a")), int(match.group("num_b")), _year(match.group("num_y"))
+        day_first += _valid(y, b, a) is not None and _valid(y, a, b) is None
+        month_first += _valid(y, a, b) is not None and _valid(y, b, a) is None
+    return month_first <= day_first
+
+
+def extract_dates(text) -> List[DateHit]:
+    """
+    Dates mentioned in `text`, in document order: ISO, DD/MM/YYYY with "/", "-" or ".",
+    two-digit years, "14th September 2025", "14th day of September, 2025", "14-Sep-2025",
+    "September 14, 2025". Numeric dates are read day-first unless the document's numeric dates
+    only make sense month-first. A date without a year takes the year of the closest preceding
+    full date and is flagged ambiguous (date None when there is none).
+    """
+    matches = list(_DATE.finditer(text))
+    day_first = _day_first([m for m in matches if m.group("num_a")])
+    hits, last_year = [], None
+    for match in matches:
+        ambiguous = False
+        if match.group("iso_y"):
+            value = _valid(int(match.group("iso_y")), int(match.group("iso_m")), int(match.group("iso_d")))
+        elif match.group("num_a"):
+            a, b, y = int(match.group("num_a")), int(match.group("num_b")), _year(match.group("num_y"))
+            value = _valid(y, b, a) if day_first else _valid(y, a, b)
+            if value is None:
+                value = _valid(y, a, b) if day_first else _valid(y, b, a)
+                ambiguous = value is not None
+        else:
+            prefix = "dm" if match.group("dm_d") else "md"
+            day, month = int(match.group(f"{prefix}_d")), MONTHS[match.group(f"{prefix}_m").lower()]
+            year = _year(match.group(f"{prefix}_y"))
+            if year is None:
+                year, ambiguous = last_year, True
+            value = _valid(year, month, day) if year else None
+        if value is None and not ambiguous:
+            continue
+        if not ambiguous:
+            last_year = value.year
+        hits.append(DateHit(value, match.start(), match.end(), match.group(), ambiguous))
+    return hits
+
+
+def sentence_bounds(text):
+    """Start offsets of the sentences of `text` (after ". ", "? ", "! " or a blank line, not after an abbreviation)."""
+    starts = [0]
+    for match in _SENTENCE_END.finditer(text):
+        word = (match.group("word") or "").lower().rstrip(".")
+        if word and (word in ABBREVIATIONS or len(word) == 1 or word.split(".")[-1] in ABBREVIATIONS):
+            continue
+        starts.append(match.end())
+    return starts
+
+
+def sentence_at(text, starts, position):
+    """The sentence containing `position`, whitespace collapsed."""
+    k = bisect_right(starts, position)
+    end = starts[k] if k < len(starts) else len(text)
+    return " ".join(text[starts[k - 1]:end].split())
+
+
+def dates_with_context(text, today=None, future_only=True, keep_ambiguous=True):
+    """
+    (mentions, ambiguous): [{"date": ISO, "context": sentence}] for every date (after `today`
+    when future_only), unique per (date, context), and [(DateHit, sentence)] for the ambiguous
+    mentions. Ambiguous mentions resolved by the local guesses above are included in `mentions`
+    only with keep_ambiguous, so an LLM pass can settle them instead.
+    """
+    today = today or date.today()
+    starts = sentence_bounds(text)
+    mentions, ambiguous, seen = [], [], set()
+    for hit in extract_dates(text):
+        context = sentence_at(text, starts, hit.start)
+        if hit.ambiguous:
+            ambiguous.append((hit, context))
+            if not keep_ambiguous or hit.date is None:
+                continue
+        if future_only and hit.date <= today:
+            continue
+        key = (hit.date, context)
+        if key not in seen:
+            seen.add(key)
+            mentions.append({"date": hit.date.isoformat(), "context": context})
+    return mentions, ambiguous
@@ -0,0 +1,410 @@
+import json
+import os
+import re
+import threading
+from bisect import bisect_right
+from calendar import monthrange
+from datetime import date, timedelta
+
+from helpers.dates import extract_dates, sentence_at, sentence_bounds
+
+_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+CALENDAR_PATH = os.getenv("LEGAL_CALENDAR_PATH", os.path.join(_DATA_DIR, "legal_calendar.json"))
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def add_months(day, months):
+    """`day` moved by calendar months, clamped to the end of a shorter month (31 Jan + 1 month = 28/29 Feb)."""
+    month = day.month - 1 + months
+    year, month = day.year + month // 12, month % 12 + 1
+    return date(year, month, min(day.day, monthrange(year, month)[1]))
+
+
+class LegalCalendar:
+    """
+    Financial year and court-closure days from the bundled data file (data/legal_calendar.json).
+
+    A day is closed when it falls on the calendar's weekend or on one of its holidays. Holidays
+    are listed per year; for a year the file does not cover only the weekend is known, which
+    `covers` reports so callers can say so.
+    """
+
+    def __init__(self, path=CALENDAR_PATH, name=None):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        self.version = data["version"]
+        self.name = name or data["default"]
+        spec = data["calendars"][self.name]
+        self.fy_start = (data["financial_year"]["start_month"], data["financial_year"]["start_day"])
+        self.weekend = {WEEKDAYS.index(day) for day in spec["weekend"]}
+        self.holidays = {date.fromisoformat(day): holiday for day, holiday in spec["holidays"].items()}
+        self.years = {day.year for day in self.holidays}
+
+    def covers(self, day):
+        return day.year in self.years
+
+    def closed(self, day):
+        """Why the courts are closed on `day` (holiday name or weekday), None when open."""
+        if day in self.holidays:
+            return self.holidays[day]
+        if day.weekday() in self.weekend:
+            return WEEKDAYS[day.weekday()]
+        return None
+
+    def open_day(self, day, step=1):
+        """`day` if the courts are open, otherwise the next (step=1) or previous (step=-1) open day."""
+        while self.closed(day):
+            day += timedelta(days=step)
+        return day
+
+    def add_working_days(self, day, count):
+        """`count` open days after `day` (before it when negative), `day` itself not counted."""
+        step = 1 if count >= 0 else -1
+        for _ in range(abs(count)):
+            day = self.open_day(day + timedelta(days=step), step)
+        return day
+
+    def financial_year(self, day, offset=0):
+        """(first day, last day) of the financial year containing `day`, moved by `offset` years."""
+        month, first = self.fy_start
+        year = day.year if (day.month, day.day) >= (month, first) else day.year - 1
+        start = date(year + offset, month, first)
+        return start, add_months(start, 12) - timedelta(days=1)
+
+    def financial_year_labelled(self, label):
+        """(first day, last day) of the financial year written "2025-26" or "2025-2026"."""
+        month, first = self.fy_start
+        return self.financial_year(date(int(label[:4]), month, first))
+
+    def quarter(self, day, offset=0):
+        """(first day, last day) of the financial-year quarter containing `day`, moved by `offset` quarters."""
+        start, _ = self.financial_year(day)
+        while add_months(start, 3) <= day:
+            start = add_months(start, 3)
+        start = add_months(start, 3 * offset)
+        return start, add_months(start, 3) - timedelta(days=1)
+
+    def label(self, day):
+        start, end = self.financial_year(day)
+        return f"{start.year}-{str(end.year)[2:]}"
+
+
+_calendars = {}
+_calendars_lock = threading.Lock()
+
+
+def get_legal_calendar(name=None):
+    """Process-wide calendar (the data file's default when `name` is None), loaded on first use."""
+    with _calendars_lock:
+        if name not in _calendars:
+            _calendars[name] = LegalCalendar(name=name)
+        return _calendars[name]
+
+
+# --- expressions --------------------------------------------------------------------------------
+
+_UNITS = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten", "eleven", "twelve",
+          "thirteen", "fourteen", "fifteen", "sixteen", "seventeen", "eighteen", "nineteen"]
+_TENS = ["twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety"]
+NUMBER_WORDS = {**{word: k for k, word in enumerate(_UNITS, 1)}, **{word: 10 * k for k, word in enumerate(_TENS, 2)}}
+_WORD = "|".join(sorted(NUMBER_WORDS, key=len, reverse=True))
+_NUMBER_WORD = rf"(?:{_WORD})(?:[\s-]+(?:and\s+)?(?:{_WORD}|hundred)\b)*"
+
+# Where an anchor phrase ends: punctuation, or a word that starts the rest of the sentence
+_ANCHOR = (
+    r"(?P<anchor>(?:[^.;:!?\n()\[\]]|\.(?=\S)){1,120}?)"
+    r"(?=\s*(?:[,;:!?()\[\]\n]|\.(?:\s|$)|$)|\s+(?:and|or|failing|whichever|unless|provided|which|who|to|by|in|at"
+    r"|for|with|under|as|so|if|shall|must|will|may|is|are|was|were|whereupon)\b)"
+)
+# "within 30 days of receipt of this notice", "seven (7) clear days before the hearing", "a month from the Effective Date"
+_RELATIVE = re.compile(
+    r"(?<![\w-])(?:(?P<limit>within|not\s+later\s+than|no\s+later\s+than|not\s+more\s+than|not\s+less\s+than"
+    r"|at\s+least|in)\s+)?(?:(?:a|the)\s+period\s+of\s+)?"
+    rf"(?P<n>\d{{1,4}}|{_NUMBER_WORD}|an?)(?:\s*\(\s*(?:\d{{1,4}}|{_NUMBER_WORD})\s*\))?\s+"
+    r"(?P<kind>working|business|clear|calendar|court)?\s*(?P<unit>days?|weeks?|months?|years?)(?!\w)"
+    rf"(?:\s+(?P<dir>from|after|following|of|since|before|prior\s+to|preceding|succeeding)\s+{_ANCHOR})?",
+    re.IGNORECASE,
+)
+# "on or before the end of the financial year", "the last day of the next quarter", "the close of FY 2025-26"
+_PERIOD_END = re.compile(
+    r"(?<![\w-])(?:(?P<limit>on\s+or\s+before|by|before|till|until|up\s*to|not\s+later\s+than|no\s+later\s+than"
+    r"|at|within)\s+)?the\s+(?P<edge>end|close|expiry|last\s+day|first\s+day|beginning|commencement|start)\s+of\s+"
+    r"(?:the\s+)?(?P<which>current|present|next|following|ensuing|succeeding|previous|preceding|last|same|said|this"
+    r"|that|relevant|each|every)?\s*(?P<period>financial\s+year|fiscal\s+year|assessment\s+year|f\.?\s?y\.?|a\.?\s?y\."
+    r"|quarter|calendar\s+month|month|calendar\s+year|year)"
+    r"(?:\s+(?P<label>(?:19|20)\d{2}\s*[-/–]\s*(?:19|20)?\d{2})|\s+(?P<year>(?:19|20)\d{2}))?(?!\w)",
+    re.IGNORECASE,
+)
+_DATED = re.compile(r"(?:\bdated|\bdt\.?|\bdate\s*[:-]|\bdate\s+of\s+(?:issue|this\s+\w+))\s*(?:the\s+)?$", re.IGNORECASE)
+
+_MAX_ANCHOR_WALK = 64  # dated sentences searched on each side of an expression for its event
+
+_AFTER = {"from", "after", "following", "of", "since", "succeeding"}
+_OFFSETS = {"next": 1, "following": 1, "ensuing": 1, "succeeding": 1, "previous": -1, "preceding": -1, "last": -1}
+_START_EDGES = {"first day", "beginning", "commencement", "start"}
+# Words of an anchor phrase that say nothing about which event it is
+_STOP = {"the", "this", "that", "these", "those", "said", "such", "a", "an", "of", "on", "date", "day", "his", "her",
+         "its", "their", "your", "our", "my", "aforesaid", "above", "above-mentioned", "present", "respective", "actual",
+         "any", "each", "every", "same", "relevant", "concerned", "instant", "first", "hereof", "herein", "today"}
+# "receipt of this notice": the notice's own date stands in only when the receipt date is not stated
+_RECEIPT = {"receipt": "receiv", "service": "serv", "delivery": "deliver", "communication": "communicat"}
+# The document itself ("this notice", "the date hereof") is anchored on the date it bears
+_DOCUMENTS = {"notice", "agreement", "deed", "order", "letter", "lease", "contract", "summon", "judgment", "judgement",
+              "memorandum", "award", "decree", "instrument", "policy", "circular", "notification", "application",
+              "petition", "complaint", "reply", "communication"}
+
+
+def _stem(word):
+    word = word.lower().strip("'")
+    return word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "is", "us")) else word
+
+
+def _words(text):
+    return [_stem(word) for word in re.findall(r"[A-Za-z][\w'-]*", text)]
+
+
+def parse_number(raw):
+    """30 for "30", "thirty" or "Thirty"; 1 for "a"/"an"; 120 for "one hundred and twenty"."""
+    raw = raw.lower()
+    if raw.isdigit():
+        return int(raw)
+    if raw in ("a", "an"):
+        return 1
+    total = 0
+    for word in re.split(r"[\s-]+", raw):
+        if word == "hundred":
+            total = max(total, 1) * 100
+        elif word != "and":
+            total += NUMBER_WORDS[word]
+    return total
+
+
+def _iso(day):
+    return day.isoformat() if day else None
+
+
+class _Document:
+    """One text, with its date mentions, sentences and an index from anchor words to the dated sentences holding them."""
+
+    def __init__(self, text, reference):
+        self.text = text
+        self.starts = sentence_bounds(text)
+        self.hits = [hit for hit in extract_dates(text) if hit.date and not hit.ambiguous]
+        self._hit_starts = [hit.start for hit in self.hits]
+        self.words = [set(_words(self.sentence(hit.start))) for hit in self.hits]
+        self.index = {}
+        for k, words in enumerate(self.words):
+            for word in words:
+                self.index.setdefault(word, []).append(k)
+
+        dated = next((hit for hit in self.hits if _DATED.search(text[max(0, hit.start - 40):hit.start])), None)
+        if dated is not None:
+            self.date, self.date_assumed, self.date_source = dated.date, False, self.sentence(dated.start)
+        elif self.hits:
+            self.date, self.date_assumed, self.date_source = self.hits[0].date, True, self.sentence(self.hits[0].start)
+        else:
+            self.date, self.date_assumed, self.date_source = reference, True, "reference date"
+
+    def sentence(self, position):
+        return sentence_at(self.text, self.starts, position)
+
+    def sentence_span(self, position):
+        k = bisect_right(self.starts, position)
+        return self.starts[k - 1], self.starts[k] if k < len(self.starts) else len(self.text)
+
+    def date_in(self, start, end):
+        k = bisect_right(self._hit_starts, start - 1)
+        return self.hits[k] if k < len(self.hits) and self.hits[k].start < end else None
+
+    def document_anchor(self, text, note=None):
+        return {"text": text, "date": self.date, "method": "document date", "source": self.date_source,
+                "assumed": self.date_assumed or bool(note), "note": note}
+
+    def _nearest(self, keywords, position, span, also=None):
+        """
+        The date of the dated sentence closest to `position` that mentions every keyword (and
+        `also`); within that sentence, the date closest to a keyword. Walks outward from
+        `position` over the rarest keyword's sentences, at most _MAX_ANCHOR_WALK each way.
+        """
+        pools = [self.index.get(word) for word in keywords]
+        if not all(pools):
+            return None
+        pool = min(pools, key=len)
+        middle = bisect_right(pool, bisect_right(self._hit_starts, position) - 1)
+        lower, upper = max(0, middle - _MAX_ANCHOR_WALK), min(len(pool), middle + _MAX_ANCHOR_WALK)
+        for _, j in sorted((abs(self.hits[pool[j]].start - position), j) for j in range(lower, upper)):
+            hit = self.hits[pool[j]]
+            if span[0] <= hit.start < span[1] or not self.words[pool[j]].issuperset(keywords):
+                continue
+            start, end = self.sentence_span(hit.start)
+            sentence = self.text[start:end].lower()
+            if also and also not in sentence:
+                continue
+            same = [self.hits[pool[i]] for i in range(max(0, j - 8), min(len(pool), j + 9))
+                    if start <= self.hits[pool[i]].start < end and not span[0] <= self.hits[pool[i]].start < span[1]]
+            return min(same, key=lambda h: min(
+                abs(m.start() + start - h.start) for word in keywords for m in re.finditer(re.escape(word), sentence)))
+        return None
+
+    def event_anchor(self, text, position, span):
+        """Date of the event an anchor phrase names, from a dated sentence elsewhere in the document that mentions it."""
+        words = _words(text)
+        receipt = next((w for w in words if w in _RECEIPT), None)
+        keywords = [w for w in words if w not in _STOP and w not in _RECEIPT]
+        if not keywords:  # "the date hereof", "today"
+            return self.document_anchor(text)
+        if receipt:
+            hit = self._nearest(keywords, position, span, also=_RECEIPT[receipt])
+            if hit:
+                return {"text": text, "date": hit.date, "method": "event", "source": self.sentence(hit.start),
+                        "assumed": False, "note": None}
+        hit = self._nearest(keywords, position, span)
+        if hit:
+            note = f"{receipt} date not stated; the date of the {keywords[-1]} is used" if receipt else None
+            return {"text": text, "date": hit.date, "method": "event", "source": self.sentence(hit.start),
+                    "assumed": bool(receipt), "note": note}
+        if set(keywords) & _DOCUMENTS and re.search(r"\b(?:this|these|present|hereof|today)\b", text, re.IGNORECASE):
+            note = f"{receipt} date not stated; the document's date is used" if receipt else None
+            return self.document_anchor(text, note)
+        return None
+
+
+def _period(calendar, match, reference):
+    """(first day, last day, description) of the period a _PERIOD_END match names."""
+    period = re.sub(r"\s+", " ", match.group("period").lower())
+    which = (match.group("which") or "").lower()
+    offset = _OFFSETS.get(which, 0)
+    label, year = match.group("label"), match.group("year")
+    if period == "year" and label:
+        period = "financial year"
+    if period in ("financial year", "fiscal year", "assessment year") or period.replace(".", "").replace(" ", "") in ("fy", "ay"):
+        start, end = calendar.financial_year_labelled(label) if label else calendar.financial_year(reference, offset)
+        return start, end, f"financial year {calendar.label(start)}"
+    if period == "quarter":
+        start, end = calendar.quarter(reference, offset)
+        return start, end, f"quarter {start:%d %b %Y} - {end:%d %b %Y}"
+    if period in ("month", "calendar month"):
+        start = add_months(reference.replace(day=1), offset)
+        return start, add_months(start, 1) - timedelta(days=1), f"month {start:%B %Y}"
+    first = date(int(year) if year else reference.year + offset, 1, 1)
+    return first, date(first.year, 12, 31), f"calendar year {first.year}"
+
+
+def _period_anchor(calendar, match, reference, source):
+    start, end, described = _period(calendar, match, reference)
+    edge = re.sub(r"\s+", " ", match.group("edge").lower())
+    day = start if edge in _START_EDGES else end
+    recurring = (match.group("which") or "").lower() in ("each", "every")
+    note = f"{'first' if day == start else 'last'} day of the {described}"
+    if recurring:
+        note += " (recurs every period; the one containing the reference date)"
+    return {"text": match.group().strip(), "date": day, "method": "period", "source": source, "assumed": False,
+            "note": note}
+
+
+def shift(calendar, anchor, count, unit, kind, after):
+    """(day, rule) for `count` units after/before `anchor`, counted the way Indian statutes count periods."""
+    sign, way = (1, "after") if after else (-1, "before")
+    unit, kind = unit.lower().rstrip("s"), (kind or "").lower()
+    plural = "" if count == 1 else "s"
+    if unit == "day" and kind in ("working", "business", "court"):
+        return (calendar.add_working_days(anchor, sign * count),
+                f"{count} {kind} day{plural} {way} the anchor ({calendar.name} calendar)")
+    if unit == "day" and kind == "clear":
+        return (anchor + timedelta(days=sign * (count + 1)),
+                f"{count} clear day{plural} {way} the anchor (both the anchor and the deadline day excluded)")
+    if unit in ("day", "week"):
+        days = count * (7 if unit == "week" else 1)
+        return (anchor + timedelta(days=sign * days),
+                f"{count} {unit}{plural} {way} the anchor, first day excluded (General Clauses Act s.9)")
+    months = count * (12 if unit == "year" else 1)
+    return (add_months(anchor, sign * months),
+            f"{count} calendar {unit}{plural} {way} the anchor (General Clauses Act s.3(35))")
+
+
+def _resolved(doc, match, anchor, day, rule, calendar, step):
+    """Entry for one resolved expression; a closed day moves by `step` (1 forward, -1 back, 0 not at all)."""
+    adjusted, closed = None, calendar.closed(day)
+    if step and closed:
+        moved = calendar.open_day(day, step)
+        adjusted = (f"{day.isoformat()} is a closed day ({closed}); moved to the "
+                    f"{'next' if step > 0 else 'previous'} open day (General Clauses Act s.10)")
+        day = moved
+    notes = [anchor["note"]] if anchor.get("note") else []
+    if not calendar.covers(day):
+        notes.append(f"no holiday list for {day.year} in calendar {calendar.version}; only weekends checked")
+    return {
+        "date": day.isoformat(),
+        "context": doc.sentence(match.start()),
+        "expression": " ".join(match.group().split()),
+        "provenance": {
+            "anchor": {"text": anchor["text"], "date": _iso(anchor["date"]), "method": anchor["method"],
+                       "source": anchor["source"]},
+            "rule": rule,
+            "adjusted": adjusted,
+            "assumed": anchor["assumed"],
+            "notes": notes,
+            "calendar": f"{calendar.name} {calendar.version}",
+        },
+    }
+
+
+def resolve_deadlines(text, reference=None, calendar=None, roll=True):
+    """
+    Relative deadlines in `text` resolved to dates, locally: (resolved, unresolved).
+
+    "within 30 days of receipt of this notice", "seven days before the hearing", "two working
+    days after the Effective Date", "on or before the end of the financial year". Anchors are
+    dates found in the same document: a date inside the anchor phrase, else a dated sentence
+    mentioning the same event ("the hearing is fixed on 20/10/2025"), else the document's own
+    date for "this notice"/"hereof". Periods are counted as the General Clauses Act counts them;
+    with `roll`, a computed day the courts are closed moves to the next open day (the previous
+    one for "before" deadlines). Financial-year and period ends are the dates they name.
+
+    Each resolved entry is {"date", "context", "expression", "provenance"}; provenance holds the
+    anchor (phrase, date, how it was found, source sentence), the rule applied, any closed-day
+    adjustment, whether the anchor was assumed, and the calendar version. Unresolved entries
+    carry "date": None and the reason.
+    """
+    calendar = calendar or get_legal_calendar()
+    doc = _Document(text, reference or date.today())
+    resolved, unresolved, taken = [], [], []
+
+    for match in _RELATIVE.finditer(text):
+        direction = (match.group("dir") or "").lower()
+        if not direction and (match.group("limit") or "").lower() != "within":
+            continue  # "a notice period of 15 days": a duration, not a deadline
+        count, after = parse_number(match.group("n")), not direction or direction.split()[0] in _AFTER
+        if not direction:
+            anchor = doc.document_anchor("(none stated)", "no anchor stated; the document's date is used")
+        else:
+            phrase, span = match.group("anchor").strip(), match.span("anchor")
+            explicit, period = doc.date_in(*span), _PERIOD_END.search(phrase)
+            if explicit is not None:
+                anchor = {"text": phrase, "date": explicit.date, "method": "explicit", "source": doc.sentence(explicit.start),
+                          "assumed": False, "note": None}
+            elif period is not None:
+                anchor = _period_anchor(calendar, period, doc.date, doc.date_source)
+            else:
+                anchor = doc.event_anchor(phrase, match.start(), span)
+        taken.append(match.span())
+        if anchor is None:
+            unresolved.append({"date": None, "context": doc.sentence(match.start()),
+                               "expression": " ".join(match.group().split()),
+                               "reason": f"no date found for \"{match.group('anchor').strip()}\""})
+            continue
+        day, rule = shift(calendar, anchor["date"], count, match.group("unit"), match.group("kind"), after)
+        step = (1 if after else -1) if roll else 0
+        resolved.append((match.start(), _resolved(doc, match, anchor, day, rule, calendar, step)))
+
+    for match in _PERIOD_END.finditer(text):
+        k = bisect_right(taken, (match.start(), len(text)))  # relative matches are disjoint and in order
+        if k and match.start() < taken[k - 1][1]:
+            continue
+        anchor = _period_anchor(calendar, match, doc.date, doc.date_source)
+        limit = " ".join((match.group("limit") or "on").lower().split())
+        rule, anchor["note"] = f"{limit} the {anchor['note']} (reference date {doc.date.isoformat()})", None
+        resolved.append((match.start(), _resolved(doc, match, anchor, anchor["date"], rule, calendar, 0)))
+
+    return [entry for _, entry in sorted(resolved, key=lambda item: item[0])], unresolved
@@ -0,0 +1,175 @@
+import re
+import zlib
+
+from helpers.citations import extract_citations
+from helpers.executor import DEFAULT_MAX_CONCURRENCY, bounded_map
+
+_NUMBERING = re.compile(r"^\s*(?:\(?\d{1,3}[.)]|\(?[a-zA-Z][.)]|\(?[ivxlc]+[.)]|[-*•])\s+", re.IGNORECASE)
+_SECTION_WORD = re.compile(r"\b(?:sections?|secs?\.?|ss?\.|u/ss?\.?)(?=\s*\d)", re.IGNORECASE)
+_PUNCT = re.compile(r"[^\w\s]")
+_STOPWORDS = {"of", "the", "a", "an", "and", "under", "in", "to", "for", "by", "with", "is", "are"}
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def normalize_clause(text):
+    """Lower-case, strip list numbering, unify 'Sec.'/'u/s' to 'section', drop punctuation and filler words."""
+    text = _NUMBERING.sub("", text)
+    text = _SECTION_WORD.sub("section", text)
+    text = _PUNCT.sub(" ", text.lower().replace("cr.p.c", "crpc"))
+    return " ".join(word for word in text.split() if word not in _STOPWORDS)
+
+
+def citation_key(text):
+    """Canonical statute citations of a clause, e.g. frozenset({'Section 420 IPC'}). Empty when it cites none."""
+    return frozenset(c.canonical for c in extract_citations(text))
+
+
+def _shingles(normalized, k=5):
+    if len(normalized) <= k:
+        return {normalized}
+    return {normalized[i:i + k] for i in range(len(normalized) - k + 1)}
+
+
+def _jaccard(a, b):
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+def _remainder(normalized):
+    """Words of a normalized clause other than citation tokens and numbers."""
+    return {w for w in normalized.split() if not w.isdigit() and w not in {"section", "ipc", "crpc", "bns", "bnss", "bsa"}}
+
+
+class NearDuplicateIndex:
+    """
+    Online near-duplicate clustering of clauses.
+
+    Clauses are normalized and shingled; MinHash signatures are banded into an LSH table so
+    each new clause is only compared with a few candidates. A clause joins an existing
+    cluster when its shingle Jaccard similarity with the representative reaches `threshold`,
+    or when both cite exactly the same statute sections ("Section 420 IPC – Cheating" vs
+    "Sec. 420 of IPC"). Clauses citing different sections or mentioning different numbers
+    are never merged.
+    """
+
+    def __init__(self, threshold=0.8, num_perm=64, bands=16):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._params = [((i * 0x9E3779B1 + 1) % _PRIME, (i * 0x85EBCA77 + 7) % _PRIME) for i in range(num_perm)]
+        self._buckets = {}
+        self._by_citation = {}
+        self._reps = []          # (clause, shingles, citations, numbers, remainder)
+        self.representatives = []
+        self.members = []
+        self.assignment = []
+        self.clauses = []
+
+    def _signature(self, shingles):
+        hashes = [zlib.crc32(s.encode("utf-8")) for s in shingles]
+        return [min((a * h + b) % _PRIME for h in hashes) & _MAX_HASH for a, b in self._params]
+
+    def _band_keys(self, signature):
+        return [(band, tuple(signature[band * self.rows:(band + 1) * self.rows])) for band in range(self.bands)]
+
+    def _matches(self, rep, shingles, citations, numbers, remainder):
+        _, rep_shingles, rep_citations, rep_numbers, rep_remainder = rep
+        if citations or rep_citations:
+            if citations != rep_citations:
+                return False
+            # Same sections cited: merge unless the surrounding text clearly says something else
+            return min(len(remainder), len(rep_remainder)) <= 6 or _jaccard(remainder, rep_remainder) >= 0.3
+        if numbers != rep_numbers:
+            return False
+        return _jaccard(shingles, rep_shingles) >= self.threshold
+
+    def add(self, clause):
+        """Add a clause; returns (cluster_id, is_new_cluster)."""
+        normalized = normalize_clause(clause)
+        shingles = _shingles(normalized)
+        citations = citation_key(clause)
+        numbers = frozenset(re.findall(r"\d+", normalized))
+        remainder = _remainder(normalized)
+        band_keys = self._band_keys(self._signature(shingles))
+
+        candidates = set(self._by_citation.get(citations, ())) if citations else set()
+        for key in band_keys:
+            candidates.update(self._buckets.get(key, ()))
+
+        self.clauses.append(clause)
+        for cid in sorted(candidates):
+            if self._matches(self._reps[cid], shingles, citations, numbers, remainder):
+                self.members[cid].append(len(self.assignment))
+                self.assignment.append(cid)
+                return cid, False
+
+        cid = len(self._reps)
+        self._reps.append((clause, shingles, citations, numbers, remainder))
+        self.representatives.append(clause)
+        self.members.append([len(self.assignment)])
+        self.assignment.append(cid)
+        for key in band_keys:
+            self._buckets.setdefault(key, []).append(cid)
+        if citations:
+            self._by_citation.setdefault(citations, []).append(cid)
+        return cid, True
+
+    def new_representatives(self, clauses):
+        """Add clauses lazily, yielding only those that start a new cluster (for streaming pipelines)."""
+        for clause in clauses:
+            cid, is_new = self.add(clause)
+            if is_new:
+                yield clause
+
+    def fan_out(self, rep_results):
+        """Expand one result per cluster into one result per added clause, relabelled with that clause."""
+        return [
+            _relabel(rep_results[cid], self.representatives[cid], clause)
+            for clause, cid in zip(self.clauses, self.assignment)
+        ]
+
+    def map_clusters(self, fn, limit=None, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        """
+        fn(representative) once per cluster among the first `limit` added clauses, fanned back out
+        to one result per clause (relabelled with it). Returns (results, calls saved).
+        """
+        positions = range(len(self.clauses))[:limit]
+        cids = list(dict.fromkeys(self.assignment[p] for p in positions))
+        results = dict(zip(cids, bounded_map(lambda cid: fn(self.representatives[cid]), cids, max_concurrency)))
+        fanned = [
+            _relabel(results[self.assignment[p]], self.representatives[self.assignment[p]], self.clauses[p])
+            for p in positions
+        ]
+        return fanned, len(positions) - len(cids)
+
+    def report(self, calls_per_clause=1, calls_saved=None):
+        """Cluster counts; `calls_saved` replaces the estimate when only some clauses went through LLM stages."""
+        saved = len(self.assignment) - len(self.representatives)
+        return {
+            "clauses": len(self.assignment),
+            "clusters": len(self.representatives),
+            "duplicates_merged": saved,
+            "llm_calls_saved": saved * calls_per_clause if calls_saved is None else calls_saved
+        }
+
+
+def _relabel(value, old, new):
+    """Copy a result, replacing the representative's text with `new` wherever it is stored under 'clause'."""
+    if old == new:
+        return value
+    if isinstance(value, dict):
+        return {k: (new if k == "clause" and v == old else _relabel(v, old, new)) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_relabel(v, old, new) for v in value)
+    return value
+
+
+def cluster_clauses(clauses, threshold=0.8):
+    """Cluster a list of clauses; returns the populated NearDuplicateIndex."""
+    index = NearDuplicateIndex(threshold=threshold)
+    for clause in clauses:
+        index.add(clause)
+    return index
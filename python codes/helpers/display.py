@@ -0,0 +1,74 @@
+import json
+
+from helpers.json_utils import loads_lenient
+from helpers.merge import UNION, is_missing, merge_records
+
+
+def _text(value):
+    if isinstance(value, dict):
+        return "; ".join(f"{k}: {_text(v)}" for k, v in value.items() if not is_missing(v))
+    if isinstance(value, list):
+        return "; ".join(_text(v) for v in value if not is_missing(v))
+    return str(value).strip()
+
+
+def normalize_explained_clauses(explained_clauses):
+    """
+    Deterministic replacement for the LLM "make it display nice" pass.
+
+    Takes the workflow's [{"clause": {"clause", "attributes"}, "analysis"}] list and returns
+    {"KeyTerms": {key: [distinct values]}, "Clauses": [{"Clause", "Explanation", ...}]} with
+    null columns removed, repeated keys merged into lists and duplicate rows collapsed
+    (other wordings of a collapsed clause are kept under "AlsoWorded").
+    """
+    attributes, rows, seen = [], [], {}
+    for entry in explained_clauses:
+        clause = entry.get("clause", {})
+        if isinstance(clause, dict):
+            text, attrs = clause.get("clause", ""), clause.get("attributes")
+        else:
+            text, attrs = clause, None
+        attrs = loads_lenient(attrs, {}) if attrs else {}
+        if isinstance(attrs, dict):
+            attributes.append(attrs)
+
+        analysis = loads_lenient(entry.get("analysis"), {})
+        if not isinstance(analysis, dict):
+            analysis = {"Explanation": entry.get("analysis")}
+        row = {"Clause": _text(text).lstrip("0123456789.) ").strip()}
+        row.update({k: _text(v) for k, v in analysis.items() if not is_missing(v)})
+
+        # Near-duplicate clauses fanned out from one analysis collapse into a single row
+        key = (json.dumps(attrs, sort_keys=True), tuple(sorted((k, v) for k, v in row.items() if k != "Clause")))
+        if key in seen:
+            first = seen[key]
+            if row["Clause"].lower() != first["Clause"].lower() and row["Clause"] not in first.get("AlsoWorded", []):
+                first.setdefault("AlsoWorded", []).append(row["Clause"])
+            continue
+        seen[key] = row
+        rows.append(row)
+
+    key_terms, _ = merge_records(attributes, default=UNION, date_range=None)
+    return {"KeyTerms": {k: [_text(v) for v in values] for k, values in key_terms.items()}, "Clauses": rows}
+
+
+def render_markdown(normalized, title="Contract Overview"):
+    """Markdown view of normalize_explained_clauses output."""
+    lines = [f"## {title}", ""]
+    if normalized["KeyTerms"]:
+        lines += ["### Key Terms", ""]
+        for key, values in normalized["KeyTerms"].items():
+            label = key.replace("_", " ")
+            if len(values) == 1:
+                lines.append(f"- **{label}:** {values[0]}")
+            else:
+                lines.append(f"- **{label}:**")
+                lines += [f"    - {v}" for v in values]
+        lines.append("")
+    if normalized["Clauses"]:
+        lines += ["### Clauses", ""]
+        for i, row in enumerate(normalized["Clauses"], 1):
+            lines.append(f"{i}. **{row['Clause']}**")
+            lines += [f"    - *{k}:* {_text(v)}" for k, v in row.items() if k != "Clause"]
+        lines.append("")
+    return "\n".join(lines)
@@ -0,0 +1,31 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_MAX_CONCURRENCY = 4
+
+
+def imap_bounded(fn, items, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+    """
+    Lazily yield fn(item) for every item, in input order.
+    At most `max_concurrency` calls are in flight (or finished but not yet yielded),
+    so memory stays bounded even when `items` is a long generator.
+    """
+    if not max_concurrency or max_concurrency <= 1:
+        for item in items:
+            yield fn(item)
+        return
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+        pending = deque()
+        for item in items:
+            pending.append(pool.submit(fn, item))
+            if len(pending) >= max_concurrency:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def bounded_map(fn, items, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+    """Like map(), but runs up to `max_concurrency` calls at once and returns a list in input order."""
+    return list(imap_bounded(fn, items, max_concurrency))
+
@@ -0,0 +1,80 @@
+from helpers.executor import DEFAULT_MAX_CONCURRENCY, bounded_map
+from helpers.json_utils import loads_lenient
+from helpers.sinks import NullSink
+
+DEFAULT_FUSED_BATCH_SIZE = 8
+
+# Per-clause stage -> the part of the fused answer that replaces it
+FUSED_STAGES = {"classify_level2": "SubCategory", "attributes": "Attributes", "explain": "Explanation"}
+
+
+def fused_parts(plan):
+    """Parts of the fused answer the output plan needs (helpers.outputs.OutputPlan), in prompt order."""
+    return [part for stage, part in FUSED_STAGES.items() if plan.needs(stage)]
+
+
+def parse_json_array(text):
+    """Parse a JSON array from an LLM response (markdown fences tolerated). Returns None if it is not one."""
+    data = loads_lenient(text)
+    return data if isinstance(data, list) else None
+
+
+def _field(item, key):
+    return item.get(key) if isinstance(item, dict) else getattr(item, key, None)
+
+
+def _match_items(batch, items, required_keys):
+    """Map each clause of the batch to its fused result (by 1-based Index, else by position)."""
+    matched = [None] * len(batch)
+    for pos, item in enumerate(items or []):
+        if isinstance(item, (str, int, float, list)) or any(_field(item, k) is None for k in required_keys):
+            continue
+        idx = _field(item, "Index")
+        if isinstance(idx, int) and 1 <= idx <= len(batch):
+            slot = idx - 1
+        elif len(items) == len(batch):
+            slot = pos
+        else:
+            continue
+        if matched[slot] is None:
+            matched[slot] = item
+    return matched
+
+
+def run_fused_analysis(clauses, fused_call, to_result, fallback, required_keys,
+                       batch_size=DEFAULT_FUSED_BATCH_SIZE, max_concurrency=DEFAULT_MAX_CONCURRENCY, sink=NullSink()):
+    """
+    Analyse clauses with one fused LLM call per batch instead of one call per stage.
+
+    fused_call(batch) -> stream of a JSON array, one object per clause; schema-constrained
+                         streams (utils.StructuredStream) yield typed objects instead of dicts
+    to_result(clause, item) -> the per-clause result built from a fused object
+    fallback(clause) -> the same result computed with the separate per-stage calls,
+                        used for clauses the fused answer did not cover
+    sink (helpers.sinks) receives each batch answer as a completed item; the default discards it
+
+    Returns (results aligned with `clauses`, stats dict).
+    """
+    batch_size = max(1, batch_size)
+    batches = [clauses[i:i + batch_size] for i in range(0, len(clauses), batch_size)]
+
+    def analyse_batch(batch):
+        stream = fused_call(batch)
+        text = sink.collect("fused_analysis", stream)
+        items = stream.parsed() if hasattr(stream, "parsed") else parse_json_array(text)
+        return _match_items(batch, items, required_keys)
+
+    matched = [item for batch_items in bounded_map(analyse_batch, batches, max_concurrency) for item in batch_items]
+    missing = [clause for clause, item in zip(clauses, matched) if item is None]
+    recovered = dict(zip(missing, bounded_map(fallback, missing, max_concurrency)))
+
+    results = [
+        to_result(clause, item) if item is not None else recovered[clause]
+        for clause, item in zip(clauses, matched)
+    ]
+    stats = {
+        "clauses": len(clauses),
+        "fused_calls": len(batches),
+        "fallback_clauses": len(missing)
+    }
+    return results, stats
@@ -0,0 +1,178 @@
+import re
+
+# Verhoeff checksum tables (used by UIDAI for the last digit of an Aadhaar number)
+_VERHOEFF_D = [
+    [0, 1, 2, 3, 4, 5, 6, 7, 8, 9],
+    [1, 2, 3, 4, 0, 6, 7, 8, 9, 5],
+    [2, 3, 4, 0, 1, 7, 8, 9, 5, 6],
+    [3, 4, 0, 1, 2, 8, 9, 5, 6, 7],
+    [4, 0, 1, 2, 3, 9, 5, 6, 7, 8],
+    [5, 9, 8, 7, 6, 0, 4, 3, 2, 1],
+    [6, 5, 9, 8, 7, 1, 0, 4, 3, 2],
+    [7, 6, 5, 9, 8, 2, 1, 0, 4, 3],
+    [8, 7, 6, 5, 9, 3, 2, 1, 0, 4],
+    [9, 8, 7, 6, 5, 4, 3, 2, 1, 0],
+]
+_VERHOEFF_P = [
+    [0, 1, 2, 3, 4, 5, 6, 7, 8, 9],
+    [1, 5, 7, 6, 2, 8, 3, 0, 9, 4],
+    [5, 8, 0, 3, 7, 9, 6, 1, 4, 2],
+    [8, 9, 1, 6, 0, 4, 3, 5, 2, 7],
+    [9, 4, 5, 3, 1, 2, 6, 8, 7, 0],
+    [4, 2, 8, 6, 5, 7, 3, 9, 0, 1],
+    [2, 7, 9, 3, 8, 0, 6, 4, 1, 5],
+    [7, 0, 4, 6, 9, 1, 3, 2, 5, 8],
+]
+
+# RTO state/UT codes that can prefix a driving licence number
+_DL_STATES = {
+    "AN", "AP", "AR", "AS", "BR", "CG", "CH", "DD", "DL", "DN", "GA", "GJ", "HP", "HR", "JH", "JK", "KA", "KL",
+    "LA", "LD", "MH", "ML", "MN", "MP", "MZ", "NL", "OD", "OR", "PB", "PY", "RJ", "SK", "TN", "TR", "TS", "UK",
+    "UP", "WB",
+}
+
+_AADHAAR = re.compile(r"(?<![\d-])([2-9]\d{3})[ -]?(\d{4})[ -]?(\d{4})(?![\d-])")
+_AADHAAR_MASKED = re.compile(r"\b[Xx*]{4}[ -]?[Xx*]{4}[ -]?(\d{4})\b")
+_PAN = re.compile(r"\b([A-Z]{3}[ABCFGHJLPT][A-Z]\d{4}[A-Z])\b")
+_PASSPORT = re.compile(r"\b([A-PR-WY][1-9]\d{6})\b")
+_DL = re.compile(r"\b([A-Z]{2})[ -]?(\d{2})[ -]?((?:19|20)\d{2})[ -]?(\d{7})\b")
+_DATE = r"(\d{1,2}[/.-]\d{1,2}[/.-]\d{4})"
+
+_LABELLED_DATES = {
+    "DateOfBirth": re.compile(rf"(?:\bDOB\b|\bD\.O\.B\.?|Date\s+of\s+Birth|जन्म\s*तिथि)\s*[:/-]?\s*{_DATE}", re.IGNORECASE),
+    "IssueDate": re.compile(rf"(?:Date\s+of\s+Issue|Issue\s+Date|Issued\s+on|DOI)\s*[:/-]?\s*{_DATE}", re.IGNORECASE),
+    "ExpiryDate": re.compile(rf"(?:Date\s+of\s+Expiry|Expiry\s+Date|Valid\s+(?:Till|Upto|Up\s+to)|Validity(?:\s*\(NT\))?)\s*[:/-]?\s*{_DATE}", re.IGNORECASE),
+}
+_VALID_RANGE = re.compile(rf"Valid\s+from\s+{_DATE}\s+(?:to|till|until|-)\s+{_DATE}", re.IGNORECASE)
+_YEAR_OF_BIRTH = re.compile(r"(?:Year\s+of\s+Birth|YOB)\s*[:/-]?\s*((?:19|20)\d{2})", re.IGNORECASE)
+
+_LABELLED_TEXT = {
+    "Father's Name": re.compile(r"(?:Father'?s?\s+Name|S/O|D/O|Son\s+of|Daughter\s+of)\s*[:,-]?\s*([A-Za-z][A-Za-z .]{1,60})", re.IGNORECASE),
+    "Mother's Name": re.compile(r"Mother'?s?\s+Name\s*[:,-]?\s*([A-Za-z][A-Za-z .]{1,60})", re.IGNORECASE),
+    "Name": re.compile(r"(?<!'s )(?<!rs )(?<![A-Za-z'])Name\s*[:-]\s*([A-Za-z][A-Za-z .]{1,60})", re.IGNORECASE),
+    "Address": re.compile(r"Address\s*[:-]\s*(.{5,200})", re.IGNORECASE),
+    "Nationality": re.compile(r"Nationality\s*[:-]?\s*([A-Za-z]{4,20})", re.IGNORECASE),
+    "PlaceOfBirth": re.compile(r"Place\s+of\s+Birth\s*[:-]?\s*([A-Za-z][A-Za-z ,]{1,40})", re.IGNORECASE),
+    "BloodGroup": re.compile(r"(?:Blood\s+Group|BG)\s*[:-]?\s*((?:A|B|AB|O)[+-]|(?:A|B|AB|O)\s?(?:\+ve|-ve|positive|negative))", re.IGNORECASE),
+    "VehicleType": re.compile(r"(?:COV|Class\s+of\s+Vehicle|Vehicle\s+Class)\s*[:-]?\s*([A-Z][A-Z0-9 ,/()-]{1,40})", re.IGNORECASE),
+}
+_GENDER = re.compile(r"\b(MALE|FEMALE|TRANSGENDER|पुरुष|महिला)\b", re.IGNORECASE)
+
+COMMON_FIELDS = [
+    "Name", "DateOfBirth", "DocumentType", "DocumentNumber", "IssuedBy", "IssueDate",
+    "ExpiryDate", "Address", "Mother's Name", "Father's Name",
+]
+EXTRA_FIELDS = {
+    "Aadhaar Card": ["AadhaarNumber", "Gender"],
+    "PAN Card": ["PANNumber"],
+    "Passport": ["Nationality", "PlaceOfBirth", "FatherName", "MotherName"],
+    "Driving License": ["VehicleType", "LicenseClass", "BloodGroup"],
+}
+
+
+def verhoeff_valid(number):
+    """True if the digit string passes the Verhoeff check (Aadhaar numbers do)."""
+    check = 0
+    for i, digit in enumerate(reversed(number)):
+        check = _VERHOEFF_D[check][_VERHOEFF_P[i % 8][int(digit)]]
+    return check == 0
+
+
+def find_aadhaar(text):
+    """Verhoeff-valid Aadhaar numbers, formatted 'XXXX XXXX XXXX'."""
+    found = []
+    for match in _AADHAAR.finditer(text):
+        number = "".join(match.groups())
+        if len(set(number)) > 1 and verhoeff_valid(number):
+            found.append(" ".join(match.groups()))
+    return list(dict.fromkeys(found))
+
+
+def find_pan(text):
+    """PAN numbers: 5 letters (4th is the holder type), 4 digits, 1 letter."""
+    return list(dict.fromkeys(_PAN.findall(text)))
+
+
+def find_passport(text):
+    """Indian passport numbers; only trusted when the text is about a passport."""
+    if not re.search(r"passport|republic\s+of\s+india", text, re.IGNORECASE):
+        return []
+    return list(dict.fromkeys(_PASSPORT.findall(text)))
+
+
+def find_driving_licence(text):
+    """Driving licence numbers: state code, RTO code, year of issue, 7-digit serial."""
+    found = []
+    for state, rto, year, serial in _DL.findall(text):
+        if state in _DL_STATES:
+            found.append(f"{state}{rto} {year}{serial}")
+    return list(dict.fromkeys(found))
+
+
+def _first(pattern, text):
+    match = pattern.search(text)
+    return match.group(1).strip(" .,") if match else None
+
+
+def extract_identity_fields(text):
+    """
+    Deterministically fill the personal-document attribute schema from the document text.
+
+    Returns (fields, document_type). Fields that could not be found are None; document_type is
+    None when no validated identity number is present.
+    """
+    aadhaar, pan = find_aadhaar(text), find_pan(text)
+    passport, licence = find_passport(text), find_driving_licence(text)
+
+    if licence and re.search(r"driving\s+licen[cs]e|\bDL\b", text, re.IGNORECASE):
+        doc_type, number = "Driving License", licence[0]
+    elif passport:
+        doc_type, number = "Passport", passport[0]
+    elif pan and (not aadhaar or re.search(r"permanent\s+account|income\s+tax", text, re.IGNORECASE)):
+        doc_type, number = "PAN Card", pan[0]
+    elif aadhaar:
+        doc_type, number = "Aadhaar Card", aadhaar[0]
+    else:
+        masked = _AADHAAR_MASKED.search(text)
+        if masked and re.search(r"aadhaar|unique\s+identification", text, re.IGNORECASE):
+            doc_type, number = "Aadhaar Card", masked.group(0)
+        else:
+            doc_type, number = None, None
+
+    fields = dict.fromkeys(COMMON_FIELDS + EXTRA_FIELDS.get(doc_type, []))
+    fields["DocumentType"] = doc_type
+    fields["DocumentNumber"] = number
+
+    for key, pattern in _LABELLED_DATES.items():
+        fields[key] = _first(pattern, text)
+    if fields["DateOfBirth"] is None:
+        fields["DateOfBirth"] = _first(_YEAR_OF_BIRTH, text)
+    valid_range = _VALID_RANGE.search(text)
+    if valid_range:
+        fields["IssueDate"] = fields["IssueDate"] or valid_range.group(1)
+        fields["ExpiryDate"] = fields["ExpiryDate"] or valid_range.group(2)
+
+    for key, pattern in _LABELLED_TEXT.items():
+        if key in fields or key in ("Name", "Address"):
+            fields[key] = _first(pattern, text)
+
+    if re.search(r"unique\s+identification\s+authority", text, re.IGNORECASE):
+        fields["IssuedBy"] = "Unique Identification Authority of India"
+    elif re.search(r"income\s+tax\s+department", text, re.IGNORECASE):
+        fields["IssuedBy"] = "Income Tax Department, Government of India"
+
+    if doc_type == "Aadhaar Card":
+        fields["AadhaarNumber"] = number
+        gender = _first(_GENDER, text)
+        fields["Gender"] = {"पुरुष": "Male", "महिला": "Female"}.get(gender, gender.title() if gender else None)
+    elif doc_type == "PAN Card":
+        fields["PANNumber"] = number
+    elif doc_type == "Passport":
+        fields["FatherName"] = fields["Father's Name"]
+        fields["MotherName"] = fields["Mother's Name"]
+
+    return fields, doc_type
+
+
+def unresolved_fields(fields):
+    return [key for key, value in fields.items() if value is None]
@@ -0,0 +1,183 @@
+import json
+from bisect import bisect_right
+
+
+class _Frame:
+    __slots__ = ("kind", "open_end", "last_end", "key", "key_start", "index", "value_start", "scalar", "expect_key")
+
+    def __init__(self, kind, open_end):
+        self.kind = kind
+        self.open_end = open_end
+        self.last_end = open_end      # end of the last completed child (truncation repair cuts here)
+        self.key = None
+        self.key_start = None
+        self.index = 0
+        self.value_start = None
+        self.scalar = False
+        self.expect_key = kind == "{"
+
+    def component(self):
+        return self.key if self.kind == "{" else self.index
+
+
+class StreamingJSONParser:
+    """
+    Incremental parser for streamed LLM JSON answers.
+
+    feed(chunk) returns the (path, value) pairs completed by that chunk: array items and object
+    fields are emitted as soon as they close, for containers up to `emit_depth` levels deep
+    (1 = items/fields of the top-level value). Markdown fences and prose around the JSON are
+    skipped on the fly. close() returns the whole value, repairing a truncated stream by
+    closing the open string and containers and dropping a dangling partial token.
+
+    Chunks are kept as a list and sliced once per emitted value, so work is linear in the
+    length of the answer.
+    """
+
+    def __init__(self, emit_depth=1):
+        self.emit_depth = emit_depth
+        self._parts = []
+        self._starts = []
+        self._length = 0
+        self._stack = []
+        self._root_start = None
+        self._root_end = None
+        self._in_string = False
+        self._escape = False
+        self._string_is_key = False
+
+    @property
+    def done(self):
+        return self._root_end is not None
+
+    def feed(self, chunk):
+        if not chunk or self.done:
+            return []
+        base = self._length
+        self._starts.append(base)
+        self._parts.append(chunk)
+        self._length += len(chunk)
+
+        events = []
+        for i, c in enumerate(chunk):
+            pos = base + i
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    self._end_string(pos + 1, events)
+                continue
+            if not self._stack:
+                if c in "{[":
+                    self._root_start = pos
+                    self._stack.append(_Frame(c, pos + 1))
+                continue
+            top = self._stack[-1]
+            if c == '"':
+                self._in_string = True
+                self._string_is_key = top.expect_key
+                if top.expect_key:
+                    top.key_start = pos
+                else:
+                    top.value_start = pos
+            elif c in "{[":
+                top.value_start = pos
+                self._stack.append(_Frame(c, pos + 1))
+            elif c in "}]":
+                self._end_scalar(pos, events)
+                self._stack.pop()
+                if not self._stack:
+                    self._root_end = pos + 1
+                    break
+                self._complete(pos + 1, events)
+            elif c == ",":
+                self._end_scalar(pos, events)
+                if top.kind == "{":
+                    top.expect_key = True
+            elif c == ":":
+                top.expect_key = False
+            elif not c.isspace() and top.value_start is None:
+                top.value_start = pos
+                top.scalar = True
+        return events
+
+    def _slice(self, start, end):
+        first = bisect_right(self._starts, start) - 1
+        last = bisect_right(self._starts, end - 1) - 1
+        pieces = self._parts[first:last + 1]
+        offset = self._starts[first]
+        if len(pieces) == 1:
+            return pieces[0][start - offset:end - offset]
+        pieces[0] = pieces[0][start - offset:]
+        pieces[-1] = pieces[-1][:end - self._starts[last]]
+        return "".join(pieces)
+
+    def _end_string(self, end, events):
+        top = self._stack[-1]
+        if self._string_is_key:
+            top.key = json.loads(self._slice(top.key_start, end))
+            top.key_start = None
+        else:
+            self._complete(end, events)
+
+    def _end_scalar(self, pos, events):
+        top = self._stack[-1]
+        if top.scalar and top.value_start is not None:
+            self._complete(pos, events)
+
+    def _complete(self, end, events):
+        """The current child of the top frame ends at `end`."""
+        top = self._stack[-1]
+        if top.value_start is not None and len(self._stack) <= self.emit_depth:
+            path = tuple(frame.component() for frame in self._stack)
+            try:
+                events.append((path, json.loads(self._slice(top.value_start, end))))
+            except ValueError:
+                pass
+        top.last_end = end
+        top.value_start = None
+        top.scalar = False
+        if top.kind == "[":
+            top.index += 1
+
+    def close(self, default=None):
+        """The parsed value; a truncated answer is repaired, anything unparseable gives `default`."""
+        if self._root_start is None:
+            return default
+        if self.done:
+            text = self._slice(self._root_start, self._root_end)
+        else:
+            text = self._repair()
+        try:
+            return json.loads(text)
+        except ValueError:
+            return default
+
+    def _repair(self):
+        top = self._stack[-1]
+        if self._in_string and not self._string_is_key:
+            # Keep the partial string value (e.g. a long explanation cut off mid-sentence)
+            text = self._slice(self._root_start, self._length - (1 if self._escape else 0)) + '"'
+        else:
+            text = self._slice(self._root_start, top.last_end)
+        text = text.rstrip().rstrip(",")
+        closing = "".join("}" if frame.kind == "{" else "]" for frame in reversed(self._stack))
+        return text + closing
+
+
+def parse_stream(chunks, default=None):
+    """Parse an iterable of streamed chunks (or a single string) into one value, repairing truncation."""
+    parser = StreamingJSONParser()
+    for chunk in ([chunks] if isinstance(chunks, str) else chunks):
+        parser.feed(chunk)
+    return parser.close(default)
+
+
+def iter_json_items(stream, emit_depth=1):
+    """Yield (path, value) for each array item / object field as soon as it closes in the stream."""
+    parser = StreamingJSONParser(emit_depth)
+    for chunk in stream:
+        yield from parser.feed(chunk)
@@ -0,0 +1,49 @@
+import json
+import re
+
+from helpers.json_stream import parse_stream
+
+
+def strip_fences(text):
+    """Remove markdown code fences (```json ... ```) around an LLM answer."""
+    cleaned = re.sub(r"^```[a-zA-Z]*\n?", "", text.strip())
+    return re.sub(r"```$", "", cleaned.strip()).strip()
+
+
+def loads_lenient(text, default=None):
+    """
+    json.loads for LLM output: tolerates markdown fences, leading/trailing prose and truncated
+    answers (via the streaming parser's repair), then falls back to the first {...} or [...]
+    block. Returns `default` when nothing parses.
+    """
+    if not isinstance(text, str):
+        return text
+    cleaned = strip_fences(text)
+    try:
+        return json.loads(cleaned)
+    except Exception:
+        pass
+    if cleaned[:1] in ("{", "["):
+        data = parse_stream(cleaned)
+        if data is not None:
+            return data
+    match = re.search(r"(\{.*\}|\[.*\])", cleaned, re.DOTALL)
+    if match:
+        try:
+            return json.loads(match.group(1))
+        except Exception:
+            pass
+    return default
+
+
+def as_json(raw):
+    """
+    Merged-stage output as a Python value: dicts/lists of values pass through, a JSON string or a
+    list of streamed chunks is parsed (truncation repaired); unparseable text is kept as raw_text.
+    """
+    if isinstance(raw, str):
+        raw = [raw]
+    elif not (isinstance(raw, list) and raw and all(isinstance(part, str) for part in raw)):
+        return raw
+    data = loads_lenient("".join(raw))
+    return data if data is not None else {"raw_text": strip_fences("".join(raw))}
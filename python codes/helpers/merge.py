@@ -0,0 +1,138 @@
+import re
+
+from helpers.json_utils import loads_lenient
+
+MOST_COMPLETE = "most_complete"
+UNION = "union"
+FIRST = "first"
+
+MISSING = {"", "not available", "n/a", "na", "none", "null", "unknown", "not mentioned", "not specified", "-"}
+
+_VALID_RANGE = re.compile(
+    r"(?:valid(?:ity)?\s+)?from\s+(.+?)\s+(?:to|till|until|upto|up to)\s+(.+?)(?:[.;,]|$)", re.IGNORECASE
+)
+
+
+def is_missing(value):
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return value.strip().lower() in MISSING
+    if isinstance(value, (list, dict)):
+        return all(is_missing(v) for v in (value.values() if isinstance(value, dict) else value))
+    return False
+
+
+def _norm(value):
+    return re.sub(r"[\W_]+", " ", str(value)).strip().lower()
+
+
+def _key(key):
+    return re.sub(r"[\W_]+", "", key).lower()
+
+
+def _as_record(record):
+    """Clause-level outputs come as dicts, JSON strings or {"clause", "attributes": <json>} wrappers."""
+    if isinstance(record, dict) and "attributes" in record:
+        record = record["attributes"]
+    if isinstance(record, list):
+        record = "".join(record)
+    data = loads_lenient(record, {})
+    return data if isinstance(data, dict) else {}
+
+
+def _validity_range(records):
+    """First "Valid from X to Y" found in any string value, as (X, Y)."""
+    for record in records:
+        for value in record.values():
+            if isinstance(value, str):
+                match = _VALID_RANGE.search(value)
+                if match:
+                    return match.group(1).strip(), match.group(2).strip()
+    return None
+
+
+def _most_complete(values):
+    """
+    Pick the value that carries the most information. Values that are contained in another
+    (e.g. "R. Sharma" vs "R. Sharma, Pune") are not conflicts; genuinely different ones are.
+    """
+    distinct = {}
+    for value in values:
+        distinct.setdefault(_norm(value), value)
+    ranked = sorted(distinct, key=len, reverse=True)
+    best = ranked[0]
+    conflicting = [distinct[n] for n in ranked[1:] if n not in best]
+    return distinct[best], ([distinct[best]] + conflicting if conflicting else [])
+
+
+def _union(values):
+    merged = {}
+    for value in values:
+        for item in (value if isinstance(value, list) else [value]):
+            if not is_missing(item):
+                merged.setdefault(_norm(item), item)
+    return list(merged.values())
+
+
+def merge_records(records, strategies=None, default=MOST_COMPLETE, date_range=("IssueDate", "ExpiryDate")):
+    """
+    Merge clause-level attribute dicts into one document-level dict without an LLM call.
+
+    strategies maps a key to MOST_COMPLETE, UNION or FIRST; other keys use `default`, except
+    that values which are lists anywhere are unioned. Missing values ("Not available", null, ...)
+    are dropped; "Valid from X to Y" fills the `date_range` keys when they are otherwise empty.
+
+    Returns (merged, conflicts) where conflicts is a list of {"key", "values"} for keys whose
+    candidate values disagree; merged holds the most complete candidate for those keys.
+    """
+    strategies = {_key(k): v for k, v in (strategies or {}).items()}
+    records = [_as_record(r) for r in records]
+
+    names, candidates = {}, {}
+    for record in records:
+        for key, value in record.items():
+            if is_missing(value):
+                continue
+            k = _key(key)
+            names.setdefault(k, key)
+            candidates.setdefault(k, []).append(value)
+
+    merged, conflicts = {}, []
+    for k, values in candidates.items():
+        strategy = strategies.get(k, default)
+        if strategy == UNION or any(isinstance(v, list) for v in values):
+            merged[names[k]] = _union(values)
+        elif any(isinstance(v, dict) for v in values):
+            nested, nested_conflicts = merge_records([v for v in values if isinstance(v, dict)], strategies, default, None)
+            merged[names[k]] = nested
+            conflicts.extend({"key": f"{names[k]}.{c['key']}", "values": c["values"]} for c in nested_conflicts)
+        elif strategy == FIRST:
+            merged[names[k]] = values[0]
+        else:
+            merged[names[k]], disagreeing = _most_complete(values)
+            if disagreeing:
+                conflicts.append({"key": names[k], "values": disagreeing})
+
+    if date_range:
+        validity = _validity_range(records)
+        if validity:
+            for key, value in zip(date_range, validity):
+                if is_missing(merged.get(key)):
+                    merged[key] = value
+    return merged, conflicts
+
+
+def apply_resolutions(merged, conflicts, resolved):
+    """Overwrite conflicting keys with the values an LLM (or user) chose; nested keys use "a.b"."""
+    for conflict in conflicts:
+        value = (resolved or {}).get(conflict["key"])
+        if is_missing(value):
+            continue
+        target, *path = conflict["key"].split(".")
+        if path:
+            merged.setdefault(target, {})[path[-1]] = value
+        else:
+            merged[target] = value
+    return merged
+
@@ -0,0 +1,65 @@
+SUMMARY = "summary"
+CLAUSES = "clauses"
+ATTRIBUTES = "attributes"
+EXPLANATIONS = "explanations"
+DATES = "dates"
+OVERVIEW = "overview"
+
+OUTPUTS = (SUMMARY, CLAUSES, ATTRIBUTES, EXPLANATIONS, DATES, OVERVIEW)
+
+
+class OutputPlan:
+    """
+    Demand-driven execution for a workflow call.
+
+    stages maps every stage of the workflow to the outputs it feeds, directly or through a later
+    stage (e.g. clause extraction feeds everything, the explain stage feeds explanations and the
+    summary built from them). A stage none of whose outputs were requested is skipped.
+    """
+
+    def __init__(self, workflow, stages, requested):
+        known = set().union(*stages.values())
+        requested = [requested] if isinstance(requested, str) else list(requested)
+        unknown = [o for o in requested if o not in known]
+        if unknown:
+            raise ValueError(f"{workflow} cannot produce {unknown}; available outputs: {sorted(known)}")
+        self.workflow = workflow
+        self.requested = requested
+        self.skipped = [stage for stage, feeds in stages.items() if not feeds & set(requested)]
+
+    def needs(self, stage):
+        return stage not in self.skipped
+
+    def report(self, sink):
+        if self.skipped:
+            sink.stage_finished("plan", f"Skipping stages not needed for {self.requested}: {self.skipped}",
+                                outputs=self.requested, skipped_stages=self.skipped)
+
+    def result(self, **values):
+        """
+        The requested outputs, plus which stages were skipped for them. Workflows pass JSON
+        answers through helpers.schemas.typed first, so structured outputs come back as objects.
+        """
+        result = {output: values.get(output) for output in self.requested}
+        result["skipped_stages"] = list(self.skipped)
+        return result
+
+
+def extract_dates(doc_text):
+    """Future dates with their context sentence, for the DATES output (calendar_ is imported only when asked)."""
+    from calendar_.calender import extract_future_dates_with_context
+    return extract_future_dates_with_context(doc_text)
+
+
+def document_overview(chunks, max_concurrency=None):
+    """
+    Whole-document overview for the OVERVIEW output: the root of the document's SummaryTree and
+    its main parts. Nodes are cached by content, so a tree already built for the same text (by a
+    comparison or another workflow) is reused.
+    """
+    from helpers.executor import DEFAULT_MAX_CONCURRENCY
+    from helpers.summary_tree import SummaryTree
+
+    tree = SummaryTree(chunks, max_concurrency=max_concurrency or DEFAULT_MAX_CONCURRENCY)
+    parts = [tree.levels[-2][k]["summary"] for k in tree.levels[-1][0]["children"]] if len(tree.levels) > 1 else []
+    return {"summary": tree.root, "parts": parts, "tree": tree.stats()}
@@ -0,0 +1,143 @@
+import json
+import re
+import threading
+
+from helpers.merge import is_missing
+
+_CAPITALS = re.compile(r"[A-Z]")
+
+
+def prune(value, max_chars=None):
+    """Drop None/empty/"Not available" fields, unwrap JSON-in-a-string and optionally cap long strings."""
+    if isinstance(value, str):
+        text = value.strip()
+        if text[:1] in "{[":
+            try:
+                return prune(json.loads(text), max_chars)
+            except ValueError:
+                pass
+        return text if max_chars is None or len(text) <= max_chars else text[:max_chars].rstrip() + "…"
+    if isinstance(value, dict):
+        pruned = {k: prune(v, max_chars) for k, v in value.items() if not is_missing(v)}
+        return {k: v for k, v in pruned.items() if not is_missing(v)}
+    if isinstance(value, (list, tuple)):
+        return [p for p in (prune(v, max_chars) for v in value if not is_missing(v)) if not is_missing(p)]
+    if hasattr(value, "model_dump"):
+        return prune(value.model_dump(), max_chars)
+    return value
+
+
+def serialize(value):
+    """Canonical minimal JSON: sorted keys, no indentation or spaces after separators, non-ASCII kept."""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), sort_keys=True, default=str)
+
+
+def _key_counts(value, counts):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            counts[key] = counts.get(key, 0) + 1
+            _key_counts(item, counts)
+    elif isinstance(value, list):
+        for item in value:
+            _key_counts(item, counts)
+    return counts
+
+
+def _alias(key, taken):
+    """PunishmentDetails -> PD, Explanation -> Exp, attributes -> att; digits are appended on collisions."""
+    capitals = "".join(_CAPITALS.findall(key))
+    base = capitals if len(capitals) >= 2 else key[:3]
+    alias, n = base, 1
+    while alias in taken:
+        n += 1
+        alias = f"{base}{n}"
+    return alias
+
+
+def _rename(value, aliases):
+    if isinstance(value, dict):
+        return {aliases.get(k, k): _rename(v, aliases) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_rename(v, aliases) for v in value]
+    return value
+
+
+def abbreviate_keys(value, min_length=8, min_uses=2):
+    """
+    Replace long keys that repeat across records with short aliases.
+    Returns (renamed value, legend line); the legend is empty when nothing was renamed.
+    """
+    counts = _key_counts(value, {})
+    taken = set(counts)
+    aliases = {}
+    for key in sorted(k for k, n in counts.items() if len(k) >= min_length and n >= min_uses):
+        aliases[key] = _alias(key, taken)
+        taken.add(aliases[key])
+    if not aliases:
+        return value, ""
+    legend = "Keys: " + ", ".join(f"{a}={k}" for k, a in sorted(aliases.items(), key=lambda kv: kv[1]))
+    return _rename(value, aliases), legend
+
+
+def to_prompt(value, label=None, abbreviate=False):
+    """
+    Structured data as it should be embedded in a prompt: pruned, canonical minified JSON.
+
+    Plain text (a clause) is returned unchanged. With abbreviate=True repeated long keys are
+    shortened behind a one-line legend, when that comes out shorter. With a label, the size
+    against the old indent=2 rendering is recorded in prompt_data_report.
+    """
+    if isinstance(value, str) and value.strip()[:1] not in "{[":
+        return value
+    pruned = prune(value)
+    text = serialize(pruned)
+    if abbreviate:
+        renamed, legend = abbreviate_keys(pruned)
+        if legend:
+            short = legend + "\n" + serialize(renamed)
+            text = short if len(short) < len(text) else text
+    if label:
+        prompt_data_report.record(label, value, text)
+    return text
+
+
+class PromptDataReport:
+    """Per-prompt token savings of the compact rendering over the previous indent=2 JSON one."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._prompts = {}
+
+    def record(self, label, value, text):
+        if isinstance(value, str):
+            before = value
+        else:
+            try:
+                before = json.dumps(value, indent=2, default=str)
+            except (TypeError, ValueError):
+                before = str(value)
+        with self._lock:
+            entry = self._prompts.setdefault(label, [0, 0, 0])
+            entry[0] += 1
+            entry[1] += (len(before) + 3) // 4  # same estimate as utils.estimate_tokens
+            entry[2] += (len(text) + 3) // 4
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                label: {
+                    "calls": calls,
+                    "before_tokens": before,
+                    "after_tokens": after,
+                    "saved_tokens": before - after,
+                    "saved_pct": round(100 * (before - after) / before, 1) if before else 0.0,
+                }
+                for label, (calls, before, after) in sorted(self._prompts.items())
+            }
+
+
+prompt_data_report = PromptDataReport()
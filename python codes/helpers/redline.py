@@ -0,0 +1,127 @@
+import re
+from bisect import bisect_left
+from difflib import SequenceMatcher
+
+UNCHANGED = "unchanged"
+MODIFIED = "modified"
+INSERTED = "inserted"
+DELETED = "deleted"
+
+# Sentences/clauses are separated by line breaks and by whitespace after "." or ";", except after
+# a one-letter abbreviation/list number ("i.e.", "1.") or before a number ("Rs. 500", "Sec. 420")
+# unless that number starts a list item
+_BOUNDARY = re.compile(r"(?<=[.;])(?<!\b\w[.;])\s+(?!\d)|(?<=[.;])\s+(?=\(?\d{1,3}[.)]\s)|\s*\n\s*")
+_NUMBERING = re.compile(r"^\s*(?:\(?\d{1,3}(?:\.\d{1,3})*[.)]|\(?[a-zA-Z][.)]|\(?[ivxlc]+[.)]|[-*•])\s+", re.IGNORECASE)
+_PUNCT = re.compile(r"[^\w\s]")
+_TOKEN = re.compile(r"\S+")
+
+
+def normalize_text(text):
+    """Comparison key: no list numbering, punctuation, case or whitespace differences."""
+    text = _NUMBERING.sub("", text)
+    return " ".join(_PUNCT.sub(" ", text.lower()).split())
+
+
+def sentence_spans(text):
+    """(start, end) of each non-empty sentence/clause of `text`, whitespace trimmed."""
+    spans, start = [], 0
+    for match in list(_BOUNDARY.finditer(text)) + [None]:
+        end = match.start() if match else len(text)
+        segment = text[start:end]
+        if normalize_text(segment):
+            lead = len(segment) - len(segment.lstrip())
+            spans.append((start + lead, start + len(segment.rstrip())))
+        if match:
+            start = match.end()
+    return spans
+
+
+def word_redline(old, new, old_offset=0, new_offset=0):
+    """
+    Word-level edits turning `old` into `new`: [{"op": "replace"|"delete"|"insert",
+    "doc1": [start, end], "doc2": [start, end], "old", "new"}], offsets shifted by the given bases.
+    """
+    old_tokens = [(m.start(), m.end()) for m in _TOKEN.finditer(old)]
+    new_tokens = [(m.start(), m.end()) for m in _TOKEN.finditer(new)]
+    matcher = SequenceMatcher(None, [normalize_text(old[s:e]) for s, e in old_tokens],
+                              [normalize_text(new[s:e]) for s, e in new_tokens], autojunk=False)
+    edits = []
+    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+        if op == "equal":
+            continue
+        a = (old_tokens[i1][0], old_tokens[i2 - 1][1]) if i2 > i1 else (old_tokens[i1][0] if i1 < len(old_tokens) else len(old),) * 2
+        b = (new_tokens[j1][0], new_tokens[j2 - 1][1]) if j2 > j1 else (new_tokens[j1][0] if j1 < len(new_tokens) else len(new),) * 2
+        edits.append({
+            "op": op,
+            "doc1": [a[0] + old_offset, a[1] + old_offset],
+            "doc2": [b[0] + new_offset, b[1] + new_offset],
+            "old": old[a[0]:a[1]],
+            "new": new[b[0]:b[1]],
+        })
+    return edits
+
+
+def diff_texts(text1, text2):
+    """
+    Sentence-level diff of two aligned chunks (difflib over normalized sentences).
+
+    Returns {"status": unchanged|modified, "changes": [...]}; each change has "type"
+    (modified/inserted/deleted), "doc1"/"doc2" character spans within the chunks (None for the
+    missing side), the old/new text and, for modified sentences, a word-level "redline".
+    Formatting-only differences (numbering, punctuation, whitespace, case) count as unchanged.
+    """
+    spans1, spans2 = sentence_spans(text1), sentence_spans(text2)
+    matcher = SequenceMatcher(None, [normalize_text(text1[s:e]) for s, e in spans1],
+                              [normalize_text(text2[s:e]) for s, e in spans2], autojunk=False)
+    changes = []
+    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+        if op == "equal":
+            continue
+        span1 = [spans1[i1][0], spans1[i2 - 1][1]] if i2 > i1 else None
+        span2 = [spans2[j1][0], spans2[j2 - 1][1]] if j2 > j1 else None
+        old = text1[span1[0]:span1[1]] if span1 else ""
+        new = text2[span2[0]:span2[1]] if span2 else ""
+        change = {"type": {"replace": MODIFIED, "delete": DELETED, "insert": INSERTED}[op],
+                  "doc1": span1, "doc2": span2, "old": old, "new": new}
+        if op == "replace":
+            change["redline"] = word_redline(old, new, span1[0], span2[0])
+        changes.append(change)
+    return {"status": MODIFIED if changes else UNCHANGED, "changes": changes}
+
+
+def classify_alignment(chunks1, chunks2, alignment):
+    """
+    Every chunk of both documents as one section: aligned pairs diffed as unchanged/modified,
+    unaligned chunks as deleted (document 1 only) or inserted (document 2 only). In document order.
+    """
+    sections = []
+    for match in alignment["matches"]:
+        i, j = match["doc1_chunk"], match["doc2_chunk"]
+        diff = diff_texts(chunks1[i], chunks2[j])
+        sections.append({"doc1_chunk": i, "doc2_chunk": j, "similarity_score": match["similarity_score"], **diff})
+    for i in alignment["unmatched_doc1"]:
+        sections.append({"doc1_chunk": i, "doc2_chunk": None, "status": DELETED,
+                         "changes": [{"type": DELETED, "doc1": [0, len(chunks1[i])], "doc2": None, "old": chunks1[i], "new": ""}]})
+    for j in alignment["unmatched_doc2"]:
+        sections.append({"doc1_chunk": None, "doc2_chunk": j, "status": INSERTED,
+                         "changes": [{"type": INSERTED, "doc1": None, "doc2": [0, len(chunks2[j])], "old": "", "new": chunks2[j]}]})
+
+    matched1 = [m["doc1_chunk"] for m in alignment["matches"]]
+    matched2 = [m["doc2_chunk"] for m in alignment["matches"]]
+
+    def order(section):
+        # Deleted chunks sort just after the chunk of document 2 aligned with their predecessor
+        if section["doc2_chunk"] is not None:
+            return (section["doc2_chunk"], 0)
+        k = bisect_left(matched1, section["doc1_chunk"])
+        return (matched2[k - 1] if k else -1, 1)
+
+    return sorted(sections, key=order)
+
+
+def redline(sections):
+    """Flat redline: every change with the chunk indices its character offsets refer to."""
+    return [
+        {"doc1_chunk": s["doc1_chunk"], "doc2_chunk": s["doc2_chunk"], **change}
+        for s in sections for change in s["changes"]
+    ]
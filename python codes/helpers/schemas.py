@@ -0,0 +1,401 @@
+"""
+Response schemas for every prompt that asks the model for JSON.
+
+Models are passed as `response_schema` to utils.call_gemini / call_gemini1, which makes Gemini
+answer with schema-conformant JSON (and the fake backend do the same), and are used to turn
+the answer into typed objects. Summaries and document-level explanations are prose and have no schema. Keys
+with spaces or slashes ("Mother's Name") are plain field names in the response schema and only
+come back when dumping with `model_dump(by_alias=True)` / to_jsonable; either form validates.
+"""
+import json
+import typing
+from typing import List, Optional
+
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, TypeAdapter, ValidationError
+
+from helpers.json_utils import loads_lenient
+
+
+class Schema(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+
+def _dumped_as(name, key):
+    """Optional field named `name` in the response schema, dumped (and also accepted) as `key`."""
+    return Field(None, validation_alias=AliasChoices(name, key), serialization_alias=key)
+
+
+# --- shared ---------------------------------------------------------------------------------
+
+class DocumentTypePrediction(Schema):
+    PredictedDocumentType: str
+    Confidence: Optional[str] = None
+    Rationale: Optional[str] = None
+
+
+class ClauseExplanation(Schema):
+    Explanation: str
+    Significance: Optional[str] = None
+
+
+# --- litigation -----------------------------------------------------------------------------
+
+class CriminalAttributes(Schema):
+    OffenseType: Optional[str] = None
+    ProcedureStep: Optional[str] = None
+    Punishment: Optional[str] = None
+    RightsProtections: Optional[str] = None
+    Authority: Optional[str] = None
+    OtherNotes: Optional[str] = None
+
+
+class CriminalExplanation(Schema):
+    Explanation: str
+    PunishmentDetails: Optional[str] = None
+    Cognizable: Optional[bool] = None
+    Bailable: Optional[bool] = None
+
+
+class FusedCriminalClause(Schema):
+    # Parts the fused call was not asked for (helpers.fused.fused_parts) stay null
+    Index: int
+    SubCategory: Optional[str] = None
+    Attributes: Optional[CriminalAttributes] = None
+    Explanation: Optional[str] = None
+    PunishmentDetails: Optional[str] = None
+
+
+class CaseDetails(Schema):
+    Complainant: Optional[str] = None
+    Investigator: Optional[str] = None
+    Court: Optional[str] = None
+    Section: Optional[str] = None
+    DateTime: Optional[str] = None
+    Punishment: Optional[str] = None
+    OtherNotes: Optional[str] = None
+
+
+# --- contracts ------------------------------------------------------------------------------
+
+class ContractAttributes(Schema):
+    Parties: Optional[str] = None
+    Scope: Optional[str] = None
+    FinancialTerms: Optional[str] = None
+    Obligations: Optional[str] = None
+    Confidentiality: Optional[str] = None
+    IP_Rights: Optional[str] = None
+    TerminationConditions: Optional[str] = None
+    RiskRestrictions: Optional[str] = None
+    DisputeResolution: Optional[str] = None
+    Boilerplate: Optional[str] = None
+    OtherNotes: Optional[str] = None
+
+
+class ContractExplanation(Schema):
+    Explanation: str
+    PracticalEffect: Optional[str] = None
+
+
+class FusedContractClause(Schema):
+    Index: int
+    SubCategory: Optional[str] = None
+    Attributes: Optional[ContractAttributes] = None
+    Explanation: Optional[str] = None
+    PracticalEffect: Optional[str] = None
+
+
+# --- personal -------------------------------------------------------------------------------
+
+class PersonalAttributes(Schema):
+    Name: Optional[str] = None
+    DateOfBirth: Optional[str] = None
+    DocumentType: Optional[str] = None
+    DocumentNumber: Optional[str] = None
+    IssuedBy: Optional[str] = None
+    IssueDate: Optional[str] = None
+    ExpiryDate: Optional[str] = None
+    Address: Optional[str] = None
+    MothersName: Optional[str] = _dumped_as("MothersName", "Mother's Name")
+    FathersName: Optional[str] = _dumped_as("FathersName", "Father's Name")
+    Gender: Optional[str] = None
+    AadhaarNumber: Optional[str] = None
+    PANNumber: Optional[str] = None
+    Nationality: Optional[str] = None
+    PlaceOfBirth: Optional[str] = None
+    VehicleType: Optional[str] = None
+    LicenseClass: Optional[str] = None
+    BloodGroup: Optional[str] = None
+    GunType: Optional[str] = None
+    Caliber: Optional[str] = None
+    Restrictions: Optional[str] = None
+
+
+# --- corporate / government -----------------------------------------------------------------
+
+class CorporateAttributes(Schema):
+    CompanyName: Optional[str] = None
+    CIN: Optional[str] = None
+    DocumentType: Optional[str] = None
+    DocumentNumber: Optional[str] = None
+    RegisteredAddress: Optional[str] = None
+    ResolutionDate: Optional[str] = None
+    MeetingType: Optional[str] = None
+    FilingAuthority: Optional[str] = None
+    Directors: Optional[List[str]] = None
+    ResolutionText: Optional[str] = None
+    PersonName: Optional[str] = None
+    Designation: Optional[str] = None
+    EffectiveDate: Optional[str] = None
+    FormType: Optional[str] = None
+    OtherNotes: Optional[str] = None
+
+
+class GovernmentAttributes(Schema):
+    IssuingAuthority: Optional[str] = None
+    DocumentType: Optional[str] = None
+    DocumentNumber: Optional[str] = None
+    PublicationDate: Optional[str] = None
+    EffectiveDate: Optional[str] = None
+    Jurisdiction: Optional[str] = None
+    Beneficiaries: Optional[List[str]] = None
+    Requirements: Optional[List[str]] = None
+    Deadlines: Optional[List[str]] = None
+    Penalties: Optional[List[str]] = None
+    OtherNotes: Optional[str] = None
+
+
+# --- property -------------------------------------------------------------------------------
+
+class PartiesInfo(Schema):
+    buyer_name: Optional[str] = None
+    seller_name: Optional[str] = None
+    addresses: Optional[str] = None
+
+
+class PropertyInfo(Schema):
+    property_location: Optional[str] = None
+    property_size: Optional[str] = None
+
+
+class PropertyFinancialTerms(Schema):
+    total_amount: Optional[str] = None
+    advance_amount: Optional[str] = None
+    installment_details: Optional[str] = None
+    stamp_duty_responsibility: Optional[str] = None
+
+
+class PropertyDeadlines(Schema):
+    possession_date: Optional[str] = None
+    payment_deadline: Optional[str] = None
+    lease_start_date: Optional[str] = None
+    lease_end_date: Optional[str] = None
+    termination_conditions: Optional[str] = None
+
+
+class PropertyAttributes(Schema):
+    BuyerSellerInfo: Optional[PartiesInfo] = None
+    PropertyDetails: Optional[PropertyInfo] = None
+    FinancialTerms: Optional[PropertyFinancialTerms] = None
+    Deadlines: Optional[PropertyDeadlines] = None
+    OtherNotes: Optional[str] = None
+
+
+# --- regulatory -----------------------------------------------------------------------------
+
+class RegulatoryAttributes(Schema):
+    IssuedTo: Optional[str] = None
+    DocumentNumber: Optional[str] = None
+    Purpose: Optional[str] = None
+    ActionsRequired: Optional[str] = None
+    OperationalRequirements: Optional[str] = _dumped_as("OperationalRequirements", "Operational Requirements / Facility Management")
+    ReportingAudits: Optional[str] = _dumped_as("ReportingAudits", "Reporting / Audits / Documentation")
+    DeadlinesValidity: Optional[str] = _dumped_as("DeadlinesValidity", "Deadlines / Validity")
+    NonCompliancePenalties: Optional[str] = _dumped_as("NonCompliancePenalties", "Deviation / Non-Compliance / Penalties")
+    HealthSafety: Optional[str] = _dumped_as("HealthSafety", "Health & Safety / Risk Management")
+    EnvironmentalCompliance: Optional[str] = _dumped_as("EnvironmentalCompliance", "Environmental Compliance")
+    OtherNotes: Optional[str] = None
+
+
+# --- calendar -------------------------------------------------------------------------------
+
+class DateMention(Schema):
+    date: str
+    context: str
+
+
+# --- document comparison --------------------------------------------------------------------
+
+class DocumentSummary(Schema):
+    DocumentType: str
+    MainPurpose: str
+    KeySections: List[str] = []
+    CriticalElements: List[str] = []
+    LegalFramework: List[str] = []
+    DocumentStructure: Optional[str] = None
+    Tone: Optional[str] = None
+    Scope: Optional[str] = None
+
+
+class EvolutionSection(Schema):
+    StructuralChanges: Optional[str] = None
+    ScopeChanges: Optional[str] = None
+    ToneChanges: Optional[str] = None
+    PurposeEvolution: Optional[str] = None
+
+
+class ImpactSection(Schema):
+    LegalSignificance: Optional[str] = None
+    PracticalImplications: Optional[str] = None
+    ComplianceImpact: Optional[str] = None
+
+
+class HolisticComparison(Schema):
+    OverallRelationship: str
+    DocumentEvolution: EvolutionSection = EvolutionSection()
+    StrategicDifferences: List[str] = []
+    ContinuityElements: List[str] = []
+    DocumentWideImpact: ImpactSection = ImpactSection()
+    HolisticInsights: List[str] = []
+
+
+class ChunkMetadata(Schema):
+    ChunkType: str
+    KeyTerms: List[str] = []
+    Summary: str
+
+
+class ChunkComparison(Schema):
+    differences: List[str] = []
+    similarities: List[str] = []
+    impact: Optional[str] = None
+    change_type: Optional[str] = None
+
+
+class ExecutiveSection(Schema):
+    DocumentRelationship: Optional[str] = None
+    MajorChanges: List[str] = []
+    BusinessImpact: Optional[str] = None
+    LegalImplications: Optional[str] = None
+
+
+class DetailedSection(Schema):
+    StructuralComparison: Optional[str] = None
+    ContentComparison: Optional[str] = None
+    SectionBySection: List[str] = []
+    CriticalModifications: List[str] = []
+
+
+class HybridSection(Schema):
+    HolisticFindings: List[str] = []
+    GranularFindings: List[str] = []
+    ComplementaryInsights: List[str] = []
+
+
+class RecommendationSection(Schema):
+    ImmediateActions: List[str] = []
+    ComplianceConsiderations: List[str] = []
+    ReviewPriorities: List[str] = []
+
+
+class HybridSynthesis(Schema):
+    ExecutiveInsights: ExecutiveSection
+    DetailedAnalysis: DetailedSection = DetailedSection()
+    HybridInsights: HybridSection = HybridSection()
+    Recommendations: RecommendationSection = RecommendationSection()
+
+
+# Prompt family -> response schema
+REGISTRY = {
+    "document_type": DocumentTypePrediction,
+    "clause_explanation": ClauseExplanation,
+    "litigation.attributes": CriminalAttributes,
+    "litigation.explanation": CriminalExplanation,
+    "litigation.fused": list[FusedCriminalClause],
+    "litigation.case_details": CaseDetails,
+    "contracts.attributes": ContractAttributes,
+    "contracts.explanation": ContractExplanation,
+    "contracts.fused": list[FusedContractClause],
+    "personal.attributes": PersonalAttributes,
+    "corporate.attributes": CorporateAttributes,
+    "government.attributes": GovernmentAttributes,
+    "property.attributes": PropertyAttributes,
+    "regulatory.attributes": RegulatoryAttributes,
+    "calendar.dates": list[DateMention],
+    "comparison.summary": DocumentSummary,
+    "comparison.holistic": HolisticComparison,
+    "comparison.chunk_metadata": ChunkMetadata,
+    "comparison.chunk_pair": ChunkComparison,
+    "comparison.synthesis": HybridSynthesis,
+}
+
+_adapters = {}
+
+
+def _adapter(schema):
+    key = repr(schema)
+    if key not in _adapters:
+        _adapters[key] = TypeAdapter(schema)
+    return _adapters[key]
+
+
+def parse_as(schema, text):
+    """Validate a JSON answer against `schema`; returns the typed object, or None if it does not conform."""
+    data = loads_lenient(text)
+    if data is None:
+        return None
+    try:
+        return _adapter(schema).validate_python(data)
+    except ValidationError:
+        return None
+
+
+def typed(schema, value, key="attributes"):
+    """
+    A workflow output with its JSON answers as typed objects: JSON text, {"clause", key: <json>}
+    wrappers and lists of either are validated against `schema` (schema None: parsed, not validated).
+    Answers that do not conform are counted as parse failures and kept as text.
+    """
+    if isinstance(value, list):
+        return [typed(schema, v, key) for v in value]
+    if isinstance(value, dict) and isinstance(value.get(key), str):
+        return {**value, key: typed(schema, value[key], key)}
+    if not isinstance(value, str):
+        return value
+    result = loads_lenient(value) if schema is None else parse_as(schema, value)
+    if result is None:
+        from utils import llm_usage
+        llm_usage.record_parse_failure()
+        return value
+    return result
+
+
+def to_jsonable(value):
+    """Typed objects (also inside lists and dicts) -> plain dicts/lists with the prompt's original keys."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(by_alias=True)
+    if isinstance(value, list):
+        return [to_jsonable(v) for v in value]
+    if isinstance(value, dict):
+        return {k: to_jsonable(v) for k, v in value.items()}
+    return value
+
+
+def dump_json(value, indent=2):
+    return json.dumps(to_jsonable(value), indent=indent)
+
+
+def placeholder(schema):
+    """Smallest instance that satisfies `schema` (what a constrained decoder would be forced into)."""
+    origin = typing.get_origin(schema)
+    if origin in (list, List):
+        return []
+    if origin is typing.Union:
+        args = [a for a in typing.get_args(schema) if a is not type(None)]
+        return None if len(args) < len(typing.get_args(schema)) else placeholder(args[0])
+    if isinstance(schema, type) and issubclass(schema, BaseModel):
+        values = {}
+        for name, field in schema.model_fields.items():
+            if field.is_required():
+                values[name] = placeholder(field.annotation)
+        return schema.model_validate(values)
+    return {str: "", int: 0, float: 0.0, bool: False}.get(schema)
@@ -0,0 +1,260 @@
+import asyncio
+import functools
+import json
+import sys
+import threading
+import time
+
+STAGE_STARTED = "stage_started"
+TOKEN = "token"
+ITEM_COMPLETED = "item_completed"
+STAGE_FINISHED = "stage_finished"
+
+
+class SinkClosed(RuntimeError):
+    """Raised into the workflow when its consumer has gone away, so the remaining stages are not run."""
+
+
+class Sink:
+    """
+    Where a workflow reports progress. Four events: stage started, token (a streamed piece of
+    an LLM answer), item completed (one finished per-clause/per-chunk result) and stage finished.
+    Subclasses implement handle(event); event is a dict {"event", "stage", "ts", ...}.
+    Workflows call the helpers below and never print directly.
+    """
+
+    coalesce_chars = 0  # tap() batches streamed pieces into token events of at least this many chars
+
+    def __init__(self, **context):
+        self.context = context  # e.g. doc_id, added to every event
+
+    def handle(self, event):
+        raise NotImplementedError
+
+    def _send(self, kind, stage, **data):
+        self.handle({"event": kind, "stage": stage, "ts": time.time(), **self.context, **data})
+
+    def stage_started(self, stage, message=None, **data):
+        self._send(STAGE_STARTED, stage, message=message, **data)
+
+    def token(self, stage, text):
+        self._send(TOKEN, stage, text=text)
+
+    def item_completed(self, stage, item, **data):
+        self._send(ITEM_COMPLETED, stage, item=item, **data)
+
+    def stage_finished(self, stage, message=None, **data):
+        self._send(STAGE_FINISHED, stage, message=message, **data)
+
+    def tap(self, stage, stream):
+        """Pass a call_gemini1 stream through, reporting the pieces as token events."""
+        if not self.coalesce_chars:
+            for part in stream:
+                self.token(stage, part)
+                yield part
+            return
+        pending, size = [], 0
+        for part in stream:
+            pending.append(part)
+            size += len(part)
+            if size >= self.coalesce_chars:
+                self.token(stage, "".join(pending))
+                pending, size = [], 0
+            yield part
+        if pending:
+            self.token(stage, "".join(pending))
+
+    def stream(self, stage, stream):
+        """A whole streamed stage: started, tokens, finished. Returns the joined text."""
+        return "".join(self.stream_parts(stage, stream))
+
+    def stream_parts(self, stage, stream):
+        """Like stream(), but returns the streamed parts as a list, for workflows that return them."""
+        self.stage_started(stage)
+        parts = list(self.tap(stage, stream))
+        self.stage_finished(stage, chars=sum(len(part) for part in parts))
+        return parts
+
+    def collect(self, stage, stream):
+        """One concurrent per-item call: drained silently, reported once as a completed item."""
+        text = "".join(stream)
+        self.item_completed(stage, text)
+        return text
+
+    def close(self):
+        pass
+
+
+class NullSink(Sink):
+    """Discards everything; for batch jobs and benchmarks."""
+
+    def handle(self, event):
+        pass
+
+    def tap(self, stage, stream):
+        return stream
+
+    def stream(self, stage, stream):
+        return "".join(stream)
+
+    def stream_parts(self, stage, stream):
+        return list(stream)
+
+    def collect(self, stage, stream):
+        return "".join(stream)
+
+
+class TerminalSink(Sink):
+    """
+    The workflows' console output. Tokens are buffered and written in batches of at least
+    `flush_chars` characters (or after `flush_interval` seconds) instead of one flushed write
+    per token; writes from concurrent threads never interleave.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, out=None, flush_chars=256, flush_interval=0.1, **context):
+        super().__init__(**context)
+        self.out = out or sys.stdout
+        self.flush_chars = flush_chars
+        self.flush_interval = flush_interval
+        self._pending = []
+        self._pending_chars = 0
+        self._last_flush = time.monotonic()
+        self._mid_line = False  # streamed text not yet ended with a newline
+
+    def _write(self, text):
+        with self._lock:
+            self.out.write(text)
+            self.out.flush()
+
+    def _flush_tokens(self):
+        with self._lock:
+            if self._pending:
+                text = "".join(self._pending)
+                self.out.write(text)
+                self.out.flush()
+                self._mid_line = not text.endswith("\n")
+                self._pending, self._pending_chars = [], 0
+            self._last_flush = time.monotonic()
+
+    def token(self, stage, text):
+        with self._lock:
+            self._pending.append(text)
+            self._pending_chars += len(text)
+        if self._pending_chars >= self.flush_chars or time.monotonic() - self._last_flush >= self.flush_interval:
+            self._flush_tokens()
+
+    def handle(self, event):
+        if event["event"] == TOKEN:
+            return self.token(event["stage"], event["text"])
+        kind = event["event"]
+        self._flush_tokens()
+        if self._mid_line:
+            self._write("\n")
+            self._mid_line = False
+        if kind == ITEM_COMPLETED:
+            item = event["item"]
+            text = item if isinstance(item, str) else json.dumps(item, indent=2, default=str)
+            self._write(text if text.endswith("\n") else text + "\n")
+        elif event.get("message"):
+            self._write(("\n" if kind == STAGE_FINISHED else "") + event["message"] + "\n")
+
+    def close(self):
+        self._flush_tokens()
+
+
+class QueueSink(Sink):
+    """
+    Bounded asyncio queue for SSE/WebSocket handlers. The workflow runs in a worker thread
+    (e.g. loop.run_in_executor) and blocks once `maxsize` events are waiting, so a slow client
+    applies backpressure instead of growing memory. Consume with `async for event in sink`;
+    close() ends the iteration. Streamed pieces are batched into token events of at least
+    `coalesce_chars` characters.
+
+    When the client disconnects, call cancel() (leaving the `async for` early does it too); the
+    blocked workflow thread then gets SinkClosed instead of waiting forever. A client that stops
+    reading for `timeout` seconds is treated the same way.
+    """
+
+    _END = object()
+
+    def __init__(self, loop, maxsize=1024, coalesce_chars=64, timeout=60, **context):
+        super().__init__(**context)
+        self.loop = loop
+        self.coalesce_chars = coalesce_chars
+        self.timeout = timeout
+        self.queue = asyncio.Queue()
+        self._slots = threading.Semaphore(maxsize)
+        self._cancelled = threading.Event()
+
+    def handle(self, event):
+        deadline = time.monotonic() + self.timeout if self.timeout is not None else None
+        while not self._slots.acquire(timeout=0.1):
+            if self._cancelled.is_set():
+                raise SinkClosed("client disconnected")
+            if deadline is not None and time.monotonic() > deadline:
+                self.cancel()
+                raise SinkClosed(f"client stopped reading for {self.timeout}s")
+        if self._cancelled.is_set():
+            raise SinkClosed("client disconnected")
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, event)
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, self._END)
+
+    async def __aiter__(self):
+        try:
+            while True:
+                event = await self.queue.get()
+                if event is self._END:
+                    return
+                self._slots.release()
+                yield event
+        finally:
+            self.cancel()
+
+
+class NDJSONSink(Sink):
+    """
+    One JSON object per line, appended to `path` (buffered; flushed on close). Streamed pieces
+    are batched into token events of at least `coalesce_chars` characters.
+    """
+
+    def __init__(self, path, coalesce_chars=256, **context):
+        super().__init__(**context)
+        self.coalesce_chars = coalesce_chars
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def handle(self, event):
+        line = json.dumps(event, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            self._file.write(line)
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def resolve_sink(sink):
+    """Workflows default to console output, as before sinks existed."""
+    return sink if sink is not None else TerminalSink()
+
+
+def closes_sink(workflow):
+    """
+    For workflow entry points: resolves the `sink` keyword and closes the sink when the workflow
+    returns or fails (flushing files, ending a QueueSink's iteration). A sink serves one call.
+    """
+    @functools.wraps(workflow)
+    def run(*args, sink=None, **kwargs):
+        sink = resolve_sink(sink)
+        try:
+            return workflow(*args, sink=sink, **kwargs)
+        finally:
+            sink.close()
+    return run
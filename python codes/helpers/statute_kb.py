@@ -0,0 +1,124 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+SEED_PATH = os.path.join(_DATA_DIR, "statutes_seed.json")
+DEFAULT_DB_PATH = os.path.join(_DATA_DIR, "statutes.sqlite")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS sections (
+    citation    TEXT PRIMARY KEY,
+    title       TEXT,
+    explanation TEXT NOT NULL,
+    punishment  TEXT,
+    cognizable  INTEGER,
+    bailable    INTEGER,
+    source      TEXT NOT NULL,
+    kb_version  TEXT,
+    updated_at  REAL
+);
+"""
+
+
+def _flag(value):
+    return None if value is None else int(bool(value))
+
+
+class StatuteKB:
+    """
+    Local, versioned store of statute explanations keyed by canonical citation ("Section 420 IPC").
+
+    The curated seed (data/statutes_seed.json) is compiled into SQLite on first use and again
+    whenever its version changes; entries learned from the LLM (source='llm') survive rebuilds.
+    The database is `db_path`, else $STATUTE_KB_PATH, else data/statutes.sqlite. The table is small, so it is read into memory once and lookups are dictionary hits.
+    """
+
+    def __init__(self, db_path=None, seed_path=SEED_PATH):
+        self.db_path = db_path or os.getenv("STATUTE_KB_PATH", DEFAULT_DB_PATH)
+        self.seed_path = seed_path
+        self._lock = threading.Lock()
+        self._sync_seed()
+        self._entries = self._load()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path)
+
+    def _sync_seed(self):
+        with open(self.seed_path, encoding="utf-8") as f:
+            seed = json.load(f)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+            row = conn.execute("SELECT value FROM meta WHERE key = 'seed_version'").fetchone()
+            if row and row[0] == seed["version"]:
+                return
+            conn.execute("DELETE FROM sections WHERE source = 'seed'")
+            conn.executemany(
+                "INSERT OR REPLACE INTO sections VALUES (?, ?, ?, ?, ?, ?, 'seed', ?, ?)",
+                [
+                    (s["citation"], s.get("title"), s["explanation"], s.get("punishment"),
+                     _flag(s.get("cognizable")), _flag(s.get("bailable")), seed["version"], time.time())
+                    for s in seed["sections"]
+                ],
+            )
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('seed_version', ?)", (seed["version"],))
+
+    def _load(self):
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT citation, title, explanation, punishment, cognizable, bailable, source FROM sections"
+            ).fetchall()
+        return {
+            citation: {
+                "citation": citation, "title": title, "explanation": explanation, "punishment": punishment,
+                "cognizable": None if cognizable is None else bool(cognizable),
+                "bailable": None if bailable is None else bool(bailable),
+                "source": source
+            }
+            for citation, title, explanation, punishment, cognizable, bailable, source in rows
+        }
+
+    @property
+    def version(self):
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'seed_version'").fetchone()
+        return row[0] if row else None
+
+    def lookup(self, citation):
+        """Entry for a canonical citation; "Section 318(4) BNS" falls back to "Section 318 BNS"."""
+        entry = self._entries.get(citation)
+        if entry is None:
+            entry = self._entries.get(re.sub(r"\(.*?\)", "", citation))
+        return entry
+
+    def put(self, citation, explanation, punishment=None, cognizable=None, bailable=None, source="llm"):
+        """Store a learned explanation so the next document citing this section needs no LLM call."""
+        entry = {
+            "citation": citation, "title": None, "explanation": explanation, "punishment": punishment,
+            "cognizable": cognizable, "bailable": bailable, "source": source
+        }
+        with self._lock:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO sections VALUES (?, NULL, ?, ?, ?, ?, ?, NULL, ?)",
+                    (citation, explanation, punishment, _flag(cognizable), _flag(bailable), source, time.time()),
+                )
+            self._entries[citation] = entry
+        return entry
+
+
+_default_kb = None
+_default_lock = threading.Lock()
+
+
+def get_statute_kb():
+    """Process-wide knowledge base, opened on first use."""
+    global _default_kb
+    with _default_lock:
+        if _default_kb is None:
+            _default_kb = StatuteKB()
+        return _default_kb
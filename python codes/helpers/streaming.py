@@ -0,0 +1,90 @@
+import queue
+import threading
+
+_END = object()
+
+
+def iter_lines(stream):
+    """
+    Incrementally split a streamed LLM response (e.g. from call_gemini1) into lines.
+    Each non-empty line is yielded as soon as its newline arrives, without waiting
+    for the rest of the stream.
+    """
+    pending = []  # pieces of the current, still incomplete line
+    for part in stream:
+        if not part:
+            continue
+        if "\n" not in part:
+            pending.append(part)
+            continue
+
+        head, *middle, tail = part.split("\n")
+        pending.append(head)
+        for line in ["".join(pending)] + middle:
+            line = line.strip()
+            if line:
+                yield line
+        pending = [tail]
+
+    line = "".join(pending).strip()
+    if line:
+        yield line
+
+
+def prefetch(iterable, maxsize=8, poll=0.1):
+    """
+    Consume `iterable` on a background producer thread and hand items over through a
+    bounded queue. The producer keeps reading the stream while downstream stages work,
+    and blocks once `maxsize` items are waiting (backpressure).
+
+    When the consumer stops early (break, exception, or close() on this generator) the
+    producer notices within `poll` seconds, closes `iterable` and exits instead of
+    waiting on the full queue forever.
+    """
+    buffer = queue.Queue(maxsize=max(1, maxsize))
+    stop = threading.Event()
+    failure = []
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=poll)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put(item):
+                    break
+        except BaseException as exc:  # re-raised on the consumer side
+            failure.append(exc)
+        finally:
+            if stop.is_set() and hasattr(iterable, "close"):
+                iterable.close()
+            put(_END)
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+
+    try:
+        while True:
+            item = buffer.get()
+            if item is _END:
+                if failure:
+                    raise failure[0]
+                return
+            yield item
+    finally:
+        stop.set()
+
+
+def unique_everseen(iterable, seen=None):
+    """Yield items not seen before, preserving order. `seen` (a dict) doubles as the ordered result."""
+    seen = {} if seen is None else seen
+    for item in iterable:
+        if item not in seen:
+            seen[item] = None
+            yield item
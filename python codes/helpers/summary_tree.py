@@ -0,0 +1,131 @@
+import os
+import threading
+
+from helpers.artifacts import ArtifactCache, content_hash
+from helpers.executor import DEFAULT_MAX_CONCURRENCY, bounded_map
+
+DEFAULT_FANOUT = 4
+MAX_LEAF_CHARS = 6000
+
+LEAF_PROMPT = """
+Summarize this section of a legal document in 3-5 short bullet points for a reader who will
+not see the original: parties, obligations and rights, amounts, dates and deadlines,
+penalties, and any section or clause numbers. No preamble.
+
+Section:
+\"\"\"{text}\"\"\"
+"""
+
+MERGE_PROMPT = """
+These are summaries of consecutive sections of one legal document, in order. Merge them
+into one summary of 4-8 bullet points covering the whole span: keep every party, amount,
+date, deadline and clause number that matters, drop repetition. No preamble.
+
+{text}
+"""
+
+
+def summarize_section(text):
+    """LLM summary of one chunk (leaf of the tree)."""
+    from utils import call_gemini
+
+    return call_gemini(LEAF_PROMPT.format(text=text[:MAX_LEAF_CHARS]))
+
+
+def merge_summaries(summaries):
+    """LLM summary of consecutive section summaries (inner node of the tree)."""
+    from utils import call_gemini
+
+    return call_gemini(MERGE_PROMPT.format(text="\n\n".join(f"[{k + 1}]\n{s}" for k, s in enumerate(summaries))))
+
+
+def _groups(keys, fanout):
+    """
+    Content-defined grouping of one level: a group closes after a node whose key hashes to 0 mod
+    `fanout` (or at 2 * fanout nodes), so an edited or inserted section only moves the group
+    boundaries around it and the other groups keep their cached summaries.
+    """
+    groups, current = [], []
+    for k, key in enumerate(keys):
+        current.append(k)
+        if int(key[:8], 16) % fanout == 0 or len(current) >= 2 * fanout:
+            groups.append(current)
+            current = []
+    if current:
+        groups.append(current)
+    if len(groups) == len(keys) > 1:  # no reduction: fall back to fixed-size groups
+        groups = [list(range(k, min(k + fanout, len(keys)))) for k in range(0, len(keys), fanout)]
+    return groups
+
+
+class SummaryTree:
+    """
+    Hierarchical summary of a whole document: every chunk is summarized (in parallel), then
+    the summaries are merged level by level up to a single root.
+
+    Each node is cached in `cache` by the content hash of what it summarizes, so a tree is
+    shared by every caller that summarizes the same text (comparison, category workflows)
+    and a revision that edits one section recomputes only the path from that leaf to the
+    root (plus the neighbouring group when the edit moves a group boundary). levels[0] are the leaves and levels[-1] == [root]; each node is
+    {"key", "summary", "children"} with child indices into the level below.
+    """
+
+    def __init__(self, chunks, fanout=DEFAULT_FANOUT, max_concurrency=DEFAULT_MAX_CONCURRENCY, cache=None,
+                 summarize=summarize_section, merge=merge_summaries):
+        self.fanout = max(2, fanout)
+        self.max_concurrency = max_concurrency
+        self.cache = summary_cache if cache is None else cache
+        self.summarize = summarize
+        self.merge = merge
+        self.computed = 0  # summaries made by this build (cache misses)
+        self._lock = threading.Lock()
+        self.levels = self._build(list(chunks))
+
+    def _cached(self, key, factory):
+        def build():
+            with self._lock:
+                self.computed += 1
+            return factory()
+
+        return self.cache.get_or_create(key, build, keep=bool)  # empty (failed) summaries are retried
+
+    def _build(self, chunks):
+        if not chunks:
+            return [[{"key": content_hash([]), "summary": "", "children": []}]]
+
+        def leaf(chunk):
+            key = content_hash([chunk], node="leaf")
+            return {"key": key, "summary": self._cached(key, lambda: self.summarize(chunk)), "children": []}
+
+        def node(children):
+            if len(children) == 1:
+                return {**children[0], "children": [children[0]["index"]]}
+            key = content_hash([child["key"] for child in children], node="merge")
+            summary = self._cached(key, lambda: self.merge([child["summary"] for child in children]))
+            return {"key": key, "summary": summary, "children": [child["index"] for child in children]}
+
+        levels = [bounded_map(leaf, chunks, self.max_concurrency)]
+        while len(levels[-1]) > 1:
+            below = [{**n, "index": k} for k, n in enumerate(levels[-1])]
+            groups = _groups([n["key"] for n in below], self.fanout)
+            level = bounded_map(lambda group: node([below[k] for k in group]), groups, self.max_concurrency)
+            levels.append([{key: n[key] for key in ("key", "summary", "children")} for n in level])
+        return levels
+
+    @property
+    def root(self):
+        return self.levels[-1][0]["summary"]
+
+    def outline(self):
+        """Root summary followed by the summaries of the level below it (the document's main parts)."""
+        if len(self.levels) < 2:
+            return self.root
+        parts = [self.levels[-2][k]["summary"] for k in self.levels[-1][0]["children"]]
+        return self.root + "\n\nParts of the document, in order:\n" + "\n\n".join(f"[{k + 1}]\n{p}" for k, p in enumerate(parts))
+
+    def stats(self):
+        return {"chunks": len(self.levels[0]), "levels": len(self.levels),
+                "nodes": sum(len(level) for level in self.levels), "computed": self.computed}
+
+
+summary_cache = ArtifactCache(int(os.getenv("SUMMARY_CACHE_NODES", "4096")))
@@ -0,0 +1,150 @@
+import re
+from collections import namedtuple
+
+from helpers.dedup import normalize_clause
+from helpers.executor import DEFAULT_MAX_CONCURRENCY, imap_bounded
+
+DEFAULT_WINDOW_TOKENS = 6000   # extracted clauses echo the input, so stay well under the output-token limit
+DEFAULT_OVERLAP_TOKENS = 300
+CHARS_PER_TOKEN = 4            # same estimate as utils.estimate_tokens
+
+_BOUNDARY = re.compile(r"\n\s*\n|\n(?=\s*(?:\d+|[a-z]|[ivx]+)[.)]\s)|(?<=[.;:])\s+")
+_WORD = re.compile(r"\w+")
+
+# overlap: number of leading characters repeated from the end of the previous window
+Window = namedtuple("Window", "index text overlap")
+
+
+def _cut_point(text, limit, floor):
+    """Last paragraph/sentence boundary in (floor, limit]; whitespace, then a hard cut, otherwise."""
+    cut = None
+    for match in _BOUNDARY.finditer(text, floor, limit):
+        cut = match.end()
+    if cut is None:
+        space = text.rfind(" ", floor, limit)
+        cut = space + 1 if space > floor else limit
+    return cut
+
+
+def _overlap_start(text, cut, overlap):
+    """Start of the repeated region: the first sentence start in the last `overlap` chars before `cut`."""
+    start = max(0, cut - overlap)
+    match = _BOUNDARY.search(text, start, cut)
+    if match and match.end() < cut:
+        return match.end()
+    space = text.find(" ", start, cut)
+    return space + 1 if space != -1 else start
+
+
+def iter_windows(chunks, window_tokens=DEFAULT_WINDOW_TOKENS, overlap_tokens=DEFAULT_OVERLAP_TOKENS, separator="\n\n---\n\n"):
+    """
+    Token-bounded, overlapping windows over a (possibly lazy) sequence of chunks.
+
+    Windows end at a paragraph or sentence boundary close to the limit, and each one starts
+    with the last ~`overlap_tokens` of the previous window. Only the current window's text is
+    held, so memory does not grow with the document.
+    """
+    limit = max(1, window_tokens) * CHARS_PER_TOKEN
+    overlap = min(max(0, overlap_tokens) * CHARS_PER_TOKEN, limit // 2)
+    buffer, head, index = "", 0, 0
+    for chunk in chunks:
+        buffer = buffer + separator + chunk if buffer else chunk
+        while len(buffer) > limit:
+            cut = _cut_point(buffer, limit, max(head, limit // 2))
+            yield Window(index, buffer[:cut], head)
+            index += 1
+            start = _overlap_start(buffer, cut, overlap) if overlap else cut
+            buffer, head = buffer[start:], cut - start
+    if buffer.strip() and (index == 0 or len(buffer) > head):
+        yield Window(index, buffer, head)
+
+
+def _locate(clause, text):
+    """Character offset of a clause in the window text (matched on its first words), or None."""
+    words = _WORD.findall(clause)
+    if words and words[0].isdigit() and len(words) > 1:
+        words = words[1:]  # list numbering added by the model
+    if not words:
+        return None
+    match = re.search(r"\W+".join(map(re.escape, words[:6])), text, re.IGNORECASE)
+    return match.start() if match else None
+
+
+def _stitch(first, second, min_words=4):
+    """Join a clause cut at the end of one window with its continuation at the start of the next."""
+    a, b = first.split(), second.split()
+    key = lambda w: w.strip(".,;:()\"'").lower()
+    for size in range(min(len(a), len(b)) - 1, min_words - 1, -1):
+        if [key(w) for w in a[-size:]] == [key(w) for w in b[:size]]:
+            return " ".join(a + b[size:])
+    return None
+
+
+def reconcile_seam(previous, current):
+    """
+    Reconcile the clauses of two adjacent windows at their seam.
+
+    previous/current are (Window, [[clause, offset or None, emit]]). A clause from the head of
+    `current` that repeats one from the tail of `previous` is emitted once, in its longer
+    wording; a clause cut off at the end of `previous` is stitched with its continuation. The
+    completed wording lives on in `current` (previous is emitted right after this call), so a
+    later seam can still extend it. Suppressed clauses stay in `current` so the next seam still
+    recognises them.
+    """
+    p_window, p_clauses = previous
+    window, clauses = current
+    tail_start = len(p_window.text) - window.overlap
+    tail = [entry for entry in p_clauses if entry[1] is None or entry[1] + len(entry[0]) >= tail_start]
+
+    for entry in clauses:
+        clause, pos, _ = entry
+        if pos is not None and pos >= window.overlap:
+            continue
+        norm = normalize_clause(clause)
+        for other in tail:
+            other_norm = normalize_clause(other[0])
+            if norm == other_norm or (len(norm) >= 12 and norm in other_norm):
+                entry[2] = False
+                break
+            if norm.startswith(other_norm + " ") or (len(other_norm) >= 12 and other_norm in norm):
+                other[2] = False
+                break
+            stitched = _stitch(other[0], clause)
+            if stitched:
+                entry[0], other[2] = stitched, False
+                break
+
+
+def extract_clauses_windowed(chunks, make_stream, window_tokens=DEFAULT_WINDOW_TOKENS,
+                             overlap_tokens=DEFAULT_OVERLAP_TOKENS, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+    """
+    Clause extraction over overlapping windows, run concurrently.
+
+    make_stream(window_text) -> call_gemini1 stream with one clause per line. Yields
+    "clause\n" lines in document order, with seam clauses reconciled, so the result can be
+    consumed like a single extraction stream (e.g. with helpers.streaming.iter_lines).
+    A window's clauses are held back only until the next window has been reconciled with them.
+    """
+    def extract(window):
+        text = "".join(make_stream(window.text))
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        return window, [[line, _locate(line, window.text), True] for line in lines]
+
+    previous = None
+    for current in imap_bounded(extract, iter_windows(chunks, window_tokens, overlap_tokens), max_concurrency):
+        if previous is not None:
+            reconcile_seam(previous, current)
+            yield from (clause + "\n" for clause, _, emit in previous[1] if emit)
+        previous = current
+    if previous is not None:
+        yield from (clause + "\n" for clause, _, emit in previous[1] if emit)
+
+
+def fits_one_window(chunks, window_tokens=DEFAULT_WINDOW_TOKENS):
+    """True when the chunks together stay within a single window."""
+    limit, total = window_tokens * CHARS_PER_TOKEN, 0
+    for chunk in chunks:
+        total += len(chunk)
+        if total > limit:
+            return False
+    return True
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Tests run offline: every LLM call goes to the fake backend in utils.py
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("FAKE_LLM_LATENCY", "0")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,38 @@
+import random
+
+import numpy as np
+
+from helpers.alignment import align_chunks, chunk_terms, monotone_alignment
+
+_rng = random.Random(1)
+_WORDS = [f"w{i}" for i in range(3000)]
+DOC1 = [" ".join(_rng.choice(_WORDS) for _ in range(60)) for _ in range(40)]
+# Revision: chunk 10 inserted, old chunk 25 deleted, chunk 5 lightly amended
+DOC2 = DOC1[:10] + ["entirely new clause about arbitration seat venue fees"] + DOC1[10:25] + DOC1[26:]
+DOC2[5] += " amended"
+
+
+def test_monotone_alignment_keeps_document_order():
+    similarity = np.array([[0.9, 0.1, 0.0], [0.1, 0.0, 0.8], [0.0, 0.95, 0.1]])
+    assert monotone_alignment(similarity) == [(0, 0, 0.9), (2, 1, 0.95)]
+
+
+def test_insertion_deletion_and_edit_are_found():
+    result = align_chunks(DOC1, DOC2, mode="dense")
+    assert result["unmatched_doc1"] == [25]
+    assert result["unmatched_doc2"] == [10]
+    changed = [m for m in result["matches"] if not m["identical"]]
+    assert [(m["doc1_chunk"], m["doc2_chunk"]) for m in changed] == [(5, 5)]
+
+
+def test_lsh_matches_dense_while_scoring_fewer_pairs():
+    dense = align_chunks(DOC1, DOC2, mode="dense")
+    lsh = align_chunks(DOC1, DOC2, mode="lsh")
+    assert lsh["matches"] == dense["matches"]
+    assert lsh["stats"]["pairs_scored"] < dense["stats"]["pairs_scored"] == 40 * 40
+
+
+def test_precomputed_terms_give_the_same_alignment():
+    buckets = {}
+    terms = (chunk_terms(DOC1, buckets=buckets), chunk_terms(DOC2, buckets=buckets))
+    assert align_chunks(DOC1, DOC2, terms=terms) == align_chunks(DOC1, DOC2)
@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+import pytest
+
+from helpers import artifacts
+from helpers.artifacts import ArtifactCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(artifacts, "time", SimpleNamespace(monotonic=lambda: now.value))
+    return now
+
+
+def test_least_recently_used_entry_is_evicted_at_capacity():
+    cache = ArtifactCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = ArtifactCache(max_entries=10, ttl=60)
+    cache.put("a", 1)
+    clock.value += 59
+    assert cache.get("a") == 1
+    clock.value += 2
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0 and cache.stats()["evictions"] == 1
+
+    calls = []
+    assert cache.get_or_create("a", lambda: calls.append(1) or 2) == 2
+    assert cache.get_or_create("a", lambda: calls.append(1) or 3) == 2 and len(calls) == 1
+
+
+def test_configure_changes_limits_on_a_live_cache(clock):
+    cache = ArtifactCache(max_entries=10, ttl=None)
+    for key in "abcde":
+        cache.put(key, key)
+    clock.value += 120
+
+    cache.configure(max_entries=3)
+    assert [key for key in "abcde" if cache.get(key)] == ["c", "d", "e"]
+
+    cache.configure(ttl=60)  # entries older than the new ttl are evicted at once
+    assert cache.stats()["entries"] == 0
+    cache.put("f", "f")
+    clock.value += 30
+    cache.configure(ttl=0)  # 0 disables expiry
+    clock.value += 1000
+    assert cache.get("f") == "f"
+
+    cache.configure(max_entries=0)  # disables caching
+    cache.put("g", "g")
+    assert cache.get("g") is None and cache.stats()["entries"] == 0
+
+
+def test_failed_values_are_not_kept():
+    cache = ArtifactCache(max_entries=4)
+    assert cache.get_or_create("k", lambda: {"error": "x"}, keep=lambda v: "error" not in v) == {"error": "x"}
+    assert cache.get_or_create("k", lambda: {"ok": 1}, keep=lambda v: "error" not in v) == {"ok": 1}
+    assert cache.stats()["misses"] == 2 and cache.get("k") == {"ok": 1}
@@ -0,0 +1,33 @@
+from helpers.citations import canonical_citations, coverage_doubtful, extract_citations
+
+
+def test_section_list_yields_one_citation_per_section_in_order():
+    assert canonical_citations("The accused is charged u/s 420/468 r/w 34 IPC.") == [
+        "Section 420 IPC", "Section 468 IPC", "Section 34 IPC"]
+
+
+def test_full_act_names_and_subsections_are_canonicalized():
+    text = "Section 498-A of the Indian Penal Code and Section 3(5) BNS"
+    assert canonical_citations(text) == ["Section 498A IPC", "Section 3(5) BNS"]
+    assert canonical_citations("offence under Section 138 of the Negotiable Instruments Act, 1881") == [
+        "Section 138 NI Act"]
+
+
+def test_offsets_cover_the_reference():
+    text = "FIR registered. Charged u/s 302 IPC for murder."
+    (citation,) = extract_citations(text)
+    assert citation.section == "302" and citation.act == "IPC"
+    assert "302 IPC" in text[citation.start:citation.end] == citation.text
+
+
+def test_repeated_citation_is_listed_once():
+    assert canonical_citations("u/s 302 IPC and Section 302 of the IPC") == ["Section 302 IPC"]
+
+
+def test_full_act_name_needs_a_section_word():
+    assert canonical_citations("420 Evidence Act") == []
+
+
+def test_unknown_act_makes_coverage_doubtful():
+    assert coverage_doubtful("Section 3 of the Dowry Prohibition Act")
+    assert not coverage_doubtful("u/s 420/468 r/w 34 IPC")
@@ -0,0 +1,40 @@
+import threading
+import time
+
+from classes.documentComparison import HybridDocumentDifferenceIdentifier
+from helpers.artifacts import ArtifactCache
+from helpers.executor import bounded_map
+
+
+class SlowSummaries(HybridDocumentDifferenceIdentifier):
+    calls = 0
+    _calls_lock = threading.Lock()
+
+    def summarize_document(self, document, doc_label):
+        with self._calls_lock:
+            SlowSummaries.calls += 1
+        time.sleep(0.2)
+        return {"DocumentType": "Lease", "MainPurpose": doc_label}
+
+
+def test_each_summary_is_created_once_per_instance():
+    SlowSummaries.calls = 0
+    comparison = SlowSummaries(["clause one"], ["clause two"])
+    bounded_map(lambda _: (comparison.doc1_summary, comparison.doc2_summary), range(6), 6)
+    assert SlowSummaries.calls == 2
+    assert comparison.summaries_created == {"doc1", "doc2"}
+
+
+def test_instances_do_not_serialize_each_other():
+    comparisons = [SlowSummaries([f"a{i}"], [f"b{i}"]) for i in range(4)]
+    start = time.perf_counter()
+    bounded_map(lambda c: c.prepare_summaries(2), comparisons, 4)
+    assert time.perf_counter() - start < 0.6  # 8 summaries of 0.2s; one shared lock would take 1.6s
+
+
+def test_summaries_from_the_artifact_cache_are_not_counted_as_created():
+    cache = ArtifactCache()
+    SlowSummaries(["same"], ["text"], cache=cache).prepare_summaries()
+    again = SlowSummaries(["same"], ["text"], cache=cache)
+    again.prepare_summaries()
+    assert again.summaries_created == set() and again.doc1_summary["MainPurpose"] == "Document 1"
@@ -0,0 +1,53 @@
+from datetime import date
+
+from helpers.dates import dates_with_context, extract_dates, sentence_bounds
+
+TODAY = date(2025, 9, 15)
+
+
+def _dates(text):
+    return [(hit.date, hit.ambiguous) for hit in extract_dates(text)]
+
+
+def test_written_and_iso_formats():
+    text = "Hearing on 2025-10-20, reply by 14th day of September, 2025 and 14-Sep-2025 or September 14, 2025."
+    assert [hit.text for hit in extract_dates(text)] == [
+        "2025-10-20", "14th day of September, 2025", "14-Sep-2025", "September 14, 2025"]
+    assert {hit.date for hit in extract_dates(text)[1:]} == {date(2025, 9, 14)}
+
+
+def test_numeric_dates_follow_the_document_convention():
+    assert _dates("Due 03/04/2025 and 13/04/2025.") == [(date(2025, 4, 3), False), (date(2025, 4, 13), False)]
+    assert _dates("Due 04/13/2025 and 04/03/2025.") == [(date(2025, 4, 13), False), (date(2025, 4, 3), False)]
+
+
+def test_two_digit_years_and_invalid_dates():
+    assert _dates("Payable 1/1/26.") == [(date(2026, 1, 1), False)]
+    assert _dates("Filed 31/02/2025.") == []
+
+
+def test_lowercase_month_words_are_not_dates():
+    assert _dates("the Lessee may 15 days after notice remove fixtures") == []
+
+
+def test_missing_year_is_borrowed_and_flagged():
+    assert _dates("Paid on 5th March 2024. Next on 10th June.") == [(date(2024, 3, 5), False), (date(2024, 6, 10), True)]
+
+
+def test_abbreviations_do_not_end_sentences():
+    text = "Pay Rs. 500 by 20/10/2025. Mr. Rao signed on 01/01/2020."
+    assert sentence_bounds(text) == [0, text.index("Mr.")]
+
+
+def test_future_mentions_with_context():
+    text = "Pay Rs. 500 by 20/10/2025. Mr. Rao signed on 01/01/2020.\n\nPaid 5th March 2026. Next on 10th June."
+    mentions, ambiguous = dates_with_context(text, today=TODAY)
+    assert mentions == [
+        {"date": "2025-10-20", "context": "Pay Rs. 500 by 20/10/2025."},
+        {"date": "2026-03-05", "context": "Paid 5th March 2026."},
+        {"date": "2026-06-10", "context": "Next on 10th June."},
+    ]
+    assert [(hit.text, context) for hit, context in ambiguous] == [("10th June", "Next on 10th June.")]
+
+    strict, _ = dates_with_context(text, today=TODAY, keep_ambiguous=False)
+    assert [m["date"] for m in strict] == ["2025-10-20", "2026-03-05"]
@@ -0,0 +1,72 @@
+from datetime import date
+
+from helpers.deadlines import add_months, get_legal_calendar, parse_number, resolve_deadlines
+
+TODAY = date(2025, 9, 15)
+
+
+def _resolve(text, **kwargs):
+    resolved, unresolved = resolve_deadlines(text, reference=TODAY, **kwargs)
+    return [(entry["date"], entry["provenance"]["anchor"]["method"]) for entry in resolved], unresolved
+
+
+def test_add_months_clamps_to_month_end():
+    assert add_months(date(2024, 1, 31), 1) == date(2024, 2, 29)
+    assert add_months(date(2025, 11, 30), 3) == date(2026, 2, 28)
+
+
+def test_parse_number_words():
+    assert [parse_number(raw) for raw in ("30", "Fifteen", "twenty-one", "one hundred and twenty", "an")] == [
+        30, 15, 21, 120, 1]
+
+
+def test_calendar_closed_days_and_periods():
+    calendar = get_legal_calendar()
+    assert calendar.closed(date(2025, 10, 20)) == "Diwali (Deepavali)"
+    assert calendar.closed(date(2025, 10, 18)) == "Saturday"
+    assert calendar.open_day(date(2025, 10, 18)) == date(2025, 10, 21)
+    assert calendar.open_day(date(2025, 10, 20), step=-1) == date(2025, 10, 17)
+    assert calendar.add_working_days(date(2025, 10, 10), 2) == date(2025, 10, 14)
+    assert calendar.financial_year(date(2025, 2, 1)) == (date(2024, 4, 1), date(2025, 3, 31))
+    assert calendar.quarter(date(2025, 9, 15)) == (date(2025, 7, 1), date(2025, 9, 30))
+    assert calendar.label(date(2025, 9, 15)) == "2025-26"
+    assert not calendar.covers(date(2030, 1, 1))
+
+
+def test_explicit_anchor_rolls_off_a_holiday():
+    text = "Reply within 30 days of 20/09/2025."
+    resolved, _ = resolve_deadlines(text, reference=TODAY)
+    assert resolved[0]["date"] == "2025-10-21"
+    assert resolved[0]["provenance"]["adjusted"].startswith("2025-10-20 is a closed day")
+    assert _resolve(text, roll=False)[0] == [("2025-10-20", "explicit")]
+
+
+def test_receipt_of_notice_assumes_the_notice_date():
+    text = ("LEGAL NOTICE dated 14/09/2025. You are called upon to pay Rs. 5,00,000 within 30 days of receipt "
+            "of this notice.")
+    resolved, _ = resolve_deadlines(text, reference=TODAY)
+    assert resolved[0]["date"] == "2025-10-14"
+    assert resolved[0]["expression"] == "within 30 days of receipt of this notice"
+    assert resolved[0]["provenance"]["assumed"]
+
+
+def test_event_anchor_found_in_another_sentence():
+    text = ("The hearing in the matter is fixed on 20.10.2025 before the Civil Judge. The respondent shall file "
+            "the reply at least seven (7) days before the hearing.")
+    assert _resolve(text) == ([("2025-10-13", "event")], [])
+
+
+def test_working_days_and_financial_year_end():
+    text = ("ORDER dated 10/10/2025. The appellant shall deposit the amount within two working days from the "
+            "date of this order.")
+    assert _resolve(text) == ([("2025-10-14", "event")], [])
+    text = "The Lessee shall pay the arrears on or before the end of the financial year. Dated 01/08/2025."
+    assert _resolve(text) == ([("2026-03-31", "period")], [])
+
+
+def test_durations_are_not_deadlines_and_missing_anchors_are_reported():
+    assert _resolve("The tenant has a notice period of 15 days.") == ([], [])
+    resolved, unresolved = _resolve("Possession within 15 days of the order of the Tribunal.")
+    assert resolved == []
+    assert unresolved[0]["date"] is None
+    assert unresolved[0]["reason"] == 'no date found for "the order of the Tribunal"'
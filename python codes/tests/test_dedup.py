@@ -0,0 +1,46 @@
+from helpers.dedup import NearDuplicateIndex, cluster_clauses, normalize_clause
+
+REWORDED = [
+    "1. The accused is charged under Section 302 of the IPC for murder.",
+    "The accused is charged u/s 302 IPC for murder.",
+    "The Lessee shall pay rent of Rs. 50,000 on the first day of every month.",
+    "The Lessee shall pay rent of Rs. 60,000 on the first day of every month.",
+]
+
+
+def test_normalize_strips_numbering_and_section_words():
+    assert normalize_clause(REWORDED[0]) == normalize_clause("the accused is charged u/s. 302 IPC, for murder")
+
+
+def test_reworded_citation_clauses_share_a_cluster():
+    index = cluster_clauses(REWORDED)
+    assert index.assignment[0] == index.assignment[1]
+    assert index.representatives[0] == REWORDED[0]
+
+
+def test_different_amounts_are_not_merged():
+    index = cluster_clauses(REWORDED)
+    assert index.assignment[2] != index.assignment[3]
+    assert index.report() == {"clauses": 4, "clusters": 3, "duplicates_merged": 1, "llm_calls_saved": 1}
+
+
+def test_new_representatives_yields_only_first_of_each_cluster():
+    index = NearDuplicateIndex()
+    assert list(index.new_representatives(REWORDED)) == [REWORDED[0], REWORDED[2], REWORDED[3]]
+
+
+def test_fan_out_relabels_each_member():
+    index = cluster_clauses(REWORDED)
+    results = index.fan_out([{"clause": rep, "level": i} for i, rep in enumerate(index.representatives)])
+    assert [r["clause"] for r in results] == REWORDED
+    assert results[1]["level"] == 0
+
+
+def test_map_clusters_calls_once_per_cluster_and_keeps_every_clause():
+    index = cluster_clauses(REWORDED)
+    calls = []
+    results, saved = index.map_clusters(lambda c: calls.append(c) or {"clause": c}, limit=3)
+    assert calls.count(REWORDED[0]) == 1 and len(calls) == 2
+    assert [r["clause"] for r in results] == REWORDED[:3]
+    assert saved == 1
+    assert index.report(calls_saved=saved)["llm_calls_saved"] == 1
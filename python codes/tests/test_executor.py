@@ -0,0 +1,59 @@
+import threading
+import time
+
+import pytest
+
+from helpers.executor import bounded_map, imap_bounded
+
+
+def test_bounded_map_keeps_input_order():
+    def slow(x):
+        time.sleep(0.01 * (5 - x))
+        return x * x
+
+    assert bounded_map(slow, range(5), max_concurrency=4) == [0, 1, 4, 9, 16]
+
+
+def test_sequential_when_concurrency_is_one():
+    seen = []
+    assert bounded_map(lambda x: seen.append(threading.get_ident()) or x, [1, 2, 3], 1) == [1, 2, 3]
+    assert set(seen) == {threading.get_ident()}
+
+
+def test_in_flight_calls_are_bounded():
+    lock, state = threading.Lock(), {"now": 0, "peak": 0}
+
+    def work(x):
+        with lock:
+            state["now"] += 1
+            state["peak"] = max(state["peak"], state["now"])
+        time.sleep(0.01)
+        with lock:
+            state["now"] -= 1
+        return x
+
+    assert bounded_map(work, range(20), max_concurrency=3) == list(range(20))
+    assert state["peak"] <= 3
+
+
+def test_imap_bounded_reads_generator_lazily():
+    pulled = []
+
+    def items():
+        for k in range(100):
+            pulled.append(k)
+            yield k
+
+    stream = imap_bounded(lambda x: x, items(), max_concurrency=2)
+    assert next(stream) == 0
+    assert len(pulled) <= 3
+
+
+def test_errors_propagate():
+    def fail(x):
+        if x == 2:
+            raise ValueError("boom")
+        return x
+
+    with pytest.raises(ValueError, match="boom"):
+        bounded_map(fail, range(4), 2)
@@ -0,0 +1,58 @@
+from helpers.identifiers import (COMMON_FIELDS, EXTRA_FIELDS, extract_identity_fields, find_aadhaar, find_pan,
+                                 unresolved_fields, verhoeff_valid)
+
+AADHAAR = "499187870119"  # Verhoeff-valid test number
+
+
+def test_verhoeff_reference_example():
+    assert verhoeff_valid("2363")  # check digit 3 for 236, the published worked example
+    assert not verhoeff_valid("2364")
+
+
+def test_valid_aadhaar_passes_and_every_single_digit_typo_fails():
+    assert verhoeff_valid(AADHAAR)
+    typos = [AADHAAR[:i] + d + AADHAAR[i + 1:] for i in range(12) for d in "0123456789" if d != AADHAAR[i]]
+    assert not any(verhoeff_valid(number) for number in typos)
+
+
+def test_every_adjacent_swap_fails():
+    swaps = [AADHAAR[:i] + AADHAAR[i + 1] + AADHAAR[i] + AADHAAR[i + 2:]
+             for i in range(11) if AADHAAR[i] != AADHAAR[i + 1]]
+    assert swaps and not any(verhoeff_valid(number) for number in swaps)
+
+
+def test_find_aadhaar_formats():
+    for text in ("4991 8787 0119", "4991-8787-0119", "UID:499187870119, issued on"):
+        assert find_aadhaar(text) == ["4991 8787 0119"]
+    assert find_aadhaar("Aadhaar 4991 8787 0119 and again 499187870119") == ["4991 8787 0119"]
+
+
+def test_find_aadhaar_rejects_checksum_failures_and_longer_numbers():
+    assert find_aadhaar("Aadhaar 4991 8787 0118") == []
+    assert find_aadhaar("a/c 14991878701190") == []
+    assert find_aadhaar("ref 12-4991 8787 0119") == []
+    assert find_aadhaar("2222 2222 2222") == []
+
+
+def test_find_pan_formats():
+    assert find_pan("PAN:ABCPE1234F. Company PAN (AAACR5055K)") == ["ABCPE1234F", "AAACR5055K"]
+    assert find_pan("XABCPE1234F") == []
+    assert find_pan("ABCXE1234F") == []  # X is not a holder type
+
+
+def test_extract_identity_fields_shape():
+    text = ("GOVERNMENT OF INDIA\nUnique Identification Authority of India\nName: Ravi Kumar\nDOB: 12/05/1990\n"
+            "MALE\n4991 8787 0119")
+    fields, doc_type = extract_identity_fields(text)
+    assert doc_type == "Aadhaar Card"
+    assert list(fields) == COMMON_FIELDS + EXTRA_FIELDS["Aadhaar Card"]
+    assert fields["DocumentNumber"] == fields["AadhaarNumber"] == "4991 8787 0119"
+    assert (fields["Name"], fields["DateOfBirth"], fields["Gender"]) == ("Ravi Kumar", "12/05/1990", "Male")
+    assert fields["IssuedBy"] == "Unique Identification Authority of India"
+    assert unresolved_fields(fields) == ["IssueDate", "ExpiryDate", "Address", "Mother's Name", "Father's Name"]
+
+
+def test_no_identifier_gives_no_document_type():
+    fields, doc_type = extract_identity_fields("Rent agreement for flat 12")
+    assert doc_type is None
+    assert list(fields) == COMMON_FIELDS and set(unresolved_fields(fields)) == set(COMMON_FIELDS)
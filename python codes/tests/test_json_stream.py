@@ -0,0 +1,36 @@
+from helpers.json_stream import StreamingJSONParser, iter_json_items, parse_stream
+
+FENCED = 'Here you go:\n```json\n[{"a": 1, "b": "x,]"}, {"a": 2}]\n``` done'
+
+
+def test_items_are_emitted_across_arbitrary_chunk_boundaries():
+    chunks = [FENCED[i:i + 3] for i in range(0, len(FENCED), 3)]
+    assert list(iter_json_items(chunks)) == [((0,), {"a": 1, "b": "x,]"}), ((1,), {"a": 2})]
+
+
+def test_each_item_is_emitted_by_the_chunk_that_closes_it():
+    parser = StreamingJSONParser()
+    assert parser.feed('[{"a": 1}, {"a"') == [((0,), {"a": 1})]
+    assert parser.feed(': 2}]') == [((1,), {"a": 2})]
+    assert parser.done and parser.close() == [{"a": 1}, {"a": 2}]
+
+
+def test_emit_depth_reports_nested_fields_before_their_parents():
+    events = list(iter_json_items(['{"x": {"y": [1,2]}, "z": 3}'], emit_depth=2))
+    assert events == [(("x", "y"), [1, 2]), (("x",), {"y": [1, 2]}), (("z",), 3)]
+
+
+def test_escaped_quotes_stay_inside_strings():
+    assert parse_stream('{"k": "v\\"q"}') == {"k": 'v"q'}
+
+
+def test_truncated_string_value_is_kept_and_containers_closed():
+    assert parse_stream(['[{"a": 1}, {"a": "cut off mid']) == [{"a": 1}, {"a": "cut off mid"}]
+
+
+def test_dangling_partial_token_is_dropped():
+    assert parse_stream('{"a": [1, 2, tr') == {"a": [1, 2]}
+
+
+def test_no_json_gives_default():
+    assert parse_stream("no json here", default=[]) == []
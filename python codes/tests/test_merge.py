@@ -0,0 +1,47 @@
+import json
+
+from helpers.merge import FIRST, UNION, apply_resolutions, is_missing, merge_records
+
+
+def test_missing_values_are_dropped():
+    assert is_missing("Not available") and is_missing([None, "n/a"]) and not is_missing("Pune")
+    merged, conflicts = merge_records([{"Name": "A. Rao", "Address": "N/A"}, {"Address": "Pune"}])
+    assert merged == {"Name": "A. Rao", "Address": "Pune"}
+    assert conflicts == []
+
+
+def test_contained_values_are_not_conflicts():
+    merged, conflicts = merge_records([{"Name": "R. Sharma"}, {"name": "R. Sharma, Pune"}])
+    assert merged == {"Name": "R. Sharma, Pune"}
+    assert conflicts == []
+
+
+def test_disagreeing_values_are_reported():
+    merged, conflicts = merge_records([{"DocumentNumber": "ABCDE1234F"}, {"DocumentNumber": "XYZ"}])
+    assert merged["DocumentNumber"] == "ABCDE1234F"
+    assert conflicts == [{"key": "DocumentNumber", "values": ["ABCDE1234F", "XYZ"]}]
+
+
+def test_strategies_and_lists():
+    merged, conflicts = merge_records(
+        [{"OtherNotes": "first", "Directors": ["A"], "Type": "x"}, {"OtherNotes": "second", "Directors": ["A", "B"], "Type": "y"}],
+        strategies={"OtherNotes": UNION, "Type": FIRST},
+    )
+    assert merged == {"OtherNotes": ["first", "second"], "Directors": ["A", "B"], "Type": "x"}
+    assert conflicts == []
+
+
+def test_accepts_json_strings_and_clause_wrappers():
+    records = [json.dumps({"Name": "A"}), {"clause": "c", "attributes": '```json\n{"BloodGroup": "B+"}\n```'}]
+    assert merge_records(records)[0] == {"Name": "A", "BloodGroup": "B+"}
+
+
+def test_validity_range_fills_dates():
+    merged, _ = merge_records([{"Validity": "Valid from 10/06/2011 to 09/06/2031"}])
+    assert merged["IssueDate"] == "10/06/2011" and merged["ExpiryDate"] == "09/06/2031"
+
+
+def test_nested_conflicts_and_resolutions():
+    merged, conflicts = merge_records([{"Address": {"City": "Pune"}}, {"Address": {"City": "Mumbai"}}])
+    assert conflicts == [{"key": "Address.City", "values": ["Mumbai", "Pune"]}]
+    assert apply_resolutions(merged, conflicts, {"Address.City": "Pune"}) == {"Address": {"City": "Pune"}}
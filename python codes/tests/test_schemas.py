@@ -0,0 +1,78 @@
+import pytest
+
+from classes.contracts import contracts
+from classes.litigation import litigation
+from helpers.schemas import REGISTRY, PersonalAttributes, RegulatoryAttributes, parse_as, to_jsonable, typed
+from utils import call_gemini1, llm_usage, set_fake_responder
+
+
+def _sdk_schema(schema):
+    """The schema as google-genai converts it before a request is sent (raises on unsupported types)."""
+    genai = pytest.importorskip("google.genai")
+    from google.genai import _transformers
+
+    return _transformers.t_schema(genai.Client(api_key="test"), schema)
+
+
+def test_response_schema_uses_plain_field_names():
+    assert "MothersName" in PersonalAttributes.model_json_schema()["properties"]
+    assert "Deadlines / Validity" not in str(RegulatoryAttributes.model_json_schema())
+
+
+def test_aliases_are_accepted_and_restored_on_dump():
+    parsed = parse_as(PersonalAttributes, '{"Mother\'s Name": "A", "FathersName": "B"}')
+    assert parsed.MothersName == "A"
+    dumped = to_jsonable({"attributes": parsed})["attributes"]
+    assert dumped["Mother's Name"] == "A" and dumped["Father's Name"] == "B"
+
+
+def test_typed_parses_wrappers_and_counts_failures():
+    llm_usage.reset()
+    records = [{"clause": "c", "attributes": '{"Name": "A"}'}, {"clause": "d", "attributes": "not json"}]
+    result = typed(PersonalAttributes, records)
+    assert result[0]["attributes"].Name == "A"
+    assert result[1]["attributes"] == "not json"
+    assert llm_usage.snapshot()["parse_failures"] == 1
+
+
+def test_fake_backend_reports_nonconforming_answers():
+    llm_usage.reset()
+    set_fake_responder(lambda prompt: "Sorry, I cannot help with that.")
+    try:
+        stream = call_gemini1("extract", response_schema=PersonalAttributes)
+        assert stream.parsed() is None
+        assert stream.text() == "Sorry, I cannot help with that."
+    finally:
+        set_fake_responder(None)
+    assert llm_usage.snapshot()["parse_failures"] == 1
+
+
+def test_fake_backend_default_answer_conforms():
+    assert call_gemini1("extract", response_schema=PersonalAttributes).parsed() == PersonalAttributes()
+
+
+@pytest.mark.parametrize("name", sorted(REGISTRY))
+def test_registry_schemas_pass_the_sdk_transformer(name):
+    assert _sdk_schema(REGISTRY[name]) is not None
+
+
+@pytest.mark.parametrize("analyzer", [litigation, contracts])
+def test_fused_schemas_pass_the_sdk_transformer(analyzer):
+    assert _sdk_schema(analyzer.fused_schema) is not None
+
+
+def test_clause_explanations_come_back_typed():
+    from helpers.schemas import ClauseExplanation
+    from helpers.sinks import NullSink
+    from workflow_fun.corpa import corp_workflow
+
+    clause = "The Board resolved to appoint Mr. A. Rao as Director."
+    answer = '{"Explanation": "Mr. Rao becomes a director.", "Significance": "Needs a DIR-12 filing."}'
+    set_fake_responder(lambda prompt: answer if '"Significance"' in prompt else f"1. {clause}" if "numbered list" in prompt else None)
+    try:
+        result = corp_workflow([clause], outputs=["explanations"], sink=NullSink())
+    finally:
+        set_fake_responder(None)
+    (explanation,) = result["explanations"]
+    assert explanation["analysis"] == ClauseExplanation(Explanation="Mr. Rao becomes a director.",
+                                                        Significance="Needs a DIR-12 filing.")
@@ -0,0 +1,106 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from helpers.fused import run_fused_analysis
+from helpers.sinks import NDJSONSink, NullSink, QueueSink, SinkClosed, closes_sink
+
+
+def _blocked_producer(sink):
+    errors = []
+
+    def produce():
+        try:
+            for i in range(10):
+                sink.item_completed("stage", i)
+        except SinkClosed as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=produce)
+    thread.start()
+    return thread, errors
+
+
+def test_queue_sink_cancel_unblocks_the_workflow_thread():
+    loop = asyncio.new_event_loop()
+    sink = QueueSink(loop, maxsize=2)
+    thread, errors = _blocked_producer(sink)
+    thread.join(0.3)
+    assert thread.is_alive()  # backpressure: nobody is reading
+    sink.cancel()
+    thread.join(2)
+    assert not thread.is_alive() and len(errors) == 1
+    loop.close()
+
+
+def test_queue_sink_times_out_a_stalled_client():
+    loop = asyncio.new_event_loop()
+    thread, errors = _blocked_producer(QueueSink(loop, maxsize=1, timeout=0.2))
+    thread.join(2)
+    assert not thread.is_alive() and "stopped reading" in str(errors[0])
+    loop.close()
+
+
+def test_leaving_the_async_for_cancels_the_producer():
+    async def consume_one():
+        sink = QueueSink(asyncio.get_running_loop(), maxsize=1)
+        thread, errors = _blocked_producer(sink)
+        async for _ in sink:
+            break
+        await asyncio.to_thread(thread.join, 2)
+        return thread, errors
+
+    thread, errors = asyncio.run(consume_one())
+    assert not thread.is_alive() and errors
+
+
+def test_closes_sink_flushes_ndjson_even_when_the_workflow_fails(tmp_path):
+    path = tmp_path / "events.ndjson"
+
+    @closes_sink
+    def workflow(sink=None):
+        sink.stage_finished("extract", "done")
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        workflow(sink=NDJSONSink(path, doc_id=7))
+    event = json.loads(path.read_text())
+    assert event["stage"] == "extract" and event["doc_id"] == 7
+
+
+def test_closes_sink_ends_queue_iteration():
+    async def run():
+        sink = QueueSink(asyncio.get_running_loop())
+        closes_sink(lambda sink=None: sink.stage_started("a"))(sink=sink)
+        return [event["stage"] async for event in sink]
+
+    assert asyncio.run(run()) == ["a"]
+
+
+def test_fused_analysis_without_a_sink_writes_nothing(capsys):
+    answer = json.dumps([{"Index": 1, "Explanation": "e1"}, {"Index": 2, "Explanation": "e2"}])
+    results, stats = run_fused_analysis(["a", "b"], lambda batch: iter([answer]), lambda clause, item: item["Explanation"],
+                                        fallback=None, required_keys=["Explanation"])
+    assert results == ["e1", "e2"] and stats["fallback_clauses"] == 0
+    assert capsys.readouterr().out == ""
+
+
+
+def test_workflows_return_the_streamed_parts():
+    from utils import set_fake_responder
+    from workflow_fun.corpa import corp_workflow
+    from workflow_fun.regulat import regulatory_workflow
+
+    chunks = ["The Board resolved to appoint Mr. A. Rao as Director with effect from 1 April 2025."]
+    set_fake_responder(lambda prompt: "A plain answer that is long enough to arrive in several streamed parts. " * 3,
+                       text_only=True)
+    try:
+        summary, merged = corp_workflow(chunks, sink=NullSink())
+        explanation, _ = regulatory_workflow(chunks, "Regulatory", sink=NullSink())
+    finally:
+        set_fake_responder(None)
+    assert isinstance(summary, str)
+    for parts in (merged, explanation):  # the fake backend streams 64-character parts
+        assert len(parts) > 1 and all(isinstance(part, str) and len(part) <= 64 for part in parts)
@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+from helpers.statute_kb import StatuteKB
+
+
+def _write_seed(path, version, explanation):
+    sections = [
+        {"citation": "Section 420 IPC", "title": "Cheating", "explanation": explanation, "punishment": "Up to 7 years",
+         "cognizable": True, "bailable": False},
+        {"citation": "Section 318 BNS", "title": "Cheating", "explanation": "Cheating under the BNS.",
+         "cognizable": True, "bailable": False},
+    ]
+    path.write_text(json.dumps({"version": version, "sections": sections}), encoding="utf-8")
+
+
+@pytest.fixture
+def kb_paths(tmp_path, monkeypatch):
+    db, seed = tmp_path / "statutes.sqlite", tmp_path / "seed.json"
+    monkeypatch.setenv("STATUTE_KB_PATH", str(db))
+    _write_seed(seed, "1", "Deceiving someone to deliver property.")
+    return db, seed
+
+
+def test_seed_is_compiled_into_the_database_from_the_environment(kb_paths):
+    db, seed = kb_paths
+    kb = StatuteKB(seed_path=str(seed))
+    assert kb.db_path == str(db) and db.exists()
+    assert kb.version == "1"
+    entry = kb.lookup("Section 420 IPC")
+    assert entry["explanation"] == "Deceiving someone to deliver property."
+    assert entry["cognizable"] is True and entry["bailable"] is False and entry["source"] == "seed"
+
+
+def test_new_seed_version_rebuilds_and_keeps_learned_entries(kb_paths):
+    _, seed = kb_paths
+    StatuteKB(seed_path=str(seed)).put("Section 3 Dowry Prohibition Act", "Giving or taking dowry is punishable.")
+
+    _write_seed(seed, "1", "Unchanged version, so this text is not loaded.")
+    assert StatuteKB(seed_path=str(seed)).lookup("Section 420 IPC")["explanation"] == "Deceiving someone to deliver property."
+
+    _write_seed(seed, "2", "Dishonestly inducing delivery of property.")
+    kb = StatuteKB(seed_path=str(seed))
+    assert kb.version == "2"
+    assert kb.lookup("Section 420 IPC")["explanation"] == "Dishonestly inducing delivery of property."
+    learned = kb.lookup("Section 3 Dowry Prohibition Act")
+    assert learned["source"] == "llm" and learned["explanation"] == "Giving or taking dowry is punishable."
+
+
+def test_subsection_falls_back_to_its_section(kb_paths):
+    _, seed = kb_paths
+    kb = StatuteKB(seed_path=str(seed))
+    assert kb.lookup("Section 318(4) BNS")["citation"] == "Section 318 BNS"
+    assert kb.lookup("Section 999 BNS") is None
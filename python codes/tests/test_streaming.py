@@ -0,0 +1,53 @@
+import threading
+import time
+
+import pytest
+
+from helpers.streaming import iter_lines, prefetch, unique_everseen
+
+
+def test_iter_lines_yields_each_line_as_it_completes():
+    parts = ["1. Sec", "tion 420 IPC\n2. Rent is ", "due\n\n3. Last"]
+    assert list(iter_lines(parts)) == ["1. Section 420 IPC", "2. Rent is due", "3. Last"]
+
+
+def test_prefetch_passes_items_and_errors_through():
+    assert list(prefetch(iter(range(5)), maxsize=2)) == [0, 1, 2, 3, 4]
+
+    def broken():
+        yield 1
+        raise RuntimeError("stream failed")
+
+    with pytest.raises(RuntimeError, match="stream failed"):
+        list(prefetch(broken()))
+
+
+def test_prefetch_producer_stops_when_consumer_stops_early():
+    closed = threading.Event()
+
+    def endless():
+        try:
+            k = 0
+            while True:
+                yield k
+                k += 1
+        finally:
+            closed.set()
+
+    before = threading.active_count()
+    feed = prefetch(endless(), maxsize=2, poll=0.01)
+    for item in feed:
+        if item == 3:
+            break
+    feed.close()
+    assert closed.wait(1.0)
+    deadline = time.time() + 1.0
+    while threading.active_count() > before and time.time() < deadline:
+        time.sleep(0.01)
+    assert threading.active_count() == before
+
+
+def test_unique_everseen_keeps_first_occurrence():
+    seen = {}
+    assert list(unique_everseen(["a", "b", "a", "c", "b"], seen)) == ["a", "b", "c"]
+    assert list(seen) == ["a", "b", "c"]
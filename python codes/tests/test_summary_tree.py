@@ -0,0 +1,55 @@
+from helpers.artifacts import ArtifactCache
+from helpers.summary_tree import SummaryTree
+
+CHUNKS = [f"Clause {i}: the tenant shall pay {i * 100} rupees on the first of the month." for i in range(64)]
+
+
+def _tree(chunks, cache):
+    return SummaryTree(chunks, cache=cache, max_concurrency=1,
+                       summarize=lambda text: f"S({text})", merge=lambda summaries: "M(" + "|".join(summaries) + ")")
+
+
+def _path(tree, leaf):
+    """(level, index) of every node from `leaf` up to the root."""
+    path, index = [(0, leaf)], leaf
+    for level in range(1, len(tree.levels)):
+        index = next(k for k, node in enumerate(tree.levels[level]) if index in node["children"])
+        path.append((level, index))
+    return path
+
+
+def _shape(tree):
+    return [[node["children"] for node in level] for level in tree.levels]
+
+
+def test_first_build_computes_every_summary_once():
+    tree = _tree(CHUNKS, ArtifactCache(max_entries=10_000))
+    merges = sum(len(node["children"]) > 1 for level in tree.levels[1:] for node in level)
+    assert tree.computed == len(CHUNKS) + merges
+    assert len(tree.levels[-1]) == 1 and tree.root.startswith("M(")
+
+
+def test_editing_one_chunk_recomputes_only_its_path_to_the_root():
+    cache = ArtifactCache(max_entries=10_000)
+    original = _tree(CHUNKS, cache)
+    leaf = 37
+    # An edit can move a content-defined group boundary (and then regroup a neighbour); take
+    # the first wording that keeps the tree's shape, so the path is the whole of the change
+    for n in range(1, 50):
+        edited_chunks = CHUNKS[:leaf] + [CHUNKS[leaf] + f" (amended {n})"] + CHUNKS[leaf + 1:]
+        edited = _tree(edited_chunks, cache)
+        if _shape(edited) == _shape(original):
+            break
+    else:
+        raise AssertionError("no shape-preserving edit found")
+
+    path = _path(edited, leaf)
+    recomputed = [(level, k) for level, k in path if level == 0 or len(edited.levels[level][k]["children"]) > 1]
+    assert edited.computed == len(recomputed) <= len(edited.levels)
+    for level, nodes in enumerate(edited.levels):
+        for k, node in enumerate(nodes):
+            changed = node["key"] != original.levels[level][k]["key"]
+            assert changed == ((level, k) in path), (level, k)
+    assert edited.root != original.root
+
+    assert _tree(edited_chunks, cache).computed == 0  # a rebuild reuses every node
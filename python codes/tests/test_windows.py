@@ -0,0 +1,45 @@
+import re
+
+from helpers.windows import Window, extract_clauses_windowed, iter_windows, reconcile_seam
+
+# Clause 4 has no sentence boundary for ~230 characters, so the windows have to cut through it
+LONG = ("Clause 4: the Lessee shall keep the premises, fixtures, fittings, lifts, pumps, generators, water tanks, "
+        "parking areas, gardens and common corridors in good and tenantable repair and condition at its own cost "
+        "and expense throughout the term.")
+SENTENCES = ([f"Clause {n}: the Lessee shall pay charge {n} within {n + 10} days." for n in range(1, 4)] + [LONG]
+             + [f"Clause {n}: the Lessor shall refund deposit part {n} within {n} weeks." for n in range(5, 9)])
+DOCUMENT = " ".join(SENTENCES)
+
+
+def sentence_extractor(text):
+    """Fake extraction stream: every sentence fragment of the window on its own line."""
+    return iter(line.strip() + "\n" for line in re.split(r"(?<=\.)\s+", text) if line.strip())
+
+
+def test_windows_are_bounded_and_overlap():
+    windows = list(iter_windows([DOCUMENT], window_tokens=60, overlap_tokens=15))
+    assert len(windows) > 2
+    assert all(len(w.text) <= 60 * 4 for w in windows[:-1])
+    for previous, current in zip(windows, windows[1:]):
+        assert current.overlap > 0
+        assert previous.text.endswith(current.text[:current.overlap])
+
+
+def test_clause_straddling_a_window_boundary_is_emitted_once_and_whole():
+    windows = list(iter_windows([DOCUMENT], window_tokens=60, overlap_tokens=15))
+    assert sum(LONG[:30] in w.text or LONG[-30:] in w.text for w in windows) >= 2
+    assert not any(LONG in w.text for w in windows)  # no window holds the whole clause
+
+    lines = [l.strip() for l in extract_clauses_windowed([DOCUMENT], sentence_extractor, window_tokens=60, overlap_tokens=15)]
+    assert lines == SENTENCES
+
+
+def test_cut_clause_is_stitched_with_its_continuation():
+    previous = (Window(0, "Clause 1 is complete. Clause 2: the Buyer shall deliver the goods", 0),
+                [["Clause 1 is complete.", 0, True], ["Clause 2: the Buyer shall deliver the goods", 22, True]])
+    current = (Window(1, "the Buyer shall deliver the goods within 30 days. Clause 3 follows.", 33),
+               [["the Buyer shall deliver the goods within 30 days.", 0, True], ["Clause 3 follows.", 50, True]])
+    reconcile_seam(previous, current)
+    assert [emit for _, _, emit in previous[1]] == [True, False]
+    assert current[1][0][0] == "Clause 2: the Buyer shall deliver the goods within 30 days."
+    assert [emit for _, _, emit in current[1]] == [True, True]
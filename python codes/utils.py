@@ -1,27 +1,194 @@
-# utils.py
-from google import genai  # or whichever client library you use
-
 import os
+import threading
+import time
 from dotenv import load_dotenv
+from helpers.json_stream import StreamingJSONParser
+from helpers.schemas import dump_json, parse_as, placeholder
 load_dotenv()
 
+# "gemini" talks to the API; "fake" answers offline (benchmarks, local runs without a key)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini").lower()
+FAKE_LLM_LATENCY = float(os.getenv("FAKE_LLM_LATENCY", "0"))              # seconds per call
+FAKE_LLM_TOKEN_LATENCY = float(os.getenv("FAKE_LLM_TOKEN_LATENCY", "0"))  # seconds per output token
+
 gemini=os.getenv("gemini_api")
-# Initialize Gemini API
-client = genai.Client(api_key=gemini)
+if LLM_BACKEND == "fake":
+    client = None
+else:
+    from google import genai  # or whichever client library you use
+    # Initialize Gemini API
+    client = genai.Client(api_key=gemini)
+
+
+def estimate_tokens(text):
+    """Rough token estimate (~4 characters per token) used for usage reports."""
+    return (len(text) + 3) // 4 if text else 0
+
+
+class LLMUsage:
+    """Thread-safe counters of LLM calls and estimated tokens."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.calls = 0
+            self.prompt_tokens = 0
+            self.output_tokens = 0
+            self.parse_failures = 0
+            self.retries = 0
+
+    def record(self, prompt, output_chars):
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += estimate_tokens(prompt)
+            self.output_tokens += (output_chars + 3) // 4
+
+    def record_parse_failure(self, retried=False):
+        with self._lock:
+            self.parse_failures += 1
+            self.retries += int(retried)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "prompt_tokens": self.prompt_tokens,
+                "output_tokens": self.output_tokens,
+                "total_tokens": self.prompt_tokens + self.output_tokens,
+                "parse_failures": self.parse_failures,
+                "retries": self.retries
+            }
+
+
+llm_usage = LLMUsage()
+
+_fake_responder = None
+_fake_text_only = False
+
+
+def set_fake_responder(responder, text_only=False):
+    """
+    Install fn(prompt) -> str used by the fake backend (None restores the default answers). The
+    responder may return None to fall back to the default for that prompt; with text_only it is
+    asked only for free-text calls and schema calls get the default answer.
+    """
+    global _fake_responder, _fake_text_only
+    _fake_responder, _fake_text_only = responder, text_only
+
+
+def _fake_generate(prompt, response_schema=None):
+    text = None
+    if _fake_responder and not (_fake_text_only and response_schema is not None):
+        text = _fake_responder(prompt)
+    if text is None:
+        # No scripted answer: the smallest one that conforms to the schema, empty text otherwise.
+        # Scripted answers are returned as given, so nonconforming ones show up as parse failures.
+        text = dump_json(placeholder(response_schema)) if response_schema is not None else ""
+    time.sleep(FAKE_LLM_LATENCY + FAKE_LLM_TOKEN_LATENCY * estimate_tokens(text))
+    return text
+
+
+def _generation_config(response_schema):
+    """response_schema is a helpers.schemas model (or list[model]); Gemini then answers in that JSON shape."""
+    if response_schema is None:
+        return None
+    return {"response_mime_type": "application/json", "response_schema": response_schema}
+
+
+class StructuredStream:
+    """
+    Streamed text of a schema-constrained answer. Iterate it like any other call_gemini1 stream;
+    items() yields each top-level array item / object field as soon as it closes, and parsed()
+    finishes the stream if needed and returns the validated, typed object (None if the answer
+    did not conform). The JSON is parsed incrementally while the text streams.
+    """
+
+    def __init__(self, chunks, response_schema):
+        self._chunks = chunks
+        self._parts = []
+        self._parser = StreamingJSONParser()
+        self.partial = []
+        self.response_schema = response_schema
+
+    def __iter__(self):
+        for part in self._chunks:
+            self._parts.append(part)
+            self.partial.extend(self._parser.feed(part))
+            yield part
+
+    def items(self):
+        """(path, value) pairs for completed items/fields, yielded while the answer streams."""
+        seen = 0
+        for _ in self:
+            while seen < len(self.partial):
+                yield self.partial[seen]
+                seen += 1
+        yield from self.partial[seen:]
+
+    def text(self):
+        for _ in self:
+            pass
+        return "".join(self._parts)
+
+    def parsed(self):
+        text = self.text()
+        data = self._parser.close()
+        result = parse_as(self.response_schema, data if data is not None else text)
+        if result is None:
+            llm_usage.record_parse_failure()
+        return result
+
+
+def call_gemini(prompt, model="gemini-1.5-flash", response_schema=None):
+    """Direct call to Gemini API"""
+    if LLM_BACKEND == "fake":
+        text = _fake_generate(prompt, response_schema).strip()
+    else:
+        response = client.models.generate_content(
+            model=model, contents=prompt, config=_generation_config(response_schema)
+        )
+        text = response.text.strip()
+    llm_usage.record(prompt, len(text))
+    return text
+
+
+def call_gemini_structured(prompt, response_schema, model="gemini-1.5-flash", retries=1):
+    """Non-streaming call that returns the typed object; re-asks up to `retries` times if it does not conform."""
+    for attempt in range(retries + 1):
+        result = parse_as(response_schema, call_gemini(prompt, model, response_schema))
+        if result is not None:
+            return result
+        llm_usage.record_parse_failure(retried=attempt < retries)
+    return None
+
+
+def call_gemini1(prompt, model="gemini-1.5-flash", response_schema=None):
+    """Call Gemini API with streaming if supported; with a response_schema the stream also offers parsed()"""
+    stream = _stream_gemini(prompt, model, response_schema)
+    return StructuredStream(stream, response_schema) if response_schema is not None else stream
 
 
-def call_gemini(prompt, model="gemini-1.5-flash"): 
-    """Direct call to Gemini API""" 
-    response = client.models.generate_content( model=model, contents=prompt ) 
-    return response.text.strip()
+def _stream_gemini(prompt, model, response_schema):
+    if LLM_BACKEND == "fake":
+        text = _fake_generate(prompt, response_schema)
+        llm_usage.record(prompt, len(text))
+        for i in range(0, len(text), 64):
+            yield text[i:i + 64]
+        return
 
-def call_gemini1(prompt, model="gemini-1.5-flash"):
-    """Call Gemini API with streaming if supported"""
     stream = client.models.generate_content_stream(
         model=model,
         contents=prompt,
-        
+        config=_generation_config(response_schema)
     )
 
+    # Chunks are yielded unstripped: newlines at chunk boundaries separate list items
+    output_chars = 0
     for response in stream:
-        yield response.text.strip()
+        if response.text:
+            output_chars += len(response.text)
+            yield response.text
+    llm_usage.record(prompt, output_chars)
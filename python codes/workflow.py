@@ -10,78 +10,13 @@ from workflow_fun.regulat import *
 from calendar_.calender import *
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from utils import *
+from sample_docs import SAMPLE_FIR
 
 from collections import Counter
 
 
 
-doc_text ="""
-STATE OF MAHARASHTRA
-IN THE COURT OF THE CHIEF JUDICIAL MAGISTRATE, MUMBAI
-
-Case No.: 2056/2025
-Date: 14/09/2025
-
-The State vs. Amit Mehra
-
-Complainant / Informant:
-Name: Sunita Joshi
-Address: 24, Carter Road, Bandra, Mumbai
-Contact: 9876504321
-
-Accused:
-Name: Amit Mehra
-Address: 78, Shivaji Nagar, Mumbai
-Age: 35
-Gender: Male
-
-Police Station: Dadar Police Station, Mumbai
-FIR No.: 3012/2025
-Date & Time of Occurrence: 10/09/2025, 11:15 AM
-Place of Occurrence: Shop No. 14, Hill Road, Bandra
-
-Sections of Law Invoked:
-
-Section 420 IPC – Cheating and dishonestly inducing delivery of property
-
-Section 468 IPC – Forgery for purpose of cheating
-
-Section 34 IPC – Acts done by several persons in furtherance of common intention
-
-Facts of the Case
-
-On 10th September 2025, at approximately 11:15 AM, the accused, Amit Mehra, presented forged documents to the complainant, Sunita Joshi, for the purpose of obtaining a business loan. After suspicion arose, the complainant verified the documents with the issuing authority and found them to be fabricated.
-
-The complainant immediately reported the matter to the Dadar Police Station, where FIR No. 3012/2025 was registered.
-
-Evidence Collected
-
-Forged business documents submitted by the accused
-
-Verification reports from the issuing authority dated 12/09/2025
-
-Statements of witnesses recorded on 13/09/2025
-
-CCTV footage of the accused visiting the complainant’s office
-
-Investigation
-
-The investigation is ongoing. The accused has been summoned to appear before the Court on 20/09/2025. Further statements of witnesses are scheduled to be recorded on 25/09/2025.
-
-Prayer
-
-It is respectfully prayed that this Hon’ble Court may:
-
-Take cognizance of the offences against Amit Mehra
-
-Summon the accused to appear before the Court for trial on 20/09/2025
-
-Direct further proceedings as per law
-
-Investigating Officer: Inspector Ramesh Desai
-Date: 15/09/2025
-Place: Mumbai
-"""
+doc_text = SAMPLE_FIR
 future_dates = extract_future_dates_with_context(doc_text)
 
 if future_dates:
@@ -1,63 +1,115 @@
 from classes.contracts import *
+from helpers.executor import DEFAULT_MAX_CONCURRENCY, bounded_map, imap_bounded
+from helpers.fused import DEFAULT_FUSED_BATCH_SIZE, fused_parts, run_fused_analysis
+from helpers.dedup import cluster_clauses
+from helpers.display import normalize_explained_clauses, render_markdown
+from helpers.schemas import ContractAttributes, ContractExplanation, typed
+from helpers.outputs import ATTRIBUTES, CLAUSES, DATES, EXPLANATIONS, OVERVIEW, SUMMARY, OutputPlan, document_overview, extract_dates
+from helpers.sinks import closes_sink
 
-def contract_workflow(chunks):
+# Stage -> the outputs it feeds (directly or through a later stage)
+CONTRACT_STAGES = {
+    "extract_clauses": {CLAUSES, ATTRIBUTES, EXPLANATIONS, SUMMARY},
+    "classify_level2": {CLAUSES},
+    "attributes": {ATTRIBUTES, EXPLANATIONS, SUMMARY},
+    "explain": {EXPLANATIONS, SUMMARY},
+    "summary": {SUMMARY},
+    "dates": {DATES},
+    "overview": {OVERVIEW},
+}
+
+
+@closes_sink
+def contract_workflow(chunks, max_concurrency=DEFAULT_MAX_CONCURRENCY, fused=False, fused_batch_size=DEFAULT_FUSED_BATCH_SIZE, near_dedup=True,
+                      local_normalize=True, polish=False, sink=None, outputs=None):
+    """
+    Returns (summary, explained clauses). With `outputs` (e.g. ["attributes"]) only the stages those
+    outputs need run, and a dict of the requested outputs plus "skipped_stages" is returned.
+    """
+    plan = OutputPlan("contract_workflow", CONTRACT_STAGES, outputs or [SUMMARY, EXPLANATIONS])
+    plan.report(sink)
     contract_ = contracts(chunks)
     all_clauses = []
 
-    print("Extracting contract clauses in streaming mode...\n")
-    for chunk in chunks:
-        clause_stream = contract_.extract_contract_clauses(chunk)  # should return a generator
-        clause_text = ""
-        for partial in clause_stream:
-            print(partial, end="", flush=True)  # stream to terminal
-            clause_text += partial
+    sink.stage_started("extract_clauses", "Extracting contract clauses in streaming mode...\n")
+    for clause_text in imap_bounded(lambda chunk: sink.collect("extract_clauses", contract_.extract_contract_clauses(chunk)),
+                                   chunks if plan.needs("extract_clauses") else [], max_concurrency):
         clauses = [c.strip() for c in clause_text.split("\n") if c.strip()]
         all_clauses.extend(clauses)
+    sink.stage_finished("extract_clauses", clauses=len(all_clauses))
 
     # Deduplicate
     unique_clauses = list(dict.fromkeys(all_clauses))
 
-    contract_results = []
-    for clause in unique_clauses:
-        level2_stream = contract_.classify_contract_level2(clause)  # generator
-        sub_category = ""
-        for part in level2_stream:
-            print(part, end="", flush=True)
-            sub_category += part
-        contract_results.append({
-            "clause": clause,
-            "sub_category": sub_category
-        })
-
-    contract_attributes = []
-    for clause in unique_clauses:
-        attr_stream = contract_.extract_contract_attributes(clause)
-        details = ""
-        for part in attr_stream:
-            print(part, end="", flush=True)
-            details += part
-        contract_attributes.append({
-            "clause": clause,
-            "attributes": details
-        })
-
-    explained_contract_clauses = []
-    for clause in contract_attributes:
-        explain_stream = contract_.explain_contract_clause(clause)
-        details = ""
-        for part in explain_stream:
-            print(part, end="", flush=True)
-            details += part
-        explained_contract_clauses.append({
-            "clause": clause,
-            "analysis": details
-        })
-
-    # Summarize with streaming if possible
-    summary_stream = contract_.makenice(explained_contract_clauses)
-    summary_text = ""
-    for part in summary_stream:
-        print(part, end="", flush=True)
-        summary_text += part
-
-    return summary_text, explained_contract_clauses
+    # Reworded repeats share one set of per-clause LLM calls
+    clusters = cluster_clauses(unique_clauses) if near_dedup else None
+    targets = clusters.representatives if clusters else unique_clauses
+
+    def analyse_clause(clause):
+        sub_category = attributes = explanation = None
+        if plan.needs("classify_level2"):
+            sub_category = sink.collect("classify_level2", contract_.classify_contract_level2(clause))
+        if plan.needs("attributes"):
+            attributes = {
+                "clause": clause,
+                "attributes": sink.collect("attributes", contract_.extract_contract_attributes(clause))
+            }
+        if plan.needs("explain"):
+            explanation = {"clause": attributes, "analysis": sink.collect("explain", contract_.explain_contract_clause(attributes))}
+        return {"clause": clause, "sub_category": sub_category}, attributes, explanation
+
+    def from_fused(clause, item):
+        attributes = explanation = None
+        if plan.needs("attributes"):
+            attributes = {"clause": clause, "attributes": item.Attributes.model_dump_json()}
+        if plan.needs("explain"):
+            analysis = ContractExplanation(Explanation=item.Explanation, PracticalEffect=item.PracticalEffect).model_dump_json()
+            explanation = {"clause": attributes, "analysis": analysis}
+        sub_category = item.SubCategory if plan.needs("classify_level2") else None
+        return {"clause": clause, "sub_category": sub_category}, attributes, explanation
+
+    per_clause_stages = [s for s in ("classify_level2", "attributes", "explain") if plan.needs(s)]
+    if not per_clause_stages:
+        analysed = [({"clause": clause, "sub_category": None}, None, None) for clause in targets]
+    elif fused:
+        # One call per clause batch asking only for the parts the plan needs; clauses the fused answer
+        # misses go through the three-stage path
+        parts = fused_parts(plan)
+        analysed, fused_stats = run_fused_analysis(
+            targets, lambda batch: contract_.analyze_contract_clauses_fused(batch, parts), from_fused, analyse_clause,
+            required_keys=parts,
+            batch_size=fused_batch_size, max_concurrency=max_concurrency, sink=sink
+        )
+        sink.stage_finished("fused_analysis", f"Fused clause analysis: {fused_stats}", **fused_stats)
+    else:
+        analysed = bounded_map(analyse_clause, targets, max_concurrency)
+
+    if clusters:
+        analysed = clusters.fan_out(analysed)
+        sink.stage_finished("near_dedup", f"Near-duplicate clauses: {clusters.report(calls_per_clause=0 if fused else len(per_clause_stages))}")
+    contract_results = [a[0] for a in analysed]
+    contract_attributes = [a[1] for a in analysed]
+    explained_contract_clauses = [a[2] for a in analysed]
+
+    summary_text = None
+    if plan.needs("summary") and local_normalize:
+        # Merge duplicate cells, drop null columns and group repeated keys locally
+        summary_text = render_markdown(normalize_explained_clauses(explained_contract_clauses))
+        if polish:
+            summary_text = sink.stream("summary", contract_.polish_contract_overview(summary_text))
+        else:
+            sink.item_completed("summary", summary_text)
+    elif plan.needs("summary"):
+        # Summarize with streaming if possible
+        summary_text = sink.stream("summary", contract_.makenice(explained_contract_clauses))
+
+    if outputs is None:
+        return summary_text, explained_contract_clauses
+    return plan.result(
+        summary=summary_text,
+        clauses=contract_results,
+        attributes=typed(ContractAttributes, contract_attributes),
+        explanations=typed(ContractExplanation, explained_contract_clauses, key="analysis"),
+        dates=extract_dates("\n".join(chunks)) if plan.needs("dates") else None,
+        overview=document_overview(chunks, max_concurrency) if plan.needs("overview") else None
+    )
@@ -1,19 +1,47 @@
+import json
+
 from classes.corp import *
+from helpers.executor import DEFAULT_MAX_CONCURRENCY, bounded_map, imap_bounded
+from helpers.dedup import cluster_clauses
+from helpers.json_utils import loads_lenient
+from helpers.merge import UNION, apply_resolutions, merge_records
+from helpers.outputs import ATTRIBUTES, CLAUSES, DATES, EXPLANATIONS, OVERVIEW, SUMMARY, OutputPlan, document_overview, extract_dates
+from helpers.schemas import ClauseExplanation, typed
+from helpers.sinks import closes_sink
+
+# Stage -> the outputs it feeds (directly or through a later stage)
+CORPORATE_STAGES = {
+    "extract_clauses": {CLAUSES, ATTRIBUTES, EXPLANATIONS, SUMMARY},
+    "classify_document": {ATTRIBUTES, SUMMARY},
+    "merge": {ATTRIBUTES, SUMMARY},
+    "explain": {EXPLANATIONS},
+    "summary": {SUMMARY},
+    "dates": {DATES},
+    "overview": {OVERVIEW},
+}
+
 
-def corp_workflow(chunks):
+@closes_sink
+def corp_workflow(chunks, max_concurrency=DEFAULT_MAX_CONCURRENCY, near_dedup=True,
+                  local_merge=False, resolve_conflicts=True, sink=None, outputs=None):
+    """
+    Returns (summary, streamed parts of the merged JSON). With `outputs` (e.g. ["explanations"]) only the stages those
+    outputs need run, and a dict of the requested outputs plus "skipped_stages" is returned.
+    local_merge replaces the single LLM merge with one attribute extraction per distinct clause,
+    combined locally.
+    """
+    plan = OutputPlan("corp_workflow", CORPORATE_STAGES, outputs or [SUMMARY, ATTRIBUTES])
+    plan.report(sink)
     corp_ = corp(chunks)
 
-    print("Extracting corporate clauses in streaming mode...\n")
+    sink.stage_started("extract_clauses", "Extracting corporate clauses in streaming mode...\n")
     all_corp_clauses = []
 
-    for ch in chunks:
-        clause_stream = corp_.extract_corporate_clauses(ch)  # generator
-        _txt = ""
-        for part in clause_stream:
-            print(part, end="", flush=True)
-            _txt += part
+    for _txt in imap_bounded(lambda ch: sink.collect("extract_clauses", corp_.extract_corporate_clauses(ch)),
+                             chunks if plan.needs("extract_clauses") else [], max_concurrency):
         items = [i.strip() for i in _txt.splitlines() if i.strip() and any(c.isalnum() for c in i)]
         all_corp_clauses.extend(items)
+    sink.stage_finished("extract_clauses", clauses=len(all_corp_clauses))
 
     # Deduplicate
     seen = set()
@@ -24,44 +52,61 @@ def corp_workflow(chunks):
             seen.add(base)
             corporate_unique_clauses.append(base)
 
-    # Classify document type (streaming if supported)
-    doc_stream = corp_.classify_corporate_document("\n".join(chunks))  # generator
-    doc_pred = ""
-    for part in doc_stream:
-        print(part, end="", flush=True)
-        doc_pred += part
+    # Reworded repeats share one LLM call; the full clause list is still returned and merged locally
+    clusters = cluster_clauses(corporate_unique_clauses) if near_dedup else None
+    llm_clauses = clusters.representatives if clusters else corporate_unique_clauses
 
-    predicted_doc_type = None
-    try:
-        pred_obj = json.loads(doc_pred)
-        predicted_doc_type = pred_obj.get("PredictedDocumentType")
-    except Exception:
-        predicted_doc_type = None
+    merged_corporate = corporate_explanations = summary_text = None
+    if plan.needs("merge"):
+        # Classify document type (streaming if supported)
+        doc_stream = corp_.classify_corporate_document("\n".join(chunks))
+        sink.stream("classify_document", doc_stream)
 
-    corporate_attributes = [{"clause": c} for c in corporate_unique_clauses]
+        prediction = doc_stream.parsed()
+        predicted_doc_type = prediction.PredictedDocumentType if prediction else None
 
-    # Merge clauses (streaming if supported)
-    merge_stream = corp_.merge_corporate_clauses_with_llm(corporate_unique_clauses, predicted_doc_type=predicted_doc_type)
-    merged_corporate = []
-    for part in merge_stream:
-        print(part, end="", flush=True)
-        merged_corporate.append(part)
+        if local_merge:
+            # Extract attributes once per distinct clause and combine them locally; only disagreeing keys go back to the LLM
+            records = bounded_map(
+                lambda c: sink.collect("attributes", corp_.extract_corporate_attributes(c, predicted_doc_type=predicted_doc_type)),
+                llm_clauses,
+                max_concurrency
+            )
+            merged, conflicts = merge_records(records, strategies={"Directors": UNION, "ResolutionText": UNION, "OtherNotes": UNION}, date_range=None)
+            if conflicts:
+                sink.stage_finished("merge", f"Merge conflicts: {[c['key'] for c in conflicts]}", conflicts=len(conflicts))
+                if resolve_conflicts:
+                    resolved = loads_lenient(sink.collect("resolve_conflicts", corp_.resolve_merge_conflicts(conflicts)), {})
+                    merged = apply_resolutions(merged, conflicts, resolved)
+            merged_corporate = [json.dumps(merged, indent=2)]
+            sink.item_completed("merge", merged_corporate[0])
+        else:
+            # Merge clauses (streaming if supported)
+            merge_stream = corp_.merge_corporate_clauses_with_llm(llm_clauses, predicted_doc_type=predicted_doc_type)
+            merged_corporate = sink.stream_parts("merge", merge_stream)
 
-    # Explain top clauses (streaming if supported)
-    corporate_explanations = []
-    for c in corporate_unique_clauses[:10]:
-        explain_stream = corp_.explain_corporate_clause(c)  # generator
-        explanation = ""
-        for part in explain_stream:
-            print(part, end="", flush=True)
-            explanation += part
-        corporate_explanations.append({"clause": c, "analysis": explanation})
+    if plan.needs("explain"):
+        # Explain top clauses (streaming if supported)
+        explain = lambda c: sink.collect("explain", corp_.explain_corporate_clause(c))
+        top = corporate_unique_clauses[:10]
+        if clusters:
+            analyses, calls_saved = clusters.map_clusters(explain, len(top), max_concurrency)
+            sink.stage_finished("near_dedup", f"Near-duplicate clauses: {clusters.report(calls_saved=calls_saved)}")
+        else:
+            analyses = bounded_map(explain, top, max_concurrency)
+        corporate_explanations = [{"clause": c, "analysis": a} for c, a in zip(top, analyses)]
 
-    # Summarize (streaming)
-    summary_stream = corp_.summarize_corporate_from_json(merged_corporate)
-    summary_text = ""
-    for part in summary_stream:
-        print(part, end="", flush=True)
-        summary_text += part
+    if plan.needs("summary"):
+        # Summarize (streaming)
+        summary_text = sink.stream("summary", corp_.summarize_corporate_from_json(merged_corporate))
 
-    return summary_text, merged_corporate
+    if outputs is None:
+        return summary_text, merged_corporate
+    return plan.result(
+        summary=summary_text,
+        clauses=corporate_unique_clauses,
+        attributes=typed(None, ["".join(merged_corporate)]) if merged_corporate else None,
+        explanations=typed(ClauseExplanation, corporate_explanations, key="analysis"),
+        dates=extract_dates("\n".join(chunks)) if plan.needs("dates") else None,
+        overview=document_overview(chunks, max_concurrency) if plan.needs("overview") else None
+    )
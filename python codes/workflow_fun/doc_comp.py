@@ -1,4 +1,24 @@
-from classes.documentComparison import hybrid_difference_workflow
+from classes.documentComparison import DEFAULT_MAX_DETAILED, hybrid_difference_workflow, version_chain_workflow
+from helpers.artifacts import DEFAULT_CHUNK_OVERLAP, DEFAULT_CHUNK_SIZE, document_cache, document_from_text
+from helpers.executor import DEFAULT_MAX_CONCURRENCY
 
-def compare_documents_workflow(doc1_chunks, doc2_chunks, doc1_category, doc2_category):
-    return hybrid_difference_workflow(doc1_chunks, doc2_chunks, doc1_category, doc2_category)
\ No newline at end of file
+def compare_documents_workflow(doc1_chunks, doc2_chunks, doc1_category, doc2_category,
+                               max_detailed=DEFAULT_MAX_DETAILED, max_concurrency=DEFAULT_MAX_CONCURRENCY, use_cache=True):
+    return hybrid_difference_workflow(doc1_chunks, doc2_chunks, doc1_category, doc2_category,
+                                      max_detailed=max_detailed, max_concurrency=max_concurrency, use_cache=use_cache)
+
+def compare_texts_workflow(doc1_text, doc2_text, doc1_category, doc2_category, chunk_size=DEFAULT_CHUNK_SIZE,
+                           chunk_overlap=DEFAULT_CHUNK_OVERLAP, max_detailed=DEFAULT_MAX_DETAILED, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                           use_cache=True):
+    # Raw documents are chunked once per (content, chunking config) when cached
+    cache = document_cache if use_cache else None
+    doc1 = document_from_text(doc1_text, chunk_size, chunk_overlap, cache)
+    doc2 = document_from_text(doc2_text, chunk_size, chunk_overlap, cache)
+    return hybrid_difference_workflow(doc1, doc2, doc1_category, doc2_category,
+                                      max_detailed=max_detailed, max_concurrency=max_concurrency, use_cache=use_cache)
+
+def compare_versions_workflow(revisions, category=None, labels=None, max_detailed=DEFAULT_MAX_DETAILED,
+                              max_concurrency=DEFAULT_MAX_CONCURRENCY, use_cache=True):
+    # v1..vN in order: each delta against the previous revision, queried through the clause history
+    return version_chain_workflow(revisions, category, labels=labels, max_detailed=max_detailed,
+                                  max_concurrency=max_concurrency, use_cache=use_cache)
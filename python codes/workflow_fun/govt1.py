@@ -1,20 +1,47 @@
+import json
+
 from classes.govt import *
+from helpers.executor import DEFAULT_MAX_CONCURRENCY, bounded_map, imap_bounded
+from helpers.dedup import cluster_clauses
+from helpers.json_utils import loads_lenient
+from helpers.merge import UNION, apply_resolutions, merge_records
+from helpers.outputs import ATTRIBUTES, CLAUSES, DATES, EXPLANATIONS, OVERVIEW, SUMMARY, OutputPlan, document_overview, extract_dates
+from helpers.schemas import ClauseExplanation, typed
+from helpers.sinks import closes_sink
+
+# Stage -> the outputs it feeds (directly or through a later stage)
+GOVERNMENT_STAGES = {
+    "extract_clauses": {CLAUSES, ATTRIBUTES, EXPLANATIONS, SUMMARY},
+    "classify_document": {ATTRIBUTES, SUMMARY},
+    "merge": {ATTRIBUTES, SUMMARY},
+    "explain": {EXPLANATIONS},
+    "summary": {SUMMARY},
+    "dates": {DATES},
+    "overview": {OVERVIEW},
+}
 
 
-def govt_workflow(chunks):
+@closes_sink
+def govt_workflow(chunks, max_concurrency=DEFAULT_MAX_CONCURRENCY, near_dedup=True,
+                  local_merge=False, resolve_conflicts=True, sink=None, outputs=None):
+    """
+    Returns (summary, streamed parts of the merged JSON). With `outputs` (e.g. ["explanations"]) only the stages those
+    outputs need run, and a dict of the requested outputs plus "skipped_stages" is returned.
+    local_merge replaces the single LLM merge with one attribute extraction per distinct clause,
+    combined locally.
+    """
+    plan = OutputPlan("govt_workflow", GOVERNMENT_STAGES, outputs or [SUMMARY, ATTRIBUTES])
+    plan.report(sink)
     govt_ = govt(chunks)
 
-    print("Extracting government clauses in streaming mode...\n")
+    sink.stage_started("extract_clauses", "Extracting government clauses in streaming mode...\n")
     all_gov_clauses = []
 
-    for ch in chunks:
-        clause_stream = govt_.extract_government_clauses(ch)  # generator
-        _txt = ""
-        for part in clause_stream:
-            print(part, end="", flush=True)
-            _txt += part
+    for _txt in imap_bounded(lambda ch: sink.collect("extract_clauses", govt_.extract_government_clauses(ch)),
+                             chunks if plan.needs("extract_clauses") else [], max_concurrency):
         items = [i.strip() for i in _txt.splitlines() if i.strip() and any(c.isalnum() for c in i)]
         all_gov_clauses.extend(items)
+    sink.stage_finished("extract_clauses", clauses=len(all_gov_clauses))
 
     # Deduplicate while preserving order
     seen = set()
@@ -25,42 +52,61 @@ def govt_workflow(chunks):
             seen.add(base)
             government_unique_clauses.append(base)
 
-    # Classify document type (streaming if supported)
-    doc_stream = govt_.classify_government_document("\n".join(chunks))  # generator
-    doc_pred = ""
-    for part in doc_stream:
-        print(part, end="", flush=True)
-        doc_pred += part
+    # Reworded repeats share one LLM call; the full clause list is still returned and merged locally
+    clusters = cluster_clauses(government_unique_clauses) if near_dedup else None
+    llm_clauses = clusters.representatives if clusters else government_unique_clauses
+
+    merged_government = government_explanations = summary_text = None
+    if plan.needs("merge"):
+        # Classify document type (streaming if supported)
+        doc_stream = govt_.classify_government_document("\n".join(chunks))
+        sink.stream("classify_document", doc_stream)
 
-    predicted_doc_type = None
-    try:
-        pred_obj = json.loads(doc_pred)
-        predicted_doc_type = pred_obj.get("PredictedDocumentType")
-    except Exception:
-        pass
+        prediction = doc_stream.parsed()
+        predicted_doc_type = prediction.PredictedDocumentType if prediction else None
 
-    # Merge clauses (streaming if supported)
-    merge_stream = govt_.merge_government_clauses_with_llm(government_unique_clauses, predicted_doc_type=predicted_doc_type)
-    merged_government = []
-    for part in merge_stream:
-        print(part, end="", flush=True)
-        merged_government.append(part)
+        if local_merge:
+            # Extract attributes once per distinct clause and combine them locally; only disagreeing keys go back to the LLM
+            records = bounded_map(
+                lambda c: sink.collect("attributes", govt_.extract_government_attributes(c, predicted_doc_type=predicted_doc_type)),
+                llm_clauses,
+                max_concurrency
+            )
+            merged, conflicts = merge_records(records, strategies={"OtherNotes": UNION}, date_range=None)
+            if conflicts:
+                sink.stage_finished("merge", f"Merge conflicts: {[c['key'] for c in conflicts]}", conflicts=len(conflicts))
+                if resolve_conflicts:
+                    resolved = loads_lenient(sink.collect("resolve_conflicts", govt_.resolve_merge_conflicts(conflicts)), {})
+                    merged = apply_resolutions(merged, conflicts, resolved)
+            merged_government = [json.dumps(merged, indent=2)]
+            sink.item_completed("merge", merged_government[0])
+        else:
+            # Merge clauses (streaming if supported)
+            merge_stream = govt_.merge_government_clauses_with_llm(llm_clauses, predicted_doc_type=predicted_doc_type)
+            merged_government = sink.stream_parts("merge", merge_stream)
 
-    # Explain top clauses (streaming)
-    government_explanations = []
-    for c in government_unique_clauses[:10]:
-        explain_stream = govt_.explain_government_clause(c)  # generator
-        explanation = ""
-        for part in explain_stream:
-            print(part, end="", flush=True)
-            explanation += part
-        government_explanations.append({"clause": c, "analysis": explanation})
+    if plan.needs("explain"):
+        # Explain top clauses (streaming if supported)
+        explain = lambda c: sink.collect("explain", govt_.explain_government_clause(c))
+        top = government_unique_clauses[:10]
+        if clusters:
+            analyses, calls_saved = clusters.map_clusters(explain, len(top), max_concurrency)
+            sink.stage_finished("near_dedup", f"Near-duplicate clauses: {clusters.report(calls_saved=calls_saved)}")
+        else:
+            analyses = bounded_map(explain, top, max_concurrency)
+        government_explanations = [{"clause": c, "analysis": a} for c, a in zip(top, analyses)]
 
-    # Summarize (streaming)
-    summary_stream = govt_.summarize_government_from_json(merged_government)
-    summary_text = ""
-    for part in summary_stream:
-        print(part, end="", flush=True)
-        summary_text += part
+    if plan.needs("summary"):
+        # Summarize (streaming)
+        summary_text = sink.stream("summary", govt_.summarize_government_from_json(merged_government))
 
-    return summary_text, merged_government
+    if outputs is None:
+        return summary_text, merged_government
+    return plan.result(
+        summary=summary_text,
+        clauses=government_unique_clauses,
+        attributes=typed(None, ["".join(merged_government)]) if merged_government else None,
+        explanations=typed(ClauseExplanation, government_explanations, key="analysis"),
+        dates=extract_dates("\n".join(chunks)) if plan.needs("dates") else None,
+        overview=document_overview(chunks, max_concurrency) if plan.needs("overview") else None
+    )
@@ -1,82 +1,152 @@
 from classes.litigation import litigation
+from helpers.executor import DEFAULT_MAX_CONCURRENCY, bounded_map, imap_bounded
+from helpers.fused import DEFAULT_FUSED_BATCH_SIZE, fused_parts, run_fused_analysis
+from helpers.dedup import cluster_clauses
+from helpers.outputs import ATTRIBUTES, CLAUSES, DATES, EXPLANATIONS, OVERVIEW, SUMMARY, OutputPlan, document_overview, extract_dates
+from helpers.schemas import CriminalAttributes, CriminalExplanation, typed
+from helpers.sinks import closes_sink
 
-def litigation_workflow(chunks):
+# Stage -> the outputs it feeds (directly or through a later stage)
+LITIGATION_STAGES = {
+    "extract_clauses": {CLAUSES, ATTRIBUTES, EXPLANATIONS, SUMMARY},
+    "classify_level2": {CLAUSES},
+    "attributes": {ATTRIBUTES, EXPLANATIONS, SUMMARY},
+    "explain": {EXPLANATIONS, SUMMARY},
+    "case_details": {SUMMARY},
+    "summary": {SUMMARY},
+    "dates": {DATES},
+    "overview": {OVERVIEW},
+}
+
+
+@closes_sink
+def litigation_workflow(chunks, max_concurrency=DEFAULT_MAX_CONCURRENCY, fused=False, fused_batch_size=DEFAULT_FUSED_BATCH_SIZE, near_dedup=True, citation_mode="regex", use_statute_kb=True, sink=None,
+                        outputs=None):
+    """
+    Returns (summary, [case details] + explained clauses). With `outputs` (e.g. ["clauses"]) only the
+    stages those outputs need run, and a dict of the requested outputs plus "skipped_stages" is returned.
+    """
+    plan = OutputPlan("litigation_workflow", LITIGATION_STAGES, outputs or [SUMMARY])
+    plan.report(sink)
     litigation_ = litigation(chunks)
     all_clauses = []
 
-    print("Extracting clauses in streaming mode...\n")
+    sink.stage_started("extract_clauses", "Extracting clauses in streaming mode...\n")
+
+    def extract_chunk(chunk):
+        if citation_mode == "regex":
+            citations, doubtful = litigation_.extract_citations_local(chunk)
+            if not doubtful:
+                sink.item_completed("extract_clauses", "\n".join(citations))
+                return "\n".join(citations)
+            # Some sections could not be attributed to a known act: let the LLM list them too
+            return "\n".join(citations + [sink.collect("extract_clauses", litigation_.extract_clauses(chunk))])
+        return sink.collect("extract_clauses", litigation_.extract_clauses(chunk))
 
-    for chunk in chunks:
-        clause_stream = litigation_.extract_clauses(chunk)  # now this should return a generator
-        clause_text = ""
-        for partial in clause_stream:
-            print(partial, end="", flush=True)  # stream to terminal
-            clause_text += partial
+    # Chunks are independent, so their extraction calls run side by side
+    for clause_text in imap_bounded(extract_chunk, chunks if plan.needs("extract_clauses") else [], max_concurrency):
         clauses = [c.strip() for c in clause_text.split("\n") if c.strip()]
         all_clauses.extend(clauses)
+    sink.stage_finished("extract_clauses", clauses=len(all_clauses))
 
     # Deduplicate
     unique_clauses = list(dict.fromkeys(all_clauses))
 
-    criminal_results = []
-    for clause in unique_clauses:
-        # Assu*
-        # ing classify_criminal_level2 can also stream
-        category_stream = litigation_.classify_criminal_level2(clause)
-        sub_category = ""
-        for part in category_stream:
-            print(part, end="", flush=True)
-            sub_category += part
-        criminal_results.append({
-            "clause": clause,
-            "sub_category": sub_category
-        })
-
-    criminal_attributes = []
-    for clause in unique_clauses:
-        attr_stream = litigation_.extract_criminal_attributes(clause)
-        details = ""
-        for part in attr_stream:
-            print(part, end="", flush=True)
-            details += part
-        criminal_attributes.append({
-            "clause": clause,
-            "attributes": details
-        })
-        
-
-    explained_clauses = []
-    for clause in criminal_attributes:
-        explanation_stream = litigation_.explain_criminal_clause(clause)
-        explanation = ""
-        for part in explanation_stream:
-            print(part, end="", flush=True)
-            explanation += part
-        explained_clauses.append({
-            "clause": clause,
-            "analysis": explanation
-        })
-
-    # Case details (can also stream if supported)
-    detailed_clauses = []
-    for clause in chunks:
-        details_stream = litigation_.extract_case_details(clause)
-        details_text = ""
-        for part in details_stream:
-            print(part, end="", flush=True)
-            details_text += part
-        detailed_clauses.append({
-            "case_details": details_text
-        })
-
-    cleaned = litigation_.deduplicate_details(detailed_clauses)
-    final_jason = [cleaned] + explained_clauses
-
-    summary_stream = litigation_.summarize_with_advice(final_jason)
-    summary_text = ""
-    for part in summary_stream:
-        print(part, end="", flush=True)
-        summary_text += part
-
-    return summary_text, final_jason
+    # Reworded repeats ("Sec. 420 of IPC") share one set of per-clause LLM calls
+    clusters = cluster_clauses(unique_clauses) if near_dedup else None
+    targets = clusters.representatives if clusters else unique_clauses
+
+    def analyse_clause(clause):
+        sub_category = attributes = explanation = None
+        if plan.needs("classify_level2"):
+            sub_category = sink.collect("classify_level2", litigation_.classify_criminal_level2(clause))
+        if plan.needs("attributes"):
+            attributes = {
+                "clause": clause,
+                "attributes": sink.collect("attributes", litigation_.extract_criminal_attributes(clause))
+            }
+        if plan.needs("explain"):
+            # Known sections are explained from the local statute knowledge base without an LLM call
+            explain = litigation_.explain_criminal_clause_kb if use_statute_kb else litigation_.explain_criminal_clause
+            explanation = {"clause": attributes, "analysis": sink.collect("explain", explain(attributes))}
+        return {"clause": clause, "sub_category": sub_category}, attributes, explanation
+
+    # Sections the statute knowledge base explains are not asked for an explanation in fused mode
+    parts = fused_parts(plan)
+    known = {}
+    if fused and "Explanation" in parts and use_statute_kb:
+        known = {clause: litigation_.kb_explanation(clause) for clause in targets}
+        known = {clause: explanation for clause, explanation in known.items() if explanation is not None}
+
+    def from_fused(clause, item):
+        attributes = explanation = None
+        if plan.needs("attributes"):
+            attributes = {"clause": clause, "attributes": item.Attributes.model_dump_json()}
+        if plan.needs("explain"):
+            analysis = known.get(clause)
+            if analysis is None:
+                analysis = CriminalExplanation(Explanation=item.Explanation, PunishmentDetails=item.PunishmentDetails)
+                if use_statute_kb:
+                    litigation_.learn_explanation(clause, analysis)
+            explanation = {"clause": attributes, "analysis": analysis.model_dump_json(indent=2, exclude_none=True)}
+        sub_category = item.SubCategory if plan.needs("classify_level2") else None
+        return {"clause": clause, "sub_category": sub_category}, attributes, explanation
+
+    def analyse_fused(group):
+        clauses, group_parts = group
+        return run_fused_analysis(
+            clauses, lambda batch: litigation_.analyze_criminal_clauses_fused(batch, group_parts), from_fused, analyse_clause,
+            required_keys=group_parts, batch_size=fused_batch_size, max_concurrency=max_concurrency, sink=sink
+        )
+
+    per_clause_stages = [s for s in ("classify_level2", "attributes", "explain") if plan.needs(s)]
+    if not per_clause_stages:
+        analysed = [({"clause": clause, "sub_category": None}, None, None) for clause in targets]
+    elif fused:
+        # One call per clause batch asking only for the parts the plan needs; clauses the fused answer
+        # misses go through the three-stage path
+        groups = [([c for c in targets if c not in known], parts),
+                  ([c for c in targets if c in known], [part for part in parts if part != "Explanation"])]
+        groups = [(clauses, group_parts) for clauses, group_parts in groups if clauses and group_parts]
+        by_clause, fused_stats = {}, {"clauses": 0, "fused_calls": 0, "fallback_clauses": 0, "kb_explanations": len(known)}
+        for (clauses, _), (results, stats) in zip(groups, bounded_map(analyse_fused, groups, max_concurrency)):
+            by_clause.update(zip(clauses, results))
+            for key, value in stats.items():
+                fused_stats[key] += value
+        analysed = [by_clause[clause] for clause in targets]
+        sink.stage_finished("fused_analysis", f"Fused clause analysis: {fused_stats}", **fused_stats)
+    else:
+        # Every clause runs its own classify -> attributes -> explain chain; clauses run concurrently
+        analysed = bounded_map(analyse_clause, targets, max_concurrency)
+
+    if clusters:
+        analysed = clusters.fan_out(analysed)
+        sink.stage_finished("near_dedup", f"Near-duplicate clauses: {clusters.report(calls_per_clause=0 if fused else len(per_clause_stages))}")
+    criminal_results = [a[0] for a in analysed]
+    criminal_attributes = [a[1] for a in analysed]
+    explained_clauses = [a[2] for a in analysed]
+
+    summary_text = final_jason = None
+    if plan.needs("summary"):
+        # Case details (can also stream if supported)
+        detailed_clauses = bounded_map(
+            lambda clause: {"case_details": sink.collect("case_details", litigation_.extract_case_details(clause))},
+            chunks,
+            max_concurrency
+        )
+
+        cleaned = litigation_.deduplicate_details(detailed_clauses)
+        final_jason = [cleaned] + explained_clauses
+
+        summary_text = sink.stream("summary", litigation_.summarize_with_advice(final_jason))
 
+    if outputs is None:
+        return summary_text, final_jason
+    return plan.result(
+        summary=summary_text,
+        clauses=criminal_results,
+        attributes=typed(CriminalAttributes, criminal_attributes),
+        explanations=typed(CriminalExplanation, explained_clauses, key="analysis"),
+        dates=extract_dates("\n".join(chunks)) if plan.needs("dates") else None,
+        overview=document_overview(chunks, max_concurrency) if plan.needs("overview") else None
+    )
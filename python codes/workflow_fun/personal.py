@@ -1,71 +1,154 @@
 from classes.pers import *
+from helpers.executor import DEFAULT_MAX_CONCURRENCY, bounded_map, imap_bounded
+from helpers.dedup import cluster_clauses
+from helpers.identifiers import unresolved_fields
+from helpers.json_utils import loads_lenient
+from helpers.merge import UNION, apply_resolutions, merge_records
+from helpers.outputs import ATTRIBUTES, CLAUSES, DATES, EXPLANATIONS, OVERVIEW, SUMMARY, OutputPlan, document_overview, extract_dates
+from helpers.schemas import ClauseExplanation, typed
+from helpers.sinks import closes_sink
 
-def personal_workflow(chunks, category, doc_text):
+# Stage -> the outputs it feeds (directly or through a later stage)
+PERSONAL_STAGES = {
+    "identifiers": {ATTRIBUTES, SUMMARY},
+    "extract_clauses": {CLAUSES, ATTRIBUTES, EXPLANATIONS, SUMMARY},
+    "classify_level2": {CLAUSES},
+    "classify_document": {ATTRIBUTES, EXPLANATIONS, SUMMARY},
+    "attributes": {ATTRIBUTES, EXPLANATIONS, SUMMARY},
+    "explain": {EXPLANATIONS},
+    "merge": {ATTRIBUTES, SUMMARY},
+    "summary": {SUMMARY},
+    "dates": {DATES},
+    "overview": {OVERVIEW},
+}
+
+
+@closes_sink
+def personal_workflow(chunks, category, doc_text, max_concurrency=DEFAULT_MAX_CONCURRENCY, near_dedup=True,
+                      local_identifiers=True, local_merge=True, resolve_conflicts=True, sink=None, outputs=None):
+    """
+    Returns (summary, streamed parts of the merged JSON). With `outputs` (e.g. ["clauses"]) only the stages those
+    outputs need run, and a dict of the requested outputs plus "skipped_stages" is returned.
+    """
+    stages = dict(PERSONAL_STAGES)
+    if not local_merge:
+        # The LLM merge reads the explained clauses
+        stages["explain"] = stages["explain"] | {ATTRIBUTES, SUMMARY}
+    plan = OutputPlan("personal_workflow", stages, outputs or [SUMMARY, ATTRIBUTES])
+    plan.report(sink)
     personal_ = pers(chunks)
+    dates = extract_dates(doc_text) if plan.needs("dates") else None
+    overview = document_overview(chunks, max_concurrency) if plan.needs("overview") else None
+
+    # Identity documents (Aadhaar, PAN, passport, driving licence) are filled locally;
+    # the LLM is asked only for what the validators could not resolve, then for the summary.
+    # Clause-level outputs still need the clause path below.
+    if local_identifiers and plan.needs("identifiers") and not set(plan.requested) & {CLAUSES, EXPLANATIONS}:
+        fields, doc_type = personal_.extract_identity_attributes_local(doc_text)
+        if doc_type:
+            missing = unresolved_fields(fields)
+            sink.stage_finished("identifiers", f"Local identifier extraction: {doc_type}, {len(fields) - len(missing)}/{len(fields)} fields resolved",
+                                document_type=doc_type, unresolved=missing)
+            if missing:
+                fill_stream = personal_.fill_missing_personal_fields(doc_text, missing, doc_type)
+                sink.collect("fill_missing", fill_stream)
+                filled = fill_stream.parsed()
+                if filled:
+                    filled = filled.model_dump(by_alias=True)
+                    fields.update({k: filled[k] for k in missing if filled.get(k)})
+            merged = {k: (v if v is not None else "Not available") for k, v in fields.items()}
+            js = [json.dumps(merged, indent=2)]
+            sink.item_completed("merge", js[0])
+
+            summary_text = None
+            if plan.needs("summary"):
+                summary_text = sink.stream("summary", personal_.generate_summary_from_json(merged))
+            if outputs is None:
+                return summary_text, js
+            return plan.result(summary=summary_text, attributes=typed(None, js), dates=dates, overview=overview)
+
     all_clauses = []
 
-    print("Extracting personal legal clauses in streaming mode...\n")
-    for chunk in chunks:
-        clause_stream = personal_.extract_clauses(chunk)  # should return a generator
-        clause_text = ""
-        for part in clause_stream:
-            print(part, end="", flush=True)  # stream to terminal
-            clause_text += part
+    sink.stage_started("extract_clauses", "Extracting personal legal clauses in streaming mode...\n")
+    for clause_text in imap_bounded(lambda chunk: sink.collect("extract_clauses", personal_.extract_clauses(chunk)),
+                                   chunks if plan.needs("extract_clauses") else [], max_concurrency):
         clauses = [c.strip() for c in clause_text.split("\n") if c.strip()]
         all_clauses.extend(clauses)
+    sink.stage_finished("extract_clauses", clauses=len(all_clauses))
 
     # Deduplicate while preserving order
     unique_clauses = list(dict.fromkeys(all_clauses))
 
+    # Reworded repeats share one set of per-clause LLM calls
+    clusters = cluster_clauses(unique_clauses) if near_dedup else None
+    targets = clusters.representatives if clusters else unique_clauses
+
     # Classify Level 2 clauses
-    personal_results = []
-    for clause in unique_clauses:
-        level2_stream = personal_.classify_personal_level2(clause)  # generator
-        sub_category = ""
-        for part in level2_stream:
-            print(part, end="", flush=True)
-            sub_category += part
-        personal_results.append({"clause": clause, "sub_category": sub_category})
+    if plan.needs("classify_level2"):
+        personal_results = bounded_map(
+            lambda clause: {"clause": clause, "sub_category": sink.collect("classify_level2", personal_.classify_personal_level2(clause))},
+            targets,
+            max_concurrency
+        )
+    else:
+        personal_results = [{"clause": clause, "sub_category": None} for clause in targets]
 
     # Predict document type (streaming if supported)
-    doc_stream = personal_.classify_personal_document(doc_text)  # generator
-    doc_type_prediction = ""
-    for part in doc_stream:
-        print(part, end="", flush=True)
-        doc_type_prediction += part
-
-    # Extract attributes for each clause
-    personal_attributes = []
-    for clause in unique_clauses:
-        attr_stream = personal_.extract_personal_attributes(clause, predicted_doc_type=doc_type_prediction)  # generator
-        details = ""
-        for part in attr_stream:
-            print(part, end="", flush=True)
-            details += part
-        personal_attributes.append({"clause": clause, "attributes": details})
-
-    # Explain clauses
-    explained_personal_clauses = []
-    for clause in personal_attributes:
-        explain_stream = personal_.explain_personal_clause(clause)  # generator
-        details = ""
-        for part in explain_stream:
-            print(part, end="", flush=True)
-            details += part
-        explained_personal_clauses.append({"clause": clause, "analysis": details})
-
-    # Merge attributes (streaming if supported)
-    merge_stream = personal_.merge_personal_attributes_lm(explained_personal_clauses)
-    js = []
-    for part in merge_stream:
-        print(part, end="", flush=True)
-        js.append(part)
-
-    # Generate summary (streaming)
-    summary_stream = personal_.generate_summary_from_json(js)
-    summary_text = ""
-    for part in summary_stream:
-        print(part, end="", flush=True)
-        summary_text += part
-
-    return summary_text, js
+    doc_type_prediction = None
+    if plan.needs("classify_document"):
+        doc_stream = personal_.classify_personal_document(doc_text)
+        sink.stream("classify_document", doc_stream)
+        prediction = doc_stream.parsed()
+        doc_type_prediction = prediction.PredictedDocumentType if prediction else doc_stream.text()
+
+    # Extract attributes for each clause, then explain it
+    def analyse_clause(clause):
+        attributes = explanation = None
+        if plan.needs("attributes"):
+            attributes = {
+                "clause": clause,
+                "attributes": sink.collect("attributes", personal_.extract_personal_attributes(clause, predicted_doc_type=doc_type_prediction))
+            }
+        if plan.needs("explain"):
+            explanation = {"clause": attributes, "analysis": sink.collect("explain", personal_.explain_personal_clause(attributes))}
+        return attributes, explanation
+
+    per_clause_stages = [s for s in ("classify_level2", "attributes", "explain") if plan.needs(s)]
+    analysed = bounded_map(analyse_clause, targets, max_concurrency)
+
+    if clusters:
+        personal_results = clusters.fan_out(personal_results)
+        analysed = clusters.fan_out(analysed)
+        sink.stage_finished("near_dedup", f"Near-duplicate clauses: {clusters.report(calls_per_clause=len(per_clause_stages))}")
+    personal_attributes = [a[0] for a in analysed]
+    explained_personal_clauses = [a[1] for a in analysed]
+
+    js = summary_text = None
+    if plan.needs("merge") and local_merge:
+        # Combine clause-level attributes locally; only disagreeing keys go back to the LLM
+        merged, conflicts = merge_records(personal_attributes, strategies={"Restrictions": UNION, "OtherNotes": UNION})
+        if conflicts:
+            sink.stage_finished("merge", f"Merge conflicts: {[c['key'] for c in conflicts]}", conflicts=len(conflicts))
+            if resolve_conflicts:
+                resolved = loads_lenient(sink.collect("resolve_conflicts", personal_.resolve_merge_conflicts(conflicts, doc_text)), {})
+                merged = apply_resolutions(merged, conflicts, resolved)
+        js = [json.dumps(merged, indent=2)]
+        sink.item_completed("merge", js[0])
+    elif plan.needs("merge"):
+        # Merge attributes (streaming if supported)
+        js = sink.stream_parts("merge", personal_.merge_personal_attributes_lm(explained_personal_clauses))
+
+    if plan.needs("summary"):
+        # Generate summary (streaming)
+        summary_text = sink.stream("summary", personal_.generate_summary_from_json(js))
+
+    if outputs is None:
+        return summary_text, js
+    return plan.result(
+        summary=summary_text,
+        clauses=personal_results,
+        attributes=typed(None, ["".join(js)]) if js else None,
+        explanations=typed(ClauseExplanation, explained_personal_clauses, key="analysis"),
+        dates=dates,
+        overview=overview
+    )
@@ -1,43 +1,74 @@
 from classes.property_real import property
-import pandas as pd
+from helpers.executor import DEFAULT_MAX_CONCURRENCY, bounded_map
+from helpers.schemas import PropertyAttributes, typed
+from helpers.streaming import iter_lines, prefetch, unique_everseen
+from helpers.dedup import NearDuplicateIndex
+from helpers.outputs import ATTRIBUTES, CLAUSES, DATES, EXPLANATIONS, OVERVIEW, SUMMARY, OutputPlan, document_overview, extract_dates
+from helpers.sinks import closes_sink
 
-def property_workflow(chunks, category):
+# Stage -> the outputs it feeds (directly or through a later stage)
+PROPERTY_STAGES = {
+    "extract_clauses": {CLAUSES, ATTRIBUTES, EXPLANATIONS, SUMMARY},
+    "attributes": {ATTRIBUTES, EXPLANATIONS, SUMMARY},
+    "explain": {EXPLANATIONS, SUMMARY},
+    "summary": {SUMMARY},
+    "dates": {DATES},
+    "overview": {OVERVIEW},
+}
+
+
+@closes_sink
+def property_workflow(chunks, category, max_concurrency=DEFAULT_MAX_CONCURRENCY, near_dedup=True, sink=None, outputs=None):
+    """
+    Returns (summary, clause attributes). With `outputs` (e.g. ["clauses"]) only the stages those
+    outputs need run, and a dict of the requested outputs plus "skipped_stages" is returned.
+    """
+    plan = OutputPlan("property_workflow", PROPERTY_STAGES, outputs or [SUMMARY, ATTRIBUTES])
+    plan.report(sink)
     property_ = property(chunks)
 
-    print("Extracting property clauses in streaming mode...\n")
-    response_stream = property_.extract_clauses_batched()  # generator
-    response_text = ""
-    for part in response_stream:
-        print(part, end="", flush=True)
-        response_text += part
-
-    all_clauses = [c.strip() for c in response_text.split("\n") if c.strip()]
-    unique_clauses = list(dict.fromkeys(all_clauses))
-
-    df = pd.DataFrame({"Clause": unique_clauses, "Level1": category})
-
-    # Extract attributes with streaming
-    property_attributes = []
-    for clause in unique_clauses:
-        attr_stream = property_.extract_property_attributes(clause)  # generator
-        details = ""
-        for part in attr_stream:
-            print(part, end="", flush=True)
-            details += part
-        property_attributes.append({"clause": clause, "attributes": details})
-
-    # Explain document (streaming)
-    explanation_stream = property_.explain_property_document(property_attributes)  # generator
-    document_explanation = []
-    for part in explanation_stream:
-        print(part, end="", flush=True)
-        document_explanation.append(part)
-
-    # Generate summary (streaming)
-    summary_stream = property_.generate_summary_and_comments(document_explanation)
-    summary_text = ""
-    for part in summary_stream:
-        print(part, end="", flush=True)
-        summary_text += part
-
-    return summary_text, property_attributes
+    sink.stage_started("extract_clauses", "Extracting property clauses in streaming mode...\n")
+    # Clauses flow into attribute extraction as soon as their line is complete,
+    # while the extraction stream is still running
+    response_stream = property_.extract_clauses_batched(max_concurrency=max_concurrency) if plan.needs("extract_clauses") else []
+    clause_feed = prefetch(iter_lines(sink.tap("extract_clauses", response_stream)), maxsize=2 * max(1, max_concurrency))
+    seen_clauses = {}
+    new_clauses = unique_everseen(clause_feed, seen_clauses)
+    # Near-duplicates are detected online: only the first clause of each cluster is sent on
+    clusters = NearDuplicateIndex() if near_dedup else None
+    if clusters:
+        new_clauses = clusters.new_representatives(new_clauses)
+    if plan.needs("attributes"):
+        property_attributes = bounded_map(
+            lambda clause: {"clause": clause, "attributes": sink.collect("attributes", property_.extract_property_attributes(clause))},
+            new_clauses,
+            max_concurrency
+        )
+    else:
+        property_attributes = [{"clause": clause} for clause in new_clauses]
+    unique_clauses = list(seen_clauses)
+    sink.stage_finished("extract_clauses", clauses=len(unique_clauses))
+
+    if clusters:
+        property_attributes = clusters.fan_out(property_attributes)
+        sink.stage_finished("near_dedup", f"Near-duplicate clauses: {clusters.report(calls_per_clause=int(plan.needs('attributes')))}")
+
+    document_explanation = summary_text = None
+    if plan.needs("explain"):
+        # Explain document (streaming)
+        document_explanation = sink.stream("explain", property_.explain_property_document(property_attributes))
+
+    if plan.needs("summary"):
+        # Generate summary (streaming)
+        summary_text = sink.stream("summary", property_.generate_summary_and_comments(document_explanation))
+
+    if outputs is None:
+        return summary_text, property_attributes
+    return plan.result(
+        summary=summary_text,
+        clauses=unique_clauses,
+        attributes=typed(PropertyAttributes, property_attributes),
+        explanations=document_explanation,
+        dates=extract_dates("\n".join(chunks)) if plan.needs("dates") else None,
+        overview=document_overview(chunks, max_concurrency) if plan.needs("overview") else None
+    )
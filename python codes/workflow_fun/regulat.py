@@ -1,36 +1,69 @@
 from classes.regulation_comp import regulatory
-import pandas as pd
+from helpers.executor import DEFAULT_MAX_CONCURRENCY, bounded_map
+from helpers.schemas import RegulatoryAttributes, typed
+from helpers.streaming import iter_lines, prefetch, unique_everseen
+from helpers.dedup import NearDuplicateIndex
+from helpers.outputs import ATTRIBUTES, CLAUSES, DATES, EXPLANATIONS, OVERVIEW, SUMMARY, OutputPlan, document_overview, extract_dates
+from helpers.sinks import closes_sink
 
-def regulatory_workflow(chunks, category):
-    regulatory_ = regulatory(chunks)
+# Stage -> the outputs it feeds (directly or through a later stage)
+REGULATORY_STAGES = {
+    "extract_clauses": {CLAUSES, ATTRIBUTES, EXPLANATIONS, SUMMARY},
+    "attributes": {ATTRIBUTES, EXPLANATIONS, SUMMARY},
+    "explain": {EXPLANATIONS, SUMMARY},
+    "dates": {DATES},
+    "overview": {OVERVIEW},
+}
 
-    print("Extracting regulatory clauses in streaming mode...\n")
-    response_stream = regulatory_.extract_clauses_batched()  # generator
-    response_text = ""
-    for part in response_stream:
-        print(part, end="", flush=True)
-        response_text += part
 
-    all_clauses = [c.strip() for c in response_text.split("\n") if c.strip()]
-    unique_clauses = list(dict.fromkeys(all_clauses))
+@closes_sink
+def regulatory_workflow(chunks, category, max_concurrency=DEFAULT_MAX_CONCURRENCY, near_dedup=True, sink=None, outputs=None):
+    """
+    Returns (streamed parts of the plain-language explanation, clause attributes). With `outputs` (e.g. ["clauses"]) only
+    the stages those outputs need run, and a dict of the requested outputs plus "skipped_stages" is returned.
+    """
+    plan = OutputPlan("regulatory_workflow", REGULATORY_STAGES, outputs or [SUMMARY, ATTRIBUTES])
+    plan.report(sink)
+    regulatory_ = regulatory(chunks)
 
-    df = pd.DataFrame({"Clause": unique_clauses, "Level1": category})
+    sink.stage_started("extract_clauses", "Extracting regulatory clauses in streaming mode...\n")
+    # Clauses flow into attribute extraction as soon as their line is complete,
+    # while the extraction stream is still running
+    response_stream = regulatory_.extract_clauses_batched(max_concurrency=max_concurrency) if plan.needs("extract_clauses") else []
+    clause_feed = prefetch(iter_lines(sink.tap("extract_clauses", response_stream)), maxsize=2 * max(1, max_concurrency))
+    seen_clauses = {}
+    new_clauses = unique_everseen(clause_feed, seen_clauses)
+    # Near-duplicates are detected online: only the first clause of each cluster is sent on
+    clusters = NearDuplicateIndex() if near_dedup else None
+    if clusters:
+        new_clauses = clusters.new_representatives(new_clauses)
+    if plan.needs("attributes"):
+        regulatory_attributes = bounded_map(
+            lambda clause: {"clause": clause, "attributes": sink.collect("attributes", regulatory_.extract_regulatory_attributes(clause))},
+            new_clauses,
+            max_concurrency
+        )
+    else:
+        regulatory_attributes = [{"clause": clause} for clause in new_clauses]
+    unique_clauses = list(seen_clauses)
+    sink.stage_finished("extract_clauses", clauses=len(unique_clauses))
 
-    # Extract attributes with streaming
-    regulatory_attributes = []
-    for clause in unique_clauses:
-        attr_stream = regulatory_.extract_regulatory_attributes(clause)  # generator
-        details = ""
-        for part in attr_stream:
-            print(part, end="", flush=True)
-            details += part
-        regulatory_attributes.append({"clause": clause, "attributes": details})
+    if clusters:
+        regulatory_attributes = clusters.fan_out(regulatory_attributes)
+        sink.stage_finished("near_dedup", f"Near-duplicate clauses: {clusters.report(calls_per_clause=int(plan.needs('attributes')))}")
 
-    # Explain document (streaming)
-    explanation_stream = regulatory_.explain_regulatory_document_plain_language(regulatory_attributes)  # generator
-    explanation_text = []
-    for part in explanation_stream:
-        print(part, end="", flush=True)
-        explanation_text.append(part)
+    explanation_text = None
+    if plan.needs("explain"):
+        # Explain document (streaming)
+        explanation_text = sink.stream_parts("explain", regulatory_.explain_regulatory_document_plain_language(regulatory_attributes))
 
-    return explanation_text, regulatory_attributes
+    if outputs is None:
+        return explanation_text, regulatory_attributes
+    return plan.result(
+        summary=explanation_text,
+        clauses=unique_clauses,
+        attributes=typed(RegulatoryAttributes, regulatory_attributes),
+        explanations=explanation_text,
+        dates=extract_dates("\n".join(chunks)) if plan.needs("dates") else None,
+        overview=document_overview(chunks, max_concurrency) if plan.needs("overview") else None
+    )